@@ -0,0 +1,50 @@
+"""Run anomaly detection over a historical range of count buckets.
+
+Usage:
+    python scripts/backfill_anomalies.py --since 2024-01-01T00:00:00Z [--until ...]
+        [--bucket-size 1m] [--window 288] [--threshold 4.0] [--replace]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analytics.backfill import backfill_anomalies
+from src.core.config import get_settings
+from src.core.db import SessionLocal
+from src.utils.time import parse_iso8601
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--since", required=True, help="ISO8601 range start (UTC)")
+    parser.add_argument("--until", help="ISO8601 range end, exclusive (default: now)")
+    parser.add_argument("--bucket-size", default="1m", choices=["1m", "5m", "60m"])
+    parser.add_argument("--window", type=int, default=288, help="Baseline window in buckets")
+    parser.add_argument("--threshold", type=float, default=4.0)
+    parser.add_argument("--replace", action="store_true", help="Delete anomalies already recorded in the range first")
+    args = parser.parse_args()
+    
+    db = SessionLocal()
+    try:
+        stats = backfill_anomalies(
+            db,
+            since=parse_iso8601(args.since),
+            until=parse_iso8601(args.until) if args.until else None,
+            bucket_size=args.bucket_size,
+            window_buckets=args.window,
+            threshold=args.threshold,
+            scopes=get_settings().anomaly_scopes_list,
+            replace=args.replace,
+        )
+    finally:
+        db.close()
+    
+    for key, value in stats.items():
+        print(f"{key:<16}{value}")
+
+
+if __name__ == "__main__":
+    main()
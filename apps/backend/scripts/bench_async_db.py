@@ -0,0 +1,160 @@
+"""Benchmark request latency with sync vs asyncio database sessions.
+
+Serves the same slow read (a filtered newest-first article page) from two
+FastAPI apps: one calling a sync Session inside an async route, as the read
+routes used to, and one awaiting an AsyncSession. Each app is hit by
+concurrent readers alongside clients polling a trivial /ping route
+every 10 ms, and latency percentiles are reported for both.
+
+Usage:
+    python scripts/bench_async_db.py [--articles 200000] [--readers 8] [--pingers 8] [--requests 20]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+import numpy as np
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, desc, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.db import Base
+from src.models import Article
+from src.utils.time import UTC
+
+
+def seed(url: str, n_articles: int) -> None:
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    start = datetime(2024, 3, 1, tzinfo=UTC)
+    rows = [
+        {
+            "source": f"source-{i % 50}", "source_type": "rss", "title": f"Story {i}",
+            "url": f"https://example.com/{i}", "topic": "politics",
+            "published_at_utc": start + timedelta(seconds=i), "fetched_at_utc": start,
+        }
+        for i in range(n_articles)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(Article), rows)
+    engine.dispose()
+
+
+def page_statement():
+    # The leading wildcard forces a scan, standing in for any slow read
+    return select(Article).where(Article.title.like("%7777%")).order_by(desc(Article.published_at_utc)).limit(50)
+
+
+def sync_app(url: str) -> FastAPI:
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    factory = sessionmaker(bind=engine)
+    
+    def get_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+    
+    app = FastAPI()
+    
+    @app.get("/page")
+    async def page(db: Session = Depends(get_db)):
+        return len(db.scalars(page_statement()).all())
+    
+    @app.get("/ping")
+    async def ping():
+        return "pong"
+    
+    return app
+
+
+def async_app(url: str) -> FastAPI:
+    factory = async_sessionmaker(create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://", 1)))
+    
+    async def get_db():
+        async with factory() as db:
+            yield db
+    
+    app = FastAPI()
+    
+    @app.get("/page")
+    async def page(db: AsyncSession = Depends(get_db)):
+        return len((await db.scalars(page_statement())).all())
+    
+    @app.get("/ping")
+    async def ping():
+        return "pong"
+    
+    return app
+
+
+async def load(app: FastAPI, readers: int, pingers: int, requests: int) -> dict:
+    latencies = {"/page": [], "/ping": []}
+    transport = httpx.ASGITransport(app=app)
+    
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/page")  # Warm the connection and page cache
+        
+        async def get(path: str, start: float) -> None:
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies[path].append(time.perf_counter() - start)
+        
+        async def reader() -> None:
+            for _ in range(requests):
+                await get("/page", time.perf_counter())
+        
+        async def pinger(done: asyncio.Event) -> None:
+            # A heartbeat-like client: one cheap request every 10 ms, timed from
+            # when it was due, so time spent waiting for a blocked loop counts
+            while not done.is_set():
+                due = time.perf_counter() + 0.01
+                await asyncio.sleep(0.01)
+                await get("/ping", due)
+        
+        done = asyncio.Event()
+        pinging = [asyncio.create_task(pinger(done)) for _ in range(pingers)]
+        start = time.perf_counter()
+        await asyncio.gather(*[reader() for _ in range(readers)])
+        elapsed = time.perf_counter() - start
+        done.set()
+        await asyncio.gather(*pinging)
+    
+    return {"elapsed": elapsed, **{path: np.array(values) * 1000 for path, values in latencies.items()}}
+
+
+def main(n_articles: int, readers: int, pingers: int, requests: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        seed(url, n_articles)
+        print(f"{n_articles} articles, {readers} readers x {requests} requests, {pingers} pingers")
+        print(f"{'':<8}{'route':<8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        for label, app in (("sync", sync_app(url)), ("async", async_app(url))):
+            result = asyncio.run(load(app, readers, pingers, requests))
+            for path in ("/page", "/ping"):
+                values = result[path]
+                print(
+                    f"{label:<8}{path:<8}{np.percentile(values, 50):>10.1f}"
+                    f"{np.percentile(values, 99):>10.1f}{values.max():>10.1f}"
+                )
+            print(f"{label:<8}{'total':<8}{result['elapsed']:>10.2f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=200000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--pingers", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+    main(args.articles, args.readers, args.pingers, args.requests)
@@ -0,0 +1,75 @@
+"""Benchmark online sliding median/MAD against recomputing compute_baseline.
+
+Simulates one new bucket per series after the windows are full, which is
+what each ingestion cycle does.
+
+Usage:
+    python scripts/bench_online_baseline.py [--series 10000] [--window 288] [--steps 5]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analytics.anomaly import compute_baseline
+from src.analytics.online import OnlineBaseline
+
+
+def main(n_series: int, window: int, steps: int) -> None:
+    rng = np.random.default_rng(7)
+    rates = rng.choice([0.5, 3.0, 20.0], size=n_series)
+    history = rng.poisson(rates[:, None], size=(n_series, window + steps))
+    keys = [("1m", "politics", f"source-{i}") for i in range(n_series)]
+    
+    baseline = OnlineBaseline(window=window)
+    start = time.perf_counter()
+    for key, row in zip(keys, history[:, :window]):
+        for index, value in enumerate(row):
+            baseline.update(key, index, int(value))
+    fill = time.perf_counter() - start
+    
+    online_best = recompute_best = float("inf")
+    max_error = 0.0
+    for step in range(steps):
+        index = window + step
+        
+        start = time.perf_counter()
+        online = [baseline.update(key, index, int(history[i, index])).baseline() for i, key in enumerate(keys)]
+        online_best = min(online_best, time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        recomputed = [compute_baseline(history[i, index - window + 1:index + 1].tolist()) for i in range(n_series)]
+        recompute_best = min(recompute_best, time.perf_counter() - start)
+        
+        max_error = max(
+            max_error,
+            max(abs(a[0] - b[0]) + abs(a[1] - b[1]) for a, b in zip(online, recomputed)),
+        )
+    
+    start = time.perf_counter()
+    payload = baseline.snapshot()
+    snapshot_s = time.perf_counter() - start
+    start = time.perf_counter()
+    OnlineBaseline.restore(payload)
+    restore_s = time.perf_counter() - start
+    
+    print(f"{n_series} series, window {window}")
+    print(f"{'initial fill':<28}{fill:>10.2f} s")
+    print(f"{'recompute per bucket':<28}{recompute_best * 1000:>10.1f} ms{recompute_best / n_series * 1e6:>10.1f} us/series")
+    print(f"{'online per bucket':<28}{online_best * 1000:>10.1f} ms{online_best / n_series * 1e6:>10.1f} us/series")
+    print(f"speedup: {recompute_best / online_best:.2f}x, max abs difference: {max_error:.2e}")
+    print(f"snapshot: {len(payload) / 1024:.0f} KiB in {snapshot_s:.2f} s, restore {restore_s:.2f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--series", type=int, default=10000)
+    parser.add_argument("--window", type=int, default=288)
+    parser.add_argument("--steps", type=int, default=5)
+    args = parser.parse_args()
+    main(args.series, args.window, args.steps)
@@ -0,0 +1,105 @@
+"""Benchmark event-loop lag while parsing feeds inline vs in a worker pool.
+
+Simulates the parse phase of an ingestion cycle (no network) and measures how
+late a 10ms ticker task wakes up, which is what API requests and SSE
+heartbeats experience while the cycle runs.
+
+Usage:
+    python scripts/bench_parse_lag.py [--feeds 20] [--items 300]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from src.ingest.parsing import parse_feed_content
+
+TICK_SECONDS = 0.01
+
+
+def make_feed(items: int) -> bytes:
+    """Build a synthetic RSS document."""
+    entries = "".join(
+        f"<item><title>Breaking: climate talks item {i}</title>"
+        f"<link>https://example.com/news/{i}</link>"
+        f"<description>{'Summary text about government policy and refugees. ' * 8}</description>"
+        f"<pubDate>Mon, 01 Jan 2024 12:{i % 60:02d}:00 GMT</pubDate>"
+        f"<category>world</category></item>"
+        for i in range(items)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Bench</title>{entries}</channel></rss>'.encode()
+
+
+async def measure_lag(parse_all) -> dict:
+    """Run parse_all while a ticker records wake-up delays."""
+    lags = []
+    done = asyncio.Event()
+    
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(TICK_SECONDS)
+            lags.append(time.perf_counter() - start - TICK_SECONDS)
+    
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await parse_all()
+    elapsed = time.perf_counter() - start
+    done.set()
+    await task
+    
+    lags_ms = np.array(lags) * 1000
+    return {
+        "cycle_s": elapsed,
+        "p50_ms": float(np.percentile(lags_ms, 50)),
+        "p99_ms": float(np.percentile(lags_ms, 99)),
+        "max_ms": float(lags_ms.max()),
+    }
+
+
+async def main(feeds: int, items: int, workers: int) -> None:
+    content = make_feed(items)
+    
+    async def inline():
+        for _ in range(feeds):
+            parse_feed_content(content)
+            await asyncio.sleep(0)  # Other feeds' fetches resuming
+    
+    def pooled(executor):
+        async def run():
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*[
+                loop.run_in_executor(executor, parse_feed_content, content)
+                for _ in range(feeds)
+            ])
+        return run
+    
+    results = {"inline (before)": await measure_lag(inline)}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results[f"thread x{workers}"] = await measure_lag(pooled(executor))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Warm up workers so process start-up isn't counted
+        await asyncio.get_running_loop().run_in_executor(executor, parse_feed_content, b"")
+        results[f"process x{workers}"] = await measure_lag(pooled(executor))
+    
+    print(f"{feeds} feeds x {items} items ({len(content) / 1024:.0f} KiB each)")
+    print(f"{'mode':<18}{'cycle s':>10}{'lag p50 ms':>12}{'lag p99 ms':>12}{'lag max ms':>12}")
+    for mode, r in results.items():
+        print(f"{mode:<18}{r['cycle_s']:>10.2f}{r['p50_ms']:>12.1f}{r['p99_ms']:>12.1f}{r['max_ms']:>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--feeds", type=int, default=20)
+    parser.add_argument("--items", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+    asyncio.run(main(args.feeds, args.items, args.workers))
@@ -0,0 +1,78 @@
+"""Benchmark aggregate response encoding: Pydantic models vs orjson rows vs columnar.
+
+Encodes a multi-day 1m aggregate range the way get_aggregate used to (one
+CountResponse per bucket, validated into AggregateResponse and rendered by
+FastAPI's JSONResponse) and through the tuple/orjson path in both formats.
+
+Usage:
+    python scripts/bench_serialization.py [--days 7] [--topics 3] [--repeat 5]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analytics.store import TimeSeriesStore
+from src.api.routes_aggregate import _render
+from src.core.schemas import AggregateResponse, CountResponse
+
+
+def models_body(rows) -> bytes:
+    response = AggregateResponse(
+        buckets=[
+            CountResponse(
+                bucket_start_utc=TimeSeriesStore.index_start(t // 60, "1m"),
+                bucket_size="1m",
+                topic=topic,
+                source="",
+                count=count,
+            )
+            for t, topic, count in rows
+        ],
+        bucket_size="1m",
+        change_cursor="cursor",
+    )
+    return JSONResponse(jsonable_encoder(response)).body
+
+
+def best_of(repeat: int, fn) -> tuple:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(days: int, n_topics: int, repeat: int) -> None:
+    topics = [f"topic-{i}" for i in range(n_topics)]
+    start = 28_000_000  # Epoch minute index
+    rows = [
+        ((start + minute) * 60, topic, (minute * 7 + n) % 23)
+        for minute in range(days * 1440)
+        for n, topic in enumerate(topics)
+    ]
+    print(f"{len(rows)} buckets ({days} days of 1m x {n_topics} topics)")
+    print(f"{'path':<22}{'ms':>10}{'KiB':>10}")
+    for label, fn in (
+        ("pydantic models", lambda: models_body(rows)),
+        ("orjson rows", lambda: _render(rows, "rows", "1m", None, None, "cursor").body),
+        ("orjson columnar", lambda: _render(rows, "columnar", "1m", None, None, "cursor").body),
+    ):
+        elapsed, body = best_of(repeat, fn)
+        print(f"{label:<22}{elapsed * 1000:>10.1f}{len(body) / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--topics", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.days, args.topics, args.repeat)
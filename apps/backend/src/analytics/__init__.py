@@ -1,7 +1,11 @@
 """Analytics package."""
 
-from .bucket import aggregate_counts
+from .bucket import aggregate_counts, aggregate_counts_sql, aggregate_new_articles, upsert_counts
+from .rollup import update_rollups, rollup_range
+from .store import TimeSeriesStore, get_timeseries_store
 from .anomaly import detect_anomalies, compute_baseline, is_anomaly
+from .online import OnlineBaseline, detect_anomalies_online
+from .seasonal import SeasonalProfiles
 
-__all__ = ["aggregate_counts", "detect_anomalies", "compute_baseline", "is_anomaly"]
+__all__ = ["aggregate_counts", "aggregate_counts_sql", "aggregate_new_articles", "upsert_counts", "update_rollups", "rollup_range", "TimeSeriesStore", "get_timeseries_store", "detect_anomalies", "compute_baseline", "is_anomaly", "OnlineBaseline", "detect_anomalies_online", "SeasonalProfiles"]
 
@@ -1,17 +1,36 @@
-"""Anomaly detection using MAD and Z-score."""
+"""Anomaly detection using MAD and Z-score (other detectors in .detectors)."""
 
 import logging
-from typing import List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
 import numpy as np
 from sqlalchemy import and_, desc
 from sqlalchemy.orm import Session
 
 from ..models import Count, Anomaly
+from ..core.db import dialect_insert
+from .store import SeriesKey, TimeSeriesStore, get_timeseries_store
 from ..utils.time import bucket_size_to_minutes, now_utc
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Minimum present buckets in a window before a series is scored
+MIN_POINTS = 10
+
+# Topic recorded for per-source series summed across topics
+ALL_TOPICS = "all"
+
+# Series analyzed by default: per topic, per source and per (topic, source)
+SCOPES = ("topic", "source", "topic_source")
+
+# SQLite caps bound parameters per statement (999 on older builds)
+SQLITE_MAX_PARAMS = 999
+
+ANOMALY_COLUMNS = (
+    "bucket_start_utc", "bucket_size", "topic", "source", "observed",
+    "expected", "deviation", "method", "created_at_utc",
+)
+
 
 def compute_baseline(series: List[int]) -> Tuple[float, float]:
     """Compute baseline (expected value) and MAD.
@@ -73,107 +92,354 @@ def is_anomaly(
     return is_anom, deviation
 
 
-def detect_anomalies(
+def deviation_scores(observed: np.ndarray, expected: np.ndarray, scale: np.ndarray) -> np.ndarray:
+    """Vectorized is_anomaly() deviation: |x - expected| / MAD, or a signed z-score when scale < 0.1."""
+    diff = observed - expected
+    safe_scale = np.where(scale > 0, scale, 1.0)
+    return np.where(
+        scale < 0.1,
+        np.where(scale > 0, diff / safe_scale, 0.0),  # Z-score fallback
+        np.abs(diff) / safe_scale,
+    )
+
+
+def score_matrix(values: np.ndarray) -> Dict[str, np.ndarray]:
+    """Score the latest present bucket of every series at once.
+    
+    Vectorized equivalent of compute_baseline() + is_anomaly() over a
+    (series x buckets) matrix where absent buckets are NaN. Each row needs at
+    least one present value.
+    
+    Args:
+        values: 2D float array, one row per series, oldest bucket first
+    
+    Returns:
+        Dict of per-series arrays: latest (column index), observed, expected,
+        scale (MAD or stddev fallback), deviation and points
+    """
+    present = ~np.isnan(values)
+    points = present.sum(axis=1)
+    latest = values.shape[1] - 1 - np.argmax(present[:, ::-1], axis=1)
+    observed = values[np.arange(len(values)), latest]
+    
+    expected = np.nanmedian(values, axis=1)
+    mad = np.nanmedian(np.abs(values - expected[:, None]), axis=1)
+    # Fallback to stddev if MAD is too small
+    scale = np.where(mad < 0.1, np.nanstd(values, axis=1), mad)
+    
+    deviation = deviation_scores(observed, expected, scale)
+    return {
+        "latest": latest,
+        "observed": observed,
+        "expected": expected,
+        "scale": scale,
+        "deviation": deviation,
+        "points": points,
+    }
+
+
+def load_matrix(
     db: Session,
-    bucket_size: str = "1m",
+    bucket_size: str,
+    start: int,
+    end: int,
     topic: Optional[str] = None,
-    window_buckets: int = 288,  # 24h for 5m buckets, 60 for 1m
-    threshold: float = 4.0
-) -> int:
-    """Detect anomalies in time-series counts.
+    source: Optional[str] = "",
+    store: Optional[TimeSeriesStore] = None
+) -> Tuple[List[SeriesKey], np.ndarray]:
+    """Load bucket indexes [start, end) of all matching series as a matrix.
+    
+    Reads from the time-series store when it covers the window, otherwise
+    runs a single query over the counts table and pivots the rows.
     
     Args:
         db: Database session
-        bucket_size: Bucket size to analyze
+        bucket_size: Bucket size to load
+        start: First bucket index
+        end: Bucket index past the last one
         topic: Optional topic filter
-        window_buckets: Number of historical buckets to use for baseline
-        threshold: Deviation threshold
+        source: Source filter ("" for aggregate rows, None for all series)
+        store: Optional time-series store
     
     Returns:
-        Number of new anomalies detected
+        Tuple of ((topic, source) keys, float matrix with NaN for absent buckets)
     """
-    bucket_minutes = bucket_size_to_minutes(bucket_size)
+    width = end - start
     
-    # Calculate time window
-    now = now_utc()
-    window_start = now - timedelta(minutes=bucket_minutes * window_buckets)
+    if store is not None and store.covers(bucket_size, start):
+        keys = sorted(
+            (t, s) for t, s in store.series_keys(bucket_size)
+            if (topic is None or t == topic) and (source is None or s == source)
+        )
+        matrix = np.full((len(keys), width), np.nan)
+        for row, (topic_val, source_val) in enumerate(keys):
+            values, present = store.window(bucket_size, topic_val, source_val, start, end)
+            matrix[row, present] = values[present]
+        return keys, matrix
     
-    # Get all topics if not specified
-    if topic:
-        topics = [topic]
-    else:
-        topics = db.query(Count.topic).distinct().all()
-        topics = [t[0] for t in topics]
+    query = db.query(Count.bucket_start_utc, Count.topic, Count.source, Count.count).filter(
+        and_(
+            Count.bucket_size == bucket_size,
+            Count.bucket_start_utc >= TimeSeriesStore.index_start(start, bucket_size),
+            Count.bucket_start_utc < TimeSeriesStore.index_start(end, bucket_size)
+        )
+    )
+    if topic is not None:
+        query = query.filter(Count.topic == topic)
+    if source is not None:
+        query = query.filter(Count.source == source)
+    rows = query.all()
     
-    new_anomalies = 0
+    keys = sorted({(t, s or "") for _, t, s, _ in rows})
+    positions = {key: row for row, key in enumerate(keys)}
+    matrix = np.full((len(keys), width), np.nan)
+    for bucket_dt, topic_val, source_val, count in rows:
+        column = TimeSeriesStore.bucket_index(bucket_dt, bucket_size) - start
+        matrix[positions[(topic_val, source_val or "")], column] = count
+    return keys, matrix
+
+
+def insert_anomalies(db: Session, rows: List[dict]) -> int:
+    """Bulk insert anomaly rows, skipping ones already recorded.
     
-    for topic_val in topics:
-        # Get historical counts for this topic (aggregate, source=None)
-        historical = db.query(Count).filter(
-            and_(
-                Count.bucket_size == bucket_size,
-                Count.topic == topic_val,
-                Count.source.is_(None),
-                Count.bucket_start_utc >= window_start,
-                Count.bucket_start_utc < now
-            )
-        ).order_by(Count.bucket_start_utc).all()
-        
-        if len(historical) < 10:  # Need at least 10 points
-            continue
-        
-        # Extract counts as list
-        counts = [c.count for c in historical]
-        
-        # Compute baseline from all historical data
-        expected, mad = compute_baseline(counts)
-        
-        # Check the most recent bucket
-        latest = historical[-1]
-        
-        # Skip if anomaly already exists
-        existing = db.query(Anomaly).filter(
+    Conflicts on the (bucket, series) unique constraint are ignored, so
+    concurrent detection, backfill and admin runs never abort each other.
+    
+    Returns:
+        Number of rows inserted
+    """
+    chunk_size = 1000
+    if db.get_bind().dialect.name == "sqlite":
+        chunk_size = SQLITE_MAX_PARAMS // len(ANOMALY_COLUMNS)
+    
+    inserted = 0
+    table = Anomaly.__table__
+    for i in range(0, len(rows), chunk_size):
+        stmt = (
+            dialect_insert(db, table)
+            .values(rows[i:i + chunk_size])
+            .on_conflict_do_nothing(index_elements=["bucket_start_utc", "bucket_size", "topic", "source"])
+            .returning(table.c.id)
+        )
+        inserted += len(db.execute(stmt).all())
+    return inserted
+
+
+def record_anomalies(db: Session, bucket_size: str, candidates: List[dict]) -> int:
+    """Insert anomalies that aren't already recorded for their bucket and series.
+    
+    Existing anomalies are filtered out with a single set-based query; rows a
+    concurrent writer records in the meantime are skipped on conflict.
+    
+    Args:
+        db: Database session
+        bucket_size: Bucket size analyzed
+        candidates: Dicts with bucket_start_utc, topic, source, observed,
+            expected, scale, deviation and optionally method and seasonal
+    
+    Returns:
+        Number of new anomalies recorded
+    """
+    if not candidates:
+        return 0
+    
+    def key(bucket_dt: datetime, topic_val: str, source_val: Optional[str]) -> tuple:
+        return TimeSeriesStore.bucket_index(bucket_dt, bucket_size), topic_val, source_val or ""
+    
+    existing = {
+        key(*row)
+        for row in db.query(Anomaly.bucket_start_utc, Anomaly.topic, Anomaly.source).filter(
             and_(
-                Anomaly.bucket_start_utc == latest.bucket_start_utc,
                 Anomaly.bucket_size == bucket_size,
-                Anomaly.topic == topic_val
+                Anomaly.bucket_start_utc.in_(list({c["bucket_start_utc"] for c in candidates}))
             )
-        ).first()
-        
-        if existing:
-            continue
-        
-        # Check if anomaly
-        is_anom, deviation = is_anomaly(
-            latest.count,
-            expected,
-            mad,
-            threshold
         )
-        
-        if is_anom:
-            anomaly = Anomaly(
-                bucket_start_utc=latest.bucket_start_utc,
-                bucket_size=bucket_size,
-                topic=topic_val,
-                observed=latest.count,
-                expected=expected,
-                deviation=deviation,
-                method="mad" if mad >= 0.1 else "zscore"
-            )
-            db.add(anomaly)
-            new_anomalies += 1
-            
-            logger.info(
-                f"Anomaly detected: {topic_val} at {latest.bucket_start_utc}, "
-                f"observed={latest.count}, expected={expected:.1f}, deviation={deviation:.2f}"
-            )
+    }
+    candidates = [
+        c for c in candidates
+        if key(c["bucket_start_utc"], c["topic"], c["source"]) not in existing
+    ]
+    if not candidates:
+        return 0
+    
+    created_at = datetime.utcnow()
+    rows = [
+        {
+            "bucket_start_utc": candidate["bucket_start_utc"],
+            "bucket_size": bucket_size,
+            "topic": candidate["topic"],
+            "source": candidate["source"] or "",
+            "observed": candidate["observed"],
+            "expected": candidate["expected"],
+            "deviation": candidate["deviation"],
+            "method": ("seasonal_" if candidate.get("seasonal") else "") + candidate.get(
+                "method", "mad" if candidate["scale"] >= 0.1 else "zscore"
+            ),
+            "created_at_utc": created_at,
+        }
+        for candidate in candidates
+    ]
     
     try:
+        new_anomalies = insert_anomalies(db, rows)
         db.commit()
-        return new_anomalies
     except Exception as e:
         db.rollback()
-        logger.error(f"Error detecting anomalies: {e}", exc_info=True)
+        logger.error(f"Error recording anomalies: {e}", exc_info=True)
         raise
+    
+    for candidate in candidates:
+        logger.info(
+            f"Anomaly detected: {candidate['topic']}/{candidate['source'] or '*'} at {candidate['bucket_start_utc']}, "
+            f"observed={candidate['observed']}, expected={candidate['expected']:.1f}, "
+            f"deviation={candidate['deviation']:.2f}"
+        )
+    return new_anomalies
+
 
+def build_series(
+    keys: List[SeriesKey],
+    matrix: np.ndarray,
+    scopes: Iterable[str] = SCOPES
+) -> Tuple[List[SeriesKey], np.ndarray]:
+    """Select or derive the series to analyze from stored (topic, source) rows.
+    
+    Scopes:
+        topic: per-topic aggregate rows (source="")
+        topic_source: per-(topic, source) rows
+        source: per-source totals across topics, keyed (ALL_TOPICS, source)
+    
+    Args:
+        keys: (topic, source) keys of the matrix rows
+        matrix: Float matrix with NaN for absent buckets
+        scopes: Scopes to include
+    
+    Returns:
+        Tuple of (keys, matrix) for the selected series
+    """
+    scopes = set(scopes)
+    sources = np.array([source for _, source in keys], dtype=object)
+    per_source = sources != ""
+    
+    out_keys: List[SeriesKey] = []
+    parts = []
+    if "topic" in scopes:
+        out_keys.extend(key for key, flag in zip(keys, per_source) if not flag)
+        parts.append(matrix[~per_source])
+    if "topic_source" in scopes:
+        out_keys.extend(key for key, flag in zip(keys, per_source) if flag)
+        parts.append(matrix[per_source])
+    if "source" in scopes:
+        names = sorted(set(sources[per_source]))
+        totals = np.full((len(names), matrix.shape[1]), np.nan)
+        for row, name in enumerate(names):
+            rows = matrix[sources == name]
+            present = ~np.isnan(rows).all(axis=0)
+            totals[row, present] = np.nansum(rows[:, present], axis=0)
+        out_keys.extend((ALL_TOPICS, name) for name in names)
+        parts.append(totals)
+    
+    if not parts:
+        return [], np.empty((0, matrix.shape[1]))
+    return out_keys, np.vstack(parts)
+
+
+def detect_anomalies(
+    db: Session,
+    bucket_size: str = "1m",
+    topic: Optional[str] = None,
+    window_buckets: int = 288,  # 24h for 5m buckets, 60 for 1m
+    threshold: float = 4.0,
+    store: Optional[TimeSeriesStore] = None,
+    scopes: Iterable[str] = SCOPES,
+    last_scored: Optional[Dict[Tuple[str, str, str], Tuple[int, float]]] = None,
+    profiles=None,
+    detector: str = "mad",
+    topic_detectors: Optional[Dict[str, str]] = None
+) -> int:
+    """Detect anomalies in time-series counts.
+    
+    Loads the whole window in one pass, scores the latest bucket of every
+    series with its detector (each detector runs once over its rows) and
+    records the flagged ones with record_anomalies().
+    
+    Args:
+        db: Database session
+        bucket_size: Bucket size to analyze
+        topic: Optional topic filter
+        window_buckets: Number of historical buckets to use for baseline
+        threshold: Deviation threshold
+        store: Time-series store to read the window from (default: process store)
+        scopes: Series scopes to analyze (see build_series)
+        last_scored: Optional memo of each series' latest (bucket, count) when
+            last scored; series whose latest bucket is unchanged are skipped
+        profiles: Optional SeasonalProfiles; slots with enough samples replace
+            the flat window baseline of MAD-scored series
+        detector: Default detector name (see detectors.DETECTORS)
+        topic_detectors: Optional per-topic detector names
+    
+    Returns:
+        Number of new anomalies detected
+    """
+    store = store or get_timeseries_store()
+    
+    # Calculate time window (bucket indexes, current bucket included)
+    now = now_utc()
+    end = store.bucket_index(now, bucket_size) + 1
+    start = store.ceil_index(now - timedelta(minutes=bucket_size_to_minutes(bucket_size) * window_buckets), bucket_size)
+    
+    keys, matrix = load_matrix(db, bucket_size, start, end, topic=topic, source=None, store=store)
+    if topic is not None:
+        scopes = [scope for scope in scopes if scope != "source"]  # Same as topic_source
+    keys, matrix = build_series(keys, matrix, scopes)
+    
+    # Imported here to avoid a circular import
+    from .detectors import assign_detectors, score_series, scoring_points
+    
+    # Need at least 10 points
+    present = ~np.isnan(matrix)
+    names = assign_detectors(keys, detector, topic_detectors)
+    selected = scoring_points(matrix, names) >= MIN_POINTS
+    
+    # Skip series whose latest bucket hasn't changed since they were last scored
+    latest = matrix.shape[1] - 1 - np.argmax(present[:, ::-1], axis=1)
+    observed = matrix[np.arange(len(matrix)), latest]
+    marks = [(start + int(i), float(v)) for i, v in zip(latest, observed)]
+    if last_scored is not None:
+        unchanged = np.array([
+            last_scored.get((bucket_size, t, s)) == mark
+            for (t, s), mark in zip(keys, marks)
+        ], dtype=bool)
+        selected &= ~unchanged
+    
+    keys = [key for key, ok in zip(keys, selected) if ok]
+    marks = [mark for mark, ok in zip(marks, selected) if ok]
+    names = names[selected]
+    if not keys:
+        return 0
+    
+    scores = score_series(matrix[selected], names)
+    seasonal = np.zeros(len(keys), dtype=bool)
+    if profiles is not None:
+        seasonal = profiles.adjust(bucket_size, keys, start + scores["latest"], scores, rows=names == "mad")
+    
+    candidates = []
+    for row in np.flatnonzero(scores["deviation"] >= threshold):
+        topic_val, source_val = keys[row]
+        candidates.append({
+            "bucket_start_utc": store.index_start(start + int(scores["latest"][row]), bucket_size),
+            "topic": topic_val,
+            "source": source_val,
+            "observed": int(scores["observed"][row]),
+            "expected": float(scores["expected"][row]),
+            "scale": float(scores["scale"][row]),
+            "deviation": float(scores["deviation"][row]),
+            "method": scores["method"][row],
+            "seasonal": bool(seasonal[row]),
+        })
+    new_anomalies = record_anomalies(db, bucket_size, candidates)
+    
+    if last_scored is not None:
+        for (topic_val, source_val), mark in zip(keys, marks):
+            last_scored[(bucket_size, topic_val, source_val)] = mark
+    return new_anomalies
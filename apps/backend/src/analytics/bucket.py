@@ -1,13 +1,15 @@
 """Time-series bucket aggregation."""
 
 import logging
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Optional
-from sqlalchemy import func, and_, or_
+from typing import Iterable, List, Mapping, Optional
+from sqlalchemy import func, and_, case, cast, literal, select, true, union_all, Integer, String
 from sqlalchemy.orm import Session
 
 from ..models import Article, Count
-from ..utils.time import bucket_start, bucket_size_to_minutes, now_utc, UTC
+from ..core.db import dialect_insert
+from ..utils.time import bucket_start, bucket_size_to_minutes, now_utc
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +55,7 @@ def aggregate_counts(
     
     # Insert or update counts
     created = 0
+    changed_at = now_utc()
     for (bucket_dt, topic, source), count in buckets.items():
         # Check if exists
         existing = db.query(Count).filter(
@@ -65,14 +68,17 @@ def aggregate_counts(
         ).first()
         
         if existing:
-            existing.count = count
+            if existing.count != count:
+                existing.count = count
+                existing.updated_at_utc = changed_at
         else:
             count_obj = Count(
                 bucket_start_utc=bucket_dt,
                 bucket_size=bucket_size,
                 topic=topic,
                 source=source or "",
-                count=count
+                count=count,
+                updated_at_utc=changed_at
             )
             db.add(count_obj)
             created += 1
@@ -91,19 +97,22 @@ def aggregate_counts(
                 Count.bucket_start_utc == bucket_dt,
                 Count.bucket_size == bucket_size,
                 Count.topic == topic,
-                Count.source.is_(None)
+                Count.source == ""  # Aggregate rows are stored with source=""
             )
         ).first()
         
         if existing:
-            existing.count = count
+            if existing.count != count:
+                existing.count = count
+                existing.updated_at_utc = changed_at
         else:
             count_obj = Count(
                 bucket_start_utc=bucket_dt,
                 bucket_size=bucket_size,
                 topic=topic,
                 source="",  # Use empty string instead of None for SQLite compatibility
-                count=count
+                count=count,
+                updated_at_utc=changed_at
             )
             db.add(count_obj)
     
@@ -116,3 +125,214 @@ def aggregate_counts(
         logger.error(f"Error aggregating counts: {e}", exc_info=True)
         raise
 
+
+def count_conflict_set(stmt, new_count=None) -> dict:
+    """ON CONFLICT DO UPDATE assignments for a counts insert.
+    
+    updated_at_utc only moves when the count actually changes, so change
+    cursors don't pick up buckets that were recomputed to the same value.
+    
+    Args:
+        stmt: Dialect insert into the counts table, carrying updated_at_utc
+        new_count: Count expression to store (default: the inserted count)
+    """
+    table = Count.__table__
+    new_count = stmt.excluded.count if new_count is None else new_count
+    return {
+        "count": new_count,
+        "updated_at_utc": case(
+            (table.c.count != new_count, stmt.excluded.updated_at_utc),
+            else_=table.c.updated_at_utc,
+        ),
+    }
+
+
+def changed_at_column(changed_at: datetime):
+    """updated_at_utc as a literal column for INSERT ... SELECT into counts."""
+    return literal(changed_at, Count.__table__.c.updated_at_utc.type).label("updated_at_utc")
+
+
+def upsert_counts(
+    db: Session,
+    rows: List[dict],
+    increment: bool = False
+) -> List[dict]:
+    """Insert or update count buckets in one statement.
+    
+    Args:
+        db: Database session
+        rows: Dicts with bucket_start_utc, bucket_size, topic, source, count
+            (keys must be unique within the batch)
+        increment: Add to existing counts instead of replacing them
+    
+    Returns:
+        Final rows as stored (after the increment, if any)
+    """
+    if not rows:
+        return []
+    
+    table = Count.__table__
+    changed_at = now_utc()
+    stmt = dialect_insert(db, table).values([{**row, "updated_at_utc": changed_at} for row in rows])
+    new_count = table.c.count + stmt.excluded.count if increment else stmt.excluded.count
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["bucket_start_utc", "bucket_size", "topic", "source"],
+        set_=count_conflict_set(stmt, new_count),
+    ).returning(
+        table.c.bucket_start_utc,
+        table.c.bucket_size,
+        table.c.topic,
+        table.c.source,
+        table.c.count,
+    )
+    return [dict(row._mapping) for row in db.execute(stmt)]
+
+
+def aggregate_new_articles(
+    db: Session,
+    articles: Iterable[Mapping],
+    bucket_size: str = "1m",
+    commit: bool = True
+) -> List[dict]:
+    """Apply count deltas for newly inserted articles.
+    
+    Cost depends only on the articles passed in, and late-arriving articles
+    update their own (possibly old) buckets rather than being missed by a
+    fixed rescan window.
+    
+    Deltas are only correct if applied exactly once per inserted article, so
+    the article writer applies them with commit=False inside the transaction
+    that inserts the articles.
+    
+    Args:
+        db: Database session
+        articles: Inserted article rows (published_at_utc, topic, source)
+        bucket_size: Bucket size string (1m, 5m, 60m)
+        commit: Commit (or roll back on error); False leaves both to the caller
+    
+    Returns:
+        Updated count rows (per-source and aggregate)
+    """
+    bucket_minutes = bucket_size_to_minutes(bucket_size)
+    
+    deltas: Counter = Counter()
+    for article in articles:
+        bucket_dt = bucket_start(article["published_at_utc"], bucket_minutes)
+        deltas[(bucket_dt, article["topic"], article["source"] or "")] += 1
+        deltas[(bucket_dt, article["topic"], "")] += 1  # Aggregate row
+    
+    if not deltas:
+        return []
+    
+    rows = [
+        {
+            "bucket_start_utc": bucket_dt,
+            "bucket_size": bucket_size,
+            "topic": topic,
+            "source": source,
+            "count": count,
+        }
+        for (bucket_dt, topic, source), count in deltas.items()
+    ]
+    
+    if not commit:
+        return upsert_counts(db, rows, increment=True)
+    
+    try:
+        updated = upsert_counts(db, rows, increment=True)
+        db.commit()
+        logger.info(f"Applied deltas to {len(updated)} count buckets for {bucket_size}")
+        return updated
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error applying count deltas: {e}", exc_info=True)
+        raise
+
+
+def bucket_expr(db: Session, column, bucket_minutes: int):
+    """SQL expression truncating a timestamp column to its bucket start.
+    
+    Buckets are aligned to the Unix epoch, which matches bucket_start() for
+    sizes that divide an hour. On SQLite the result is rendered in the same
+    text format SQLAlchemy uses for stored datetimes so keys compare equal.
+    """
+    seconds = bucket_minutes * 60
+    if db.get_bind().dialect.name == "sqlite":
+        epoch = cast(func.strftime("%s", column), Integer)
+        return func.strftime("%Y-%m-%d %H:%M:%S.000000", (epoch // seconds) * seconds, "unixepoch")
+    return func.to_timestamp(func.floor(func.extract("epoch", column) / seconds) * seconds)
+
+
+def aggregate_counts_sql(
+    db: Session,
+    bucket_size: str = "1m",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None
+) -> List[dict]:
+    """Aggregate article counts entirely inside the database.
+    
+    Runs one INSERT ... SELECT ... GROUP BY ... ON CONFLICT DO UPDATE that
+    writes both per-source and aggregate (source="") rows, so no article rows
+    reach Python and arbitrary historical ranges can be recomputed cheaply.
+    Buckets in the range are overwritten with the recomputed counts.
+    
+    Args:
+        db: Database session
+        bucket_size: Bucket size string (1m, 5m, 60m)
+        since: Range start (default: last hour), aligned down to a bucket
+        until: Optional range end (exclusive), aligned up to a bucket
+    
+    Returns:
+        Upserted count rows
+    """
+    bucket_minutes = bucket_size_to_minutes(bucket_size)
+    
+    if since is None:
+        since = now_utc() - timedelta(hours=1)
+    since = bucket_start(since, bucket_minutes)
+    
+    conditions = [Article.published_at_utc >= since]
+    if until is not None:
+        until_start = bucket_start(until, bucket_minutes)
+        if until_start < until:
+            until_start += timedelta(minutes=bucket_minutes)
+        conditions.append(Article.published_at_utc < until_start)
+    
+    bucket = bucket_expr(db, Article.published_at_utc, bucket_minutes)
+    size = literal(bucket_size, String)
+    per_source = select(
+        bucket.label("bucket_start_utc"),
+        size.label("bucket_size"),
+        Article.topic.label("topic"),
+        func.coalesce(Article.source, "").label("source"),
+        func.count().label("count"),
+    ).where(*conditions).group_by(bucket, Article.topic, Article.source)
+    aggregate = select(
+        bucket.label("bucket_start_utc"),
+        size.label("bucket_size"),
+        Article.topic.label("topic"),
+        literal("", String).label("source"),
+        func.count().label("count"),
+    ).where(*conditions).group_by(bucket, Article.topic)
+    
+    grouped = union_all(per_source, aggregate).subquery()
+    columns = ["bucket_start_utc", "bucket_size", "topic", "source", "count"]
+    # SQLite needs a WHERE before ON CONFLICT in INSERT ... SELECT
+    rows = select(*[grouped.c[col] for col in columns], changed_at_column(now_utc())).where(true())
+    
+    table = Count.__table__
+    stmt = dialect_insert(db, table).from_select(columns + ["updated_at_utc"], rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["bucket_start_utc", "bucket_size", "topic", "source"],
+        set_=count_conflict_set(stmt),
+    ).returning(*[table.c[col] for col in columns])
+    
+    try:
+        updated = [dict(row._mapping) for row in db.execute(stmt)]
+        db.commit()
+        logger.info(f"Recomputed {len(updated)} count buckets for {bucket_size} since {since}")
+        return updated
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error aggregating counts in SQL: {e}", exc_info=True)
+        raise
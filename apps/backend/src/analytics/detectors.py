@@ -0,0 +1,352 @@
+"""Pluggable batched anomaly detectors."""
+
+import math
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Mapping, Optional, Type, get_args
+import numpy as np
+
+from .anomaly import score_matrix
+from .store import SeriesKey
+from ..core.schemas import Topic
+
+# Scale floor for detectors that estimate a spread, in counts per bucket
+MIN_SCALE = 1.0
+
+
+def covered_span(values: np.ndarray) -> np.ndarray:
+    """Get a mask of each series' buckets from its first to its latest present one."""
+    present = ~np.isnan(values)
+    first = np.argmax(present, axis=1)
+    latest = values.shape[1] - 1 - np.argmax(present[:, ::-1], axis=1)
+    columns = np.arange(values.shape[1])
+    return (columns >= first[:, None]) & (columns <= latest[:, None]) & present.any(axis=1)[:, None]
+
+
+def fill_absent(values: np.ndarray) -> np.ndarray:
+    """Zero the absent buckets inside each series' covered span.
+    
+    The counts table has no rows for empty buckets, so a NaN between two
+    present buckets is a bucket with no articles, not a missing sample.
+    """
+    return np.where(covered_span(values) & np.isnan(values), 0.0, values)
+
+
+def split_latest(values: np.ndarray, fill: bool = False) -> Dict[str, np.ndarray]:
+    """Split each series into its latest present bucket and the history before it.
+    
+    Args:
+        values: 2D float array (series x buckets), NaN for absent buckets
+        fill: Zero absent buckets inside the covered span (see fill_absent)
+    
+    Returns:
+        Dict with latest (column index), observed, points (present buckets)
+        and history (a copy of values with the latest bucket masked out)
+    """
+    present = ~np.isnan(values)
+    latest = values.shape[1] - 1 - np.argmax(present[:, ::-1], axis=1)
+    rows = np.arange(len(values))
+    history = fill_absent(values) if fill else values.copy()
+    history[rows, latest] = np.nan
+    return {
+        "latest": latest,
+        "observed": values[rows, latest],
+        "points": present.sum(axis=1),
+        "history": history,
+    }
+
+
+class Detector(ABC):
+    """Scores the latest present bucket of every row of a count matrix.
+    
+    Subclasses implement score() over the whole (series x buckets) matrix in
+    one vectorized pass and return the same arrays as score_matrix(), plus a
+    per-row method label. Deviations are compared against the detection
+    threshold, so each detector documents what its units are. Detectors with
+    `fills_absent` set treat absent buckets inside a series' covered span as
+    zero counts rather than skipping them.
+    """
+    
+    name = ""
+    fills_absent = False
+    
+    @abstractmethod
+    def score(self, values: np.ndarray) -> Dict[str, np.ndarray]:
+        """Score a matrix.
+        
+        Args:
+            values: 2D float array (series x buckets), NaN for absent buckets
+        
+        Returns:
+            Dict of per-series arrays: latest, observed, expected, scale,
+            deviation, points and method
+        """
+    
+    def _result(self, parts: Dict[str, np.ndarray], expected, scale, deviation) -> Dict[str, np.ndarray]:
+        return {
+            "latest": parts["latest"],
+            "observed": parts["observed"],
+            "expected": expected,
+            "scale": scale,
+            "deviation": deviation,
+            "points": parts["points"],
+            "method": np.full(len(expected), self.name, dtype=object),
+        }
+
+
+class MADDetector(Detector):
+    """Median/MAD over the window with a z-score fallback (the original detector).
+    
+    Deviation is |x - median| / MAD, or a signed z-score for near-constant
+    series.
+    """
+    
+    name = "mad"
+    
+    def score(self, values: np.ndarray) -> Dict[str, np.ndarray]:
+        scores = score_matrix(values)
+        scores["method"] = np.where(scores["scale"] < 0.1, "zscore", "mad").astype(object)
+        return scores
+
+
+class EWMADetector(Detector):
+    """Exponentially weighted mean and variance of the history.
+    
+    Recent buckets dominate the baseline, so it follows trends and level
+    changes that a flat window median lags behind. Deviation is
+    |x - mean| / stddev, with the stddev floored at MIN_SCALE.
+    """
+    
+    name = "ewma"
+    fills_absent = True
+    
+    def __init__(self, alpha: float = 0.1):
+        """Initialize detector.
+        
+        Args:
+            alpha: Smoothing factor; higher weighs recent buckets more
+        """
+        self.alpha = alpha
+    
+    def score(self, values: np.ndarray) -> Dict[str, np.ndarray]:
+        parts = split_latest(values, fill=True)
+        mean = np.full(len(values), np.nan)
+        var = np.zeros(len(values))
+        
+        # One vectorized step per bucket across all series; state starts at the first present bucket
+        for column in parts["history"].T:
+            present = ~np.isnan(column)
+            first = present & np.isnan(mean)
+            mean[first] = column[first]
+            update = present & ~first
+            diff = column[update] - mean[update]
+            increment = self.alpha * diff
+            mean[update] += increment
+            var[update] = (1 - self.alpha) * (var[update] + diff * increment)
+        
+        expected = np.where(np.isnan(mean), parts["observed"], mean)
+        scale = np.maximum(np.sqrt(var), MIN_SCALE)
+        deviation = np.abs(parts["observed"] - expected) / scale
+        return self._result(parts, expected, scale, deviation)
+
+
+class CUSUMDetector(Detector):
+    """Two-sided tabular CUSUM against the window's median/MAD.
+    
+    Accumulates standardized deviations beyond a slack of `k` sigmas, so a
+    sustained small shift is flagged even when no single bucket is extreme.
+    A side is reset once it crosses `h` inside the history, so a shift that
+    was already flagged does not re-alarm on every following bucket.
+    Deviation is the larger accumulated sum at the latest bucket.
+    """
+    
+    name = "cusum"
+    fills_absent = True
+    
+    def __init__(self, k: float = 0.5, h: float = 4.0):
+        """Initialize detector.
+        
+        Args:
+            k: Slack in sigmas absorbed per bucket
+            h: Decision interval at which the history sums are reset
+        """
+        self.k = k
+        self.h = h
+    
+    def score(self, values: np.ndarray) -> Dict[str, np.ndarray]:
+        parts = split_latest(values, fill=True)
+        history = parts["history"]
+        empty = np.isnan(history).all(axis=1)
+        history_filled = np.where(empty[:, None], 0.0, history)
+        
+        expected = np.nanmedian(history_filled, axis=1)
+        mad = np.nanmedian(np.abs(history_filled - expected[:, None]), axis=1)
+        # Consistent sigma estimate; stddev fallback for near-constant series
+        sigma = np.where(mad < 0.1, np.nanstd(history_filled, axis=1), mad * 1.4826)
+        scale = np.maximum(sigma, MIN_SCALE)
+        
+        upper = np.zeros(len(values))
+        lower = np.zeros(len(values))
+        for column in history.T:
+            present = ~np.isnan(column)
+            z = (column[present] - expected[present]) / scale[present]
+            upper[present] = np.maximum(0.0, upper[present] + z - self.k)
+            lower[present] = np.maximum(0.0, lower[present] - z - self.k)
+            upper[upper >= self.h] = 0.0
+            lower[lower >= self.h] = 0.0
+        
+        z = (parts["observed"] - expected) / scale
+        upper = np.maximum(0.0, upper + z - self.k)
+        lower = np.maximum(0.0, lower - z - self.k)
+        return self._result(parts, expected, scale, np.maximum(upper, lower))
+
+
+def poisson_log10_tail(k: np.ndarray, lam: np.ndarray, terms: int = 64) -> np.ndarray:
+    """log10 of the Poisson tail probability of k on its side of the mean.
+    
+    P(X >= k) when k >= lam, otherwise P(X <= k). Terms are summed outward
+    from k in log space, with a geometric bound for the remainder, so tiny
+    probabilities don't cancel to zero as 1 - cdf would.
+    """
+    k = np.asarray(k, dtype=float)
+    lam = np.asarray(lam, dtype=float)
+    log_lam = np.log(lam)
+    log_pmf = k * log_lam - lam - np.vectorize(math.lgamma, otypes=[float])(k + 1)
+    
+    upper = k >= lam
+    steps = np.arange(1, terms)
+    # Ratio between consecutive terms moving away from the mean
+    up = log_lam[:, None] - np.log(k[:, None] + steps)
+    down_base = k[:, None] - steps + 1
+    down = np.where(down_base > 0, np.log(np.maximum(down_base, 1.0)) - log_lam[:, None], -np.inf)
+    ratios = np.where(upper[:, None], up, down)
+    
+    log_terms = np.concatenate([log_pmf[:, None], log_pmf[:, None] + np.cumsum(ratios, axis=1)], axis=1)
+    peak = log_terms.max(axis=1)
+    total = np.exp(log_terms - peak[:, None]).sum(axis=1)
+    
+    # Remainder after the last term is bounded by a geometric series
+    last_ratio = np.exp(ratios[:, -1])
+    remainder = np.where(last_ratio < 1, np.exp(log_terms[:, -1] - peak) * last_ratio / (1 - last_ratio), 0.0)
+    log_p = peak + np.log(total + remainder)
+    return np.minimum(log_p, 0.0) / math.log(10)
+
+
+class PoissonDetector(Detector):
+    """Poisson tail probability against the history's mean rate.
+    
+    Suited to low-volume series, where counts are small integers and the
+    MAD collapses to zero. Deviation is -log10 of the tail probability, so
+    the default threshold of 4 flags buckets with p <= 1e-4.
+    """
+    
+    name = "poisson"
+    fills_absent = True
+    
+    def __init__(self, min_rate: float = 0.1, max_deviation: float = 300.0):
+        """Initialize detector.
+        
+        Args:
+            min_rate: Floor on the expected rate, so one event after a silent
+                window isn't infinitely surprising
+            max_deviation: Cap on the reported deviation
+        """
+        self.min_rate = min_rate
+        self.max_deviation = max_deviation
+    
+    def score(self, values: np.ndarray) -> Dict[str, np.ndarray]:
+        parts = split_latest(values, fill=True)
+        history = parts["history"]
+        empty = np.isnan(history).all(axis=1)
+        mean = np.nanmean(np.where(empty[:, None], 0.0, history), axis=1)
+        expected = np.maximum(mean, self.min_rate)
+        
+        observed = np.maximum(parts["observed"], 0.0)
+        deviation = np.minimum(-poisson_log10_tail(observed, expected), self.max_deviation)
+        return self._result(parts, expected, np.sqrt(expected), deviation)
+
+
+DETECTORS: Dict[str, Type[Detector]] = {
+    detector.name: detector
+    for detector in (MADDetector, EWMADetector, CUSUMDetector, PoissonDetector)
+}
+
+
+def get_detector(name: str) -> Detector:
+    """Get a detector instance by name.
+    
+    Raises:
+        ValueError: If no detector is registered under the name
+    """
+    detector = DETECTORS.get(name)
+    if detector is None:
+        raise ValueError(f"Unknown anomaly detector {name!r}; expected one of {', '.join(DETECTORS)}")
+    return detector()
+
+
+def validate_detector_settings(default: str, topic_detectors: Mapping[str, str]) -> None:
+    """Check ANOMALY_DETECTOR and ANOMALY_TOPIC_DETECTORS once at startup.
+    
+    Raises:
+        ValueError: If a detector or topic name is unknown
+    """
+    for name in [default, *topic_detectors.values()]:
+        get_detector(name)
+    topics = get_args(Topic)
+    unknown = sorted(set(topic_detectors) - set(topics))
+    if unknown:
+        raise ValueError(f"Unknown topic(s) in ANOMALY_TOPIC_DETECTORS: {', '.join(unknown)}; expected {', '.join(topics)}")
+
+
+def scoring_points(values: np.ndarray, names: Iterable[str]) -> np.ndarray:
+    """Get the buckets each series would be scored on by its assigned detector.
+    
+    Present buckets for detectors that skip absent ones, otherwise the
+    covered span, so quiet series aren't excluded for having few rows.
+    """
+    fills = np.array([DETECTORS[name].fills_absent for name in names], dtype=bool)
+    present = ~np.isnan(values)
+    return np.where(fills, covered_span(values).sum(axis=1), present.sum(axis=1))
+
+
+def assign_detectors(
+    keys: List[SeriesKey],
+    default: str = "mad",
+    topic_detectors: Optional[Mapping[str, str]] = None
+) -> np.ndarray:
+    """Get the detector name for each (topic, source) series."""
+    topic_detectors = topic_detectors or {}
+    return np.array([topic_detectors.get(topic, default) for topic, _ in keys], dtype=object)
+
+
+def score_series(
+    values: np.ndarray,
+    names: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """Score each row of a matrix with its assigned detector.
+    
+    Rows are grouped by detector, so every detector runs once over its rows
+    of the already-loaded matrix.
+    
+    Args:
+        values: 2D float array (series x buckets), NaN for absent buckets
+        names: Detector name per row (see assign_detectors)
+    
+    Returns:
+        Merged Dict of per-series arrays as returned by Detector.score()
+    """
+    n = len(values)
+    merged = {
+        "latest": np.zeros(n, dtype=np.int64),
+        "observed": np.zeros(n),
+        "expected": np.zeros(n),
+        "scale": np.zeros(n),
+        "deviation": np.zeros(n),
+        "points": np.zeros(n, dtype=np.int64),
+        "method": np.empty(n, dtype=object),
+    }
+    for name in sorted(set(names)):
+        rows = np.flatnonzero(names == name)
+        scores = get_detector(name).score(values[rows])
+        for field, array in merged.items():
+            array[rows] = scores[field]
+    return merged
@@ -0,0 +1,227 @@
+"""Cascading multi-resolution rollups (1m -> 5m -> 60m)."""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import func, literal, select, true, String
+from sqlalchemy.orm import Session
+
+from ..models import Count, RollupWatermark
+from ..core.db import dialect_insert
+from .bucket import bucket_expr, changed_at_column, count_conflict_set
+from .store import TimeSeriesStore
+from ..utils.time import bucket_start, bucket_size_to_minutes, now_utc, UTC
+
+logger = logging.getLogger(__name__)
+
+# (source size, target size) pairs, finest first so each level reads finalized input
+ROLLUP_CHAIN: Tuple[Tuple[str, str], ...] = (("1m", "5m"), ("5m", "60m"))
+
+
+def _as_utc(dt: datetime) -> datetime:
+    return UTC.localize(dt) if dt.tzinfo is None else dt
+
+
+def _runs(bucket_starts: Iterable[datetime], bucket_minutes: int) -> List[Tuple[datetime, datetime]]:
+    """Collapse bucket starts into contiguous [start, end) ranges."""
+    step = timedelta(minutes=bucket_minutes)
+    runs: List[Tuple[datetime, datetime]] = []
+    for start in sorted(set(bucket_starts)):
+        if runs and runs[-1][1] == start:
+            runs[-1] = (runs[-1][0], start + step)
+        else:
+            runs.append((start, start + step))
+    return runs
+
+
+def rollup_range(
+    db: Session,
+    source_size: str,
+    target_size: str,
+    start: datetime,
+    end: datetime
+) -> List[dict]:
+    """Recompute target buckets in [start, end) by summing source buckets.
+    
+    Per-source and aggregate rows roll up independently since both exist at
+    every level. Runs as a single INSERT ... SELECT ... GROUP BY upsert.
+    
+    Args:
+        db: Database session
+        source_size: Finer bucket size to read (1m, 5m)
+        target_size: Coarser bucket size to write (5m, 60m)
+        start: Range start, aligned to target buckets
+        end: Range end (exclusive), aligned to target buckets
+    
+    Returns:
+        Upserted target count rows
+    """
+    target_minutes = bucket_size_to_minutes(target_size)
+    bucket = bucket_expr(db, Count.bucket_start_utc, target_minutes)
+    
+    rows = select(
+        bucket.label("bucket_start_utc"),
+        literal(target_size, String).label("bucket_size"),
+        Count.topic,
+        Count.source,
+        func.sum(Count.count).label("count"),
+        changed_at_column(now_utc()),
+    ).where(
+        Count.bucket_size == source_size,
+        Count.bucket_start_utc >= start,
+        Count.bucket_start_utc < end,
+        true(),  # SQLite needs a WHERE before ON CONFLICT in INSERT ... SELECT
+    ).group_by(bucket, Count.topic, Count.source)
+    
+    columns = ["bucket_start_utc", "bucket_size", "topic", "source", "count"]
+    table = Count.__table__
+    stmt = dialect_insert(db, table).from_select(columns + ["updated_at_utc"], rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["bucket_start_utc", "bucket_size", "topic", "source"],
+        set_=count_conflict_set(stmt),
+    ).returning(*[table.c[col] for col in columns])
+    return [dict(row._mapping) for row in db.execute(stmt)]
+
+
+def _get_watermark(db: Session, source_size: str, target_size: str) -> Optional[datetime]:
+    """Get the target watermark, seeding it from the oldest source bucket."""
+    row = db.get(RollupWatermark, target_size)
+    if row is not None:
+        return _as_utc(row.watermark_utc)
+    
+    oldest = db.query(func.min(Count.bucket_start_utc)).filter(
+        Count.bucket_size == source_size
+    ).scalar()
+    if oldest is None:
+        return None
+    return bucket_start(_as_utc(oldest), bucket_size_to_minutes(target_size))
+
+
+def _set_watermark(db: Session, target_size: str, watermark: datetime) -> None:
+    row = db.get(RollupWatermark, target_size)
+    if row is None:
+        db.add(RollupWatermark(bucket_size=target_size, watermark_utc=watermark))
+    else:
+        row.watermark_utc = watermark
+
+
+def update_rollups(
+    db: Session,
+    touched: Iterable[datetime] = (),
+    now: Optional[datetime] = None,
+    store: Optional[TimeSeriesStore] = None
+) -> Dict[str, int]:
+    """Advance coarse rollups and patch buckets that received late data.
+    
+    Each coarse bucket is computed once when it closes (its end passes the
+    watermark). Buckets behind the watermark are only recomputed when one of
+    their source buckets is in `touched`, and the patched buckets cascade to
+    the next level.
+    
+    Args:
+        db: Database session
+        touched: Start times of finest-level buckets updated since the last call
+        now: Current time (default: now)
+        store: Optional time-series store to update with the written rows
+    
+    Returns:
+        Number of target buckets written per target size
+    """
+    now = now or now_utc()
+    dirty: Set[datetime] = {_as_utc(dt) for dt in touched}
+    written: Dict[str, int] = {}
+    # A level may only finalize buckets its input level has finalized
+    input_closed = bucket_start(now, bucket_size_to_minutes(ROLLUP_CHAIN[0][0]))
+    
+    try:
+        for source_size, target_size in ROLLUP_CHAIN:
+            target_minutes = bucket_size_to_minutes(target_size)
+            watermark = _get_watermark(db, source_size, target_size)
+            closed = min(bucket_start(now, target_minutes), bucket_start(input_closed, target_minutes))
+            
+            # Patch finalized buckets that received late source data
+            late = {bucket_start(dt, target_minutes) for dt in dirty}
+            if watermark is not None:
+                late = {dt for dt in late if dt < watermark}
+            
+            rows: List[dict] = []
+            for start, end in _runs(late, target_minutes):
+                rows.extend(rollup_range(db, source_size, target_size, start, end))
+            
+            # Finalize buckets that closed since the last run
+            if watermark is not None and watermark < closed:
+                rows.extend(rollup_range(db, source_size, target_size, watermark, closed))
+            if watermark is not None:
+                _set_watermark(db, target_size, max(watermark, closed))
+            
+            written[target_size] = len(rows)
+            if store is not None:
+                store.update(rows)
+            dirty = {_as_utc(row["bucket_start_utc"]) for row in rows}
+            input_closed = max(watermark, closed) if watermark is not None else closed
+        
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error updating rollups: {e}", exc_info=True)
+        raise
+    
+    if any(written.values()):
+        logger.info(f"Rolled up count buckets: {written}")
+    return written
+
+
+def recompute_rollups(
+    db: Session,
+    since: datetime,
+    until: Optional[datetime] = None,
+    source_size: str = "1m",
+    store: Optional[TimeSeriesStore] = None
+) -> Dict[str, int]:
+    """Cascade a recomputed range of `source_size` buckets to the coarser levels.
+    
+    Coarse buckets overlapping [since, until) that are already behind their
+    watermark are rebuilt from the level below; later buckets are left to
+    update_rollups(), which finalizes them when they close.
+    
+    Args:
+        db: Database session
+        since: Start of the recomputed range
+        until: End of the recomputed range (exclusive, default: now)
+        source_size: Bucket size that was recomputed (1m or 5m)
+        store: Optional time-series store to update with the written rows
+    
+    Returns:
+        Number of target buckets written per target size
+    """
+    start = _as_utc(since)
+    end = _as_utc(until) if until else now_utc()
+    written: Dict[str, int] = {}
+    
+    try:
+        for level_source, target_size in ROLLUP_CHAIN:
+            if level_source != source_size:
+                continue
+            target_minutes = bucket_size_to_minutes(target_size)
+            watermark = _get_watermark(db, level_source, target_size)
+            start = bucket_start(start, target_minutes)
+            end_start = bucket_start(end, target_minutes)
+            end = end_start if end_start == end else end_start + timedelta(minutes=target_minutes)
+            
+            rows: List[dict] = []
+            if watermark is not None and start < min(end, watermark):
+                rows = rollup_range(db, level_source, target_size, start, min(end, watermark))
+            written[target_size] = len(rows)
+            if store is not None:
+                store.update(rows)
+            source_size = target_size
+        
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error recomputing rollups: {e}", exc_info=True)
+        raise
+    
+    if any(written.values()):
+        logger.info(f"Recomputed rollups for {since} - {until or 'now'}: {written}")
+    return written
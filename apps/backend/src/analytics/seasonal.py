@@ -0,0 +1,291 @@
+"""Seasonal (hour-of-week) baseline profiles."""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..models import SeasonalProfile
+from ..core.db import dialect_insert
+from .anomaly import MIN_POINTS, SCOPES, SeriesKey, build_series, deviation_scores, load_matrix, score_matrix
+from .store import TimeSeriesStore
+from ..utils.time import bucket_size_to_minutes, now_utc, UTC
+
+logger = logging.getLogger(__name__)
+
+SLOTS = 168  # Hours in a week
+HOUR = timedelta(hours=1)
+WEEK = timedelta(weeks=1)
+
+ProfileKey = Tuple[str, str, str]  # (bucket_size, topic, source)
+
+
+def hour_of_week(dt: datetime) -> int:
+    """Get the hour-of-week slot (0 = Monday 00:00 UTC)."""
+    if dt.tzinfo is None:
+        dt = UTC.localize(dt)
+    dt = dt.astimezone(UTC)
+    return dt.weekday() * 24 + dt.hour
+
+
+def index_slots(indexes: np.ndarray, bucket_size: str) -> np.ndarray:
+    """Vectorized hour_of_week() for bucket indexes."""
+    seconds = np.asarray(indexes, dtype=np.int64) * bucket_size_to_minutes(bucket_size) * 60
+    hours = seconds // 3600
+    # 1970-01-01 was a Thursday (weekday 3)
+    return ((hours // 24 + 3) % 7) * 24 + hours % 24
+
+
+class SeriesProfile:
+    """Median and MAD per hour-of-week slot for one series."""
+    
+    __slots__ = ("expected", "scale", "samples")
+    
+    def __init__(self):
+        self.expected = np.zeros(SLOTS, dtype=np.float32)
+        self.scale = np.ones(SLOTS, dtype=np.float32)
+        self.samples = np.zeros(SLOTS, dtype=np.uint16)
+
+
+class SeasonalProfiles:
+    """Hour-of-week baselines for every analyzed series.
+    
+    Each slot holds compute_baseline() over the series' present buckets in
+    that hour of the week across the last `weeks` weeks. Refreshing only
+    recomputes the slots of hours that closed since the last refresh, and a
+    lookup during detection is O(1) per series.
+    """
+    
+    def __init__(self, weeks: int = 4, min_samples: int = MIN_POINTS):
+        """Initialize profiles.
+        
+        Args:
+            weeks: Weeks of history behind each slot
+            min_samples: Minimum buckets in a slot before it replaces the flat baseline
+        """
+        self.weeks = weeks
+        self.min_samples = min_samples
+        self.profiles: Dict[ProfileKey, SeriesProfile] = {}
+        self.through: Dict[str, datetime] = {}  # Hours before this are folded in, per bucket size
+    
+    def __len__(self) -> int:
+        return len(self.profiles)
+    
+    def expectation(
+        self,
+        bucket_size: str,
+        topic: str,
+        source: str,
+        bucket_dt: datetime
+    ) -> Optional[Tuple[float, float]]:
+        """Get the seasonal (expected, scale) for a bucket, if the slot has enough samples."""
+        profile = self.profiles.get((bucket_size, topic, source))
+        if profile is None:
+            return None
+        slot = hour_of_week(bucket_dt)
+        if profile.samples[slot] < self.min_samples:
+            return None
+        return float(profile.expected[slot]), float(profile.scale[slot])
+    
+    def adjust(
+        self,
+        bucket_size: str,
+        keys: List[SeriesKey],
+        indexes: np.ndarray,
+        scores: Dict[str, np.ndarray],
+        rows: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Replace flat baselines in score_matrix() output with seasonal ones.
+        
+        Args:
+            bucket_size: Bucket size scored
+            keys: (topic, source) per scored row
+            indexes: Bucket index of each row's observed value
+            scores: score_matrix() output, updated in place
+            rows: Optional boolean mask of rows eligible for adjustment
+        
+        Returns:
+            Boolean mask of rows scored against a seasonal profile
+        """
+        slots = index_slots(indexes, bucket_size)
+        seasonal = np.zeros(len(keys), dtype=bool)
+        for row, ((topic, source), slot) in enumerate(zip(keys, slots)):
+            if rows is not None and not rows[row]:
+                continue
+            profile = self.profiles.get((bucket_size, topic, source))
+            if profile is None or profile.samples[slot] < self.min_samples:
+                continue
+            scores["expected"][row] = profile.expected[slot]
+            scores["scale"][row] = profile.scale[slot]
+            seasonal[row] = True
+        
+        deviation = deviation_scores(scores["observed"], scores["expected"], scores["scale"])
+        scores["deviation"] = np.where(seasonal, deviation, scores["deviation"])
+        if "method" in scores:
+            scores["method"] = np.where(seasonal, np.where(scores["scale"] < 0.1, "zscore", "mad"), scores["method"]).astype(object)
+        return seasonal
+    
+    def _load_hours(
+        self,
+        db: Session,
+        bucket_size: str,
+        hours: Iterable[datetime],
+        scopes: Iterable[str]
+    ) -> Tuple[List[SeriesKey], np.ndarray, np.ndarray]:
+        """Load the given hours as one matrix, with each column's slot."""
+        runs: List[List[datetime]] = []
+        for hour in sorted(set(hours)):
+            if runs and runs[-1][1] == hour:
+                runs[-1][1] = hour + HOUR
+            else:
+                runs.append([hour, hour + HOUR])
+        
+        parts = []
+        for run_start, run_end in runs:
+            start = TimeSeriesStore.bucket_index(run_start, bucket_size)
+            end = TimeSeriesStore.bucket_index(run_end, bucket_size)
+            keys, matrix = load_matrix(db, bucket_size, start, end, source=None)
+            keys, matrix = build_series(keys, matrix, scopes)
+            parts.append((keys, matrix, np.arange(start, end)))
+        
+        all_keys = sorted({key for keys, _, _ in parts for key in keys})
+        positions = {key: row for row, key in enumerate(all_keys)}
+        columns = np.concatenate([indexes for _, _, indexes in parts]) if parts else np.empty(0, dtype=np.int64)
+        combined = np.full((len(all_keys), len(columns)), np.nan)
+        offset = 0
+        for keys, matrix, indexes in parts:
+            rows = [positions[key] for key in keys]
+            combined[rows, offset:offset + len(indexes)] = matrix
+            offset += len(indexes)
+        return all_keys, combined, index_slots(columns, bucket_size)
+    
+    def _fold(
+        self,
+        bucket_size: str,
+        keys: List[SeriesKey],
+        matrix: np.ndarray,
+        column_slots: np.ndarray,
+        slots: Iterable[int]
+    ) -> None:
+        """Recompute the given slots from a loaded matrix."""
+        for key in keys:
+            if (bucket_size, *key) not in self.profiles:
+                self.profiles[(bucket_size, *key)] = SeriesProfile()
+        
+        for slot in slots:
+            sub = matrix[:, column_slots == slot]
+            samples = (~np.isnan(sub)).sum(axis=1)
+            rows = np.flatnonzero(samples > 0)
+            
+            # Slots with no data this time round are cleared
+            for key, profile in self.profiles.items():
+                if key[0] == bucket_size:
+                    profile.samples[slot] = 0
+            if not len(rows):
+                continue
+            
+            scores = score_matrix(sub[rows])
+            for n, row in enumerate(rows):
+                profile = self.profiles[(bucket_size, *keys[row])]
+                profile.expected[slot] = scores["expected"][n]
+                profile.scale[slot] = scores["scale"][n]
+                profile.samples[slot] = min(int(samples[row]), np.iinfo(np.uint16).max)
+    
+    def refresh(
+        self,
+        db: Session,
+        bucket_size: str = "1m",
+        now: Optional[datetime] = None,
+        scopes: Iterable[str] = SCOPES
+    ) -> int:
+        """Fold hours that closed since the last refresh into their slots.
+        
+        The first refresh (or one after a week or more of downtime) builds
+        every slot from a single range query.
+        
+        Args:
+            db: Database session
+            bucket_size: Bucket size to profile
+            now: Current time (default: now)
+            scopes: Series scopes (see build_series)
+        
+        Returns:
+            Number of slots recomputed
+        """
+        now = now or now_utc()
+        current_hour = now.replace(minute=0, second=0, microsecond=0)
+        through = self.through.get(bucket_size)
+        
+        if through is None or current_hour - through >= WEEK:
+            hours = [current_hour - HOUR * (i + 1) for i in range(self.weeks * SLOTS)]
+            slots = list(range(SLOTS))
+        else:
+            closed = [through + HOUR * i for i in range(int((current_hour - through) / HOUR))]
+            if not closed:
+                return 0
+            hours = [hour - WEEK * week for hour in closed for week in range(self.weeks)]
+            slots = sorted({hour_of_week(hour) for hour in closed})
+        
+        keys, matrix, column_slots = self._load_hours(db, bucket_size, hours, scopes)
+        self._fold(bucket_size, keys, matrix, column_slots, slots)
+        self.through[bucket_size] = current_hour
+        logger.info(f"Refreshed {len(slots)} seasonal slots for {len(keys)} {bucket_size} series")
+        return len(slots)
+    
+    def save(self, db: Session, bucket_size: str = "1m") -> int:
+        """Persist profiles for a bucket size.
+        
+        Returns:
+            Number of profiles written
+        """
+        through = self.through.get(bucket_size)
+        rows = [
+            {
+                "bucket_size": size,
+                "topic": topic,
+                "source": source,
+                "expected": profile.expected.tobytes(),
+                "scale": profile.scale.tobytes(),
+                "samples": profile.samples.tobytes(),
+                "through_utc": through,
+            }
+            for (size, topic, source), profile in self.profiles.items()
+            if size == bucket_size
+        ]
+        if not rows or through is None:
+            return 0
+        
+        table = SeasonalProfile.__table__
+        try:
+            # Chunked to stay under SQLite's bound parameter limit
+            for i in range(0, len(rows), 100):
+                stmt = dialect_insert(db, table).values(rows[i:i + 100])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["bucket_size", "topic", "source"],
+                    set_={col: stmt.excluded[col] for col in ("expected", "scale", "samples", "through_utc")},
+                )
+                db.execute(stmt)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error saving seasonal profiles: {e}", exc_info=True)
+            raise
+        return len(rows)
+    
+    def load(self, db: Session) -> int:
+        """Load persisted profiles.
+        
+        Returns:
+            Number of profiles loaded
+        """
+        for row in db.query(SeasonalProfile).all():
+            profile = SeriesProfile()
+            profile.expected = np.frombuffer(row.expected, dtype=np.float32).copy()
+            profile.scale = np.frombuffer(row.scale, dtype=np.float32).copy()
+            profile.samples = np.frombuffer(row.samples, dtype=np.uint16).copy()
+            self.profiles[(row.bucket_size, row.topic, row.source)] = profile
+            
+            through = row.through_utc if row.through_utc.tzinfo else UTC.localize(row.through_utc)
+            self.through[row.bucket_size] = max(self.through.get(row.bucket_size, through), through)
+        return len(self.profiles)
@@ -0,0 +1,228 @@
+"""Process-local ring-buffer store for recent count buckets."""
+
+import logging
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..models import Count
+from ..core.config import get_settings
+from ..utils.time import bucket_size_to_minutes, now_utc, UTC
+
+logger = logging.getLogger(__name__)
+
+BUCKET_SIZES = ("1m", "5m", "60m")
+
+SeriesKey = Tuple[str, str]  # (topic, source)
+
+
+class _Series:
+    """Fixed-size ring buffer for one series.
+    
+    Slot i holds the bucket whose epoch index is congruent to i modulo the
+    capacity; `index` records which bucket that is so stale slots read as
+    absent rather than as someone else's count.
+    """
+    
+    __slots__ = ("index", "values")
+    
+    def __init__(self, capacity: int):
+        self.index = np.full(capacity, -1, dtype=np.int64)
+        self.values = np.zeros(capacity, dtype=np.int64)
+
+
+class TimeSeriesStore:
+    """Recent counts per (bucket_size, topic, source) in NumPy ring buffers.
+    
+    The counts table stays the source of truth. The store is warmed from it at
+    startup and then kept current from the rows the aggregation step writes,
+    so detection and aggregate reads inside the hot window skip the database.
+    A bucket is authoritative from its warm start onwards: a bucket missing
+    there has no counts row. Reads fall back to the database once the store
+    hasn't been synced for `max_staleness` seconds, e.g. when another
+    process is doing the ingesting.
+    """
+    
+    def __init__(self, capacity: int = 288, max_staleness: Optional[float] = None):
+        """Initialize store.
+        
+        Args:
+            capacity: Buckets retained per series
+            max_staleness: Seconds without a sync after which reads fall back
+                to the database (None: never)
+        """
+        self.capacity = capacity
+        self.max_staleness = max_staleness
+        self._series: Dict[Tuple[str, str, str], _Series] = {}
+        self._head: Dict[str, int] = {}  # Latest bucket index written per size
+        self._covered_from: Dict[str, int] = {}  # First authoritative index per size
+        self._synced_at: Dict[str, float] = {}  # Monotonic time of the last sync per size
+    
+    def __len__(self) -> int:
+        return len(self._series)
+    
+    @staticmethod
+    def bucket_index(dt: datetime, bucket_size: str) -> int:
+        """Get the epoch-aligned index of the bucket containing dt."""
+        if dt.tzinfo is None:
+            dt = UTC.localize(dt)
+        return int(dt.timestamp()) // (bucket_size_to_minutes(bucket_size) * 60)
+    
+    @classmethod
+    def ceil_index(cls, dt: datetime, bucket_size: str) -> int:
+        """Get the index of the first bucket starting at or after dt."""
+        index = cls.bucket_index(dt, bucket_size)
+        if cls.index_start(index, bucket_size) < (dt if dt.tzinfo else UTC.localize(dt)):
+            index += 1
+        return index
+    
+    @staticmethod
+    def index_start(index: int, bucket_size: str) -> datetime:
+        """Get the UTC start time of a bucket index."""
+        return datetime.fromtimestamp(index * bucket_size_to_minutes(bucket_size) * 60, UTC)
+    
+    def update(self, rows: Iterable[Mapping]) -> int:
+        """Store final count values, e.g. rows returned by a counts upsert.
+        
+        Args:
+            rows: Rows with bucket_start_utc, bucket_size, topic, source, count
+        
+        Returns:
+            Number of buckets stored
+        """
+        stored = 0
+        for row in rows:
+            bucket_size = row["bucket_size"]
+            index = self.bucket_index(row["bucket_start_utc"], bucket_size)
+            key = (bucket_size, row["topic"], row["source"] or "")
+            
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(self.capacity)
+            
+            slot = index % self.capacity
+            if series.index[slot] > index:
+                continue  # Older than the retained window
+            series.index[slot] = index
+            series.values[slot] = row["count"]
+            self._head[bucket_size] = max(self._head.get(bucket_size, index), index)
+            stored += 1
+        return stored
+    
+    def warm(
+        self,
+        db: Session,
+        bucket_sizes: Iterable[str] = BUCKET_SIZES,
+        now: Optional[datetime] = None
+    ) -> int:
+        """Reload the retained window for each bucket size from the database.
+        
+        Args:
+            db: Database session
+            bucket_sizes: Bucket sizes to load
+            now: Current time (default: now)
+        
+        Returns:
+            Number of buckets loaded
+        """
+        now = now or now_utc()
+        loaded = 0
+        for bucket_size in bucket_sizes:
+            start = self.bucket_index(now, bucket_size) - self.capacity + 1
+            rows = db.query(
+                Count.bucket_start_utc,
+                Count.bucket_size,
+                Count.topic,
+                Count.source,
+                Count.count,
+            ).filter(
+                Count.bucket_size == bucket_size,
+                Count.bucket_start_utc >= self.index_start(start, bucket_size),
+            ).all()
+            
+            for key in [key for key in self._series if key[0] == bucket_size]:
+                del self._series[key]
+            self._head.pop(bucket_size, None)
+            loaded += self.update(row._mapping for row in rows)
+            self._covered_from[bucket_size] = start
+            self._synced_at[bucket_size] = time.monotonic()
+        
+        logger.info(f"Warmed time-series store with {loaded} buckets across {len(self._series)} series")
+        return loaded
+    
+    def mark_synced(self, bucket_sizes: Iterable[str] = BUCKET_SIZES) -> None:
+        """Record that the store holds every count written so far.
+        
+        Called after each ingest cycle, including cycles with no new counts.
+        """
+        now = time.monotonic()
+        for bucket_size in bucket_sizes:
+            self._synced_at[bucket_size] = now
+    
+    def is_stale(self, bucket_size: str) -> bool:
+        """Check whether the store has gone `max_staleness` seconds without a sync."""
+        if self.max_staleness is None:
+            return False
+        synced_at = self._synced_at.get(bucket_size)
+        return synced_at is None or time.monotonic() - synced_at > self.max_staleness
+    
+    def covers(self, bucket_size: str, start: int) -> bool:
+        """Check whether buckets from index `start` onwards can be read from the store."""
+        covered_from = self._covered_from.get(bucket_size)
+        if covered_from is None or self.is_stale(bucket_size):
+            return False
+        head = self._head.get(bucket_size, start)
+        return start >= max(covered_from, head - self.capacity + 1)
+    
+    def series_keys(self, bucket_size: str) -> List[SeriesKey]:
+        """Get (topic, source) pairs held for a bucket size."""
+        return [(topic, source) for size, topic, source in self._series if size == bucket_size]
+    
+    def window(
+        self,
+        bucket_size: str,
+        topic: str,
+        source: str,
+        start: int,
+        end: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Read bucket indexes [start, end) of one series.
+        
+        Returns:
+            Tuple of (values, present) arrays; values are 0 where not present
+        """
+        indexes = np.arange(start, end, dtype=np.int64)
+        series = self._series.get((bucket_size, topic, source or ""))
+        if series is None:
+            return np.zeros(len(indexes), dtype=np.int64), np.zeros(len(indexes), dtype=bool)
+        
+        slots = indexes % self.capacity
+        present = series.index[slots] == indexes
+        values = np.where(present, series.values[slots], 0)
+        return values, present
+    
+    def stats(self) -> dict:
+        """Get series count, capacity and retained range per bucket size."""
+        return {
+            "series": len(self._series),
+            "capacity": self.capacity,
+            "stale": [size for size in self._covered_from if self.is_stale(size)],
+            "memory_bytes": len(self._series) * self.capacity * 16,
+            "heads": {
+                size: self.index_start(head, size).isoformat()
+                for size, head in self._head.items()
+            },
+        }
+
+
+@lru_cache()
+def get_timeseries_store() -> TimeSeriesStore:
+    """Get the process-wide time-series store."""
+    settings = get_settings()
+    return TimeSeriesStore(
+        capacity=settings.timeseries_store_buckets,
+        max_staleness=settings.timeseries_store_max_staleness_seconds,
+    )
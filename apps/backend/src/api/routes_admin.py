@@ -1,18 +1,115 @@
 """Admin API routes."""
 
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
+from ..analytics.backfill import backfill_anomalies
+from ..analytics.bucket import aggregate_counts_sql
+from ..analytics.rollup import recompute_rollups
+from ..analytics.store import get_timeseries_store
+from ..core.cache import get_response_cache
+from ..core.config import get_settings
 from ..core.db import get_db
-from ..ingest.pipeline import IngestionPipeline
+from ..ingest.pipeline import get_pipeline
+from ..utils.time import parse_iso8601
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
 
 @router.post("/run-ingest")
-async def run_ingest():
-    """Manually trigger ingestion cycle."""
-    pipeline = IngestionPipeline()
-    stats = await pipeline.run_cycle()
+async def run_ingest(force: bool = True):
+    """Manually trigger ingestion cycle (polls all sources unless force=false)."""
+    pipeline = get_pipeline()
+    stats = await pipeline.run_cycle(force=force)
     return {"status": "success", "stats": stats}
 
+
+@router.get("/http-stats")
+async def http_stats():
+    """Get ingestion HTTP connection reuse statistics."""
+    return get_pipeline().http.stats()
+
+
+
+@router.get("/poll-schedule")
+async def poll_schedule():
+    """Get adaptive polling state per source id."""
+    scheduler = get_pipeline().poll_scheduler
+    return scheduler.stats() if scheduler else {}
+
+
+@router.get("/pipeline-stats")
+async def pipeline_stats():
+    """Get per-stage queue depth and throughput for the latest cycle."""
+    return get_pipeline().stage_stats()
+
+
+@router.get("/cache-stats")
+async def cache_stats():
+    """Get response cache generation, size and hit counts."""
+    return get_response_cache().stats()
+
+
+@router.post("/reaggregate")
+def reaggregate(
+    bucket_size: str = Query("1m", pattern="^(1m|5m|60m)$"),
+    since: str = Query(..., description="ISO8601 timestamp (UTC)"),
+    until: Optional[str] = Query(None, description="ISO8601 timestamp (UTC), exclusive"),
+    db: Session = Depends(get_db)
+):
+    """Recompute count buckets for a historical range with SQL-side GROUP BY.
+    
+    The recomputed range then cascades to the coarser rollups (5m, 60m), so
+    they and the totals estimated from them match the new counts.
+    
+    Declared sync so FastAPI runs it in the threadpool instead of blocking
+    the event loop for the duration of the recompute.
+    """
+    try:
+        since_dt = parse_iso8601(since)
+        until_dt = parse_iso8601(until) if until else None
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid since/until timestamp")
+    
+    store = get_timeseries_store()
+    rows = aggregate_counts_sql(db, bucket_size=bucket_size, since=since_dt, until=until_dt)
+    store.update(rows)
+    rollups = recompute_rollups(db, since_dt, until_dt, source_size=bucket_size, store=store)
+    get_response_cache().bump()
+    return {"status": "success", "buckets": len(rows), "rollups": rollups}
+
+
+@router.post("/backfill-anomalies")
+def backfill(
+    since: str = Query(..., description="ISO8601 timestamp (UTC)"),
+    until: Optional[str] = Query(None, description="ISO8601 timestamp (UTC), exclusive"),
+    bucket_size: str = Query("1m", pattern="^(1m|5m|60m)$"),
+    window_buckets: int = Query(288, ge=10, le=10080),
+    threshold: float = Query(4.0, gt=0),
+    replace: bool = Query(False, description="Delete anomalies already recorded in the range first"),
+    db: Session = Depends(get_db)
+):
+    """Run anomaly detection over every bucket of a historical range.
+    
+    Declared sync so FastAPI runs it in the threadpool instead of blocking
+    the event loop for the duration of the backfill.
+    """
+    try:
+        since_dt = parse_iso8601(since)
+        until_dt = parse_iso8601(until) if until else None
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid since/until timestamp")
+    
+    stats = backfill_anomalies(
+        db,
+        since=since_dt,
+        until=until_dt,
+        bucket_size=bucket_size,
+        window_buckets=window_buckets,
+        threshold=threshold,
+        scopes=get_settings().anomaly_scopes_list,
+        replace=replace,
+    )
+    get_response_cache().bump()
+    return {"status": "success", "stats": stats}
@@ -1,28 +1,127 @@
 """Aggregate API routes."""
 
 from datetime import datetime, timedelta
-from typing import Optional
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
+from itertools import repeat
+from operator import itemgetter
+from typing import List, Optional, Tuple, Union
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, select
 
-from ..core.db import get_db
-from ..core.schemas import AggregateResponse, CountResponse, Topic
+from ..core.config import get_settings
+from ..core.db import get_async_db
+from ..core.responses import FastJSONResponse
+from ..core.schemas import AggregateColumnarResponse, AggregateResponse, Topic
 from ..models import Count
-from ..utils.time import parse_iso8601, bucket_size_to_minutes
+from ..analytics.store import TimeSeriesStore, get_timeseries_store
+from ..utils.cursor import decode_change_cursor, encode_change_cursor
+from ..utils.time import parse_iso8601, bucket_size_to_minutes, now_utc, UTC
 
 router = APIRouter(prefix="/api/aggregate", tags=["aggregate"])
 
 
-@router.get("", response_model=AggregateResponse)
+BucketRow = Tuple[int, str, int]  # (bucket start epoch seconds, topic, count)
+
+
+def _epoch(dt: datetime) -> int:
+    if dt.tzinfo is None:
+        dt = UTC.localize(dt)
+    return int(dt.timestamp())
+
+
+def _rows_from_store(
+    store: TimeSeriesStore,
+    bucket_size: str,
+    start: int,
+    topic: Optional[str],
+    source: str
+) -> List[BucketRow]:
+    """Read buckets from the in-memory store, ordered by bucket start."""
+    end = store.bucket_index(now_utc(), bucket_size) + 1
+    seconds = bucket_size_to_minutes(bucket_size) * 60
+    if topic:
+        topics = [topic]
+    else:
+        topics = sorted({t for t, s in store.series_keys(bucket_size) if s == source})
+    
+    rows: List[BucketRow] = []
+    for topic_val in topics:
+        values, present = store.window(bucket_size, topic_val, source, start, end)
+        indexes = np.flatnonzero(present)
+        rows.extend(zip(
+            ((start + indexes) * seconds).tolist(),
+            repeat(topic_val),
+            values[indexes].astype(np.int64).tolist(),
+        ))
+    rows.sort(key=itemgetter(0))
+    return rows
+
+
+def _render(
+    rows: List[BucketRow],
+    fmt: str,
+    bucket_size: str,
+    topic: Optional[str],
+    source: Optional[str],
+    change_cursor: str
+) -> FastJSONResponse:
+    """Encode bucket rows as an AggregateResponse or AggregateColumnarResponse body."""
+    body = {
+        "bucket_size": bucket_size,
+        "topic": topic,
+        "source": source,
+        "change_cursor": change_cursor,
+    }
+    if fmt == "columnar":
+        series = {}
+        for t, topic_val, count in rows:
+            columns = series.get(topic_val)
+            if columns is None:
+                columns = series[topic_val] = {"t": [], "count": []}
+            columns["t"].append(t)
+            columns["count"].append(count)
+        body["series"] = series
+    else:
+        source_val = source or ""
+        body["buckets"] = [
+            {
+                "bucket_start_utc": datetime.fromtimestamp(t, UTC),
+                "bucket_size": bucket_size,
+                "topic": topic_val,
+                "source": source_val,
+                "count": count,
+            }
+            for t, topic_val, count in rows
+        ]
+    return FastJSONResponse(body)
+
+
+@router.get("", response_model=Union[AggregateResponse, AggregateColumnarResponse])
 async def get_aggregate(
-    bucket_size: str = Query("5m", regex="^(1m|5m|60m)$"),
+    bucket_size: str = Query("5m", pattern="^(1m|5m|60m)$"),
     topic: Optional[Topic] = Query(None),
     source: Optional[str] = Query(None),
     since: Optional[str] = Query(None, description="ISO8601 timestamp (UTC)"),
-    db: Session = Depends(get_db)
+    changes_since: Optional[str] = Query(None, description="change_cursor from a previous response"),
+    fmt: str = Query(
+        "rows", alias="format", pattern="^(rows|columnar)$",
+        description="rows (one object per bucket) or columnar (per-topic t/count arrays)"
+    ),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get time-series aggregate counts."""
+    """Get time-series aggregate counts.
+    
+    With changes_since, only buckets in the range whose count changed after
+    that change cursor are returned, to be merged into the series the client
+    already holds. Cursors trail the read by CHANGE_CURSOR_LAG_SECONDS, since
+    a writer stamps updated_at_utc before it commits; buckets changed within
+    that lag may be returned again by the next poll.
+    
+    Buckets are read as plain tuples and encoded with orjson. format=columnar
+    returns AggregateColumnarResponse instead: per-topic arrays of epoch
+    seconds and counts, several times smaller than one object per bucket.
+    """
     # Default to last 24 hours if since not provided
     if since:
         try:
@@ -34,7 +133,28 @@ async def get_aggregate(
         # Default to last 24 hours worth of buckets
         since_dt = datetime.utcnow() - timedelta(minutes=bucket_minutes * 288)
     
-    query = db.query(Count).filter(
+    if since_dt.tzinfo is None:
+        since_dt = UTC.localize(since_dt)
+    
+    # Rows stamped more than the lag before this read have been committed by
+    # now, so the next poll picks up anything a slower writer commits later
+    head = now_utc() - timedelta(seconds=get_settings().change_cursor_lag_seconds)
+    changed_after = None
+    if changes_since:
+        try:
+            changed_after = decode_change_cursor(changes_since, datetime)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        head = max(head, changed_after)
+    
+    # Serve from the in-memory store when it holds the whole range
+    store = get_timeseries_store()
+    start = store.ceil_index(since_dt, bucket_size)
+    if changed_after is None and store.covers(bucket_size, start):
+        rows = _rows_from_store(store, bucket_size, start, topic, source or "")
+        return _render(rows, fmt, bucket_size, topic, source, encode_change_cursor(head))
+    
+    stmt = select(Count.bucket_start_utc, Count.topic, Count.count).where(
         and_(
             Count.bucket_size == bucket_size,
             Count.bucket_start_utc >= since_dt
@@ -42,28 +162,20 @@ async def get_aggregate(
     )
     
     if topic:
-        query = query.filter(Count.topic == topic)
+        stmt = stmt.where(Count.topic == topic)
     
     if source:
-        query = query.filter(Count.source == source)
+        stmt = stmt.where(Count.source == source)
     else:
         # Default to aggregate (source='' for SQLite compatibility)
-        query = query.filter(
+        stmt = stmt.where(
             (Count.source == "") | (Count.source.is_(None))
         )
     
-    counts = query.order_by(Count.bucket_start_utc).all()
+    if changed_after is not None:
+        stmt = stmt.where(Count.updated_at_utc > changed_after)
     
-    return AggregateResponse(
-        buckets=[CountResponse(
-            bucket_start_utc=c.bucket_start_utc,
-            bucket_size=c.bucket_size,
-            topic=c.topic,
-            source=c.source,
-            count=c.count
-        ) for c in counts],
-        bucket_size=bucket_size,
-        topic=topic,
-        source=source
-    )
+    result = (await db.execute(stmt.order_by(Count.bucket_start_utc))).all()
+    rows = [(_epoch(bucket_start), topic_val, count) for bucket_start, topic_val, count in result]
+    return _render(rows, fmt, bucket_size, topic, source, encode_change_cursor(head))
 
@@ -2,13 +2,15 @@
 
 from datetime import datetime, timedelta
 from typing import Optional
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, func, select
 
-from ..core.db import get_db
+from ..core.db import get_async_db
 from ..core.schemas import AnomalyResponse, AnomalyListResponse, Topic
 from ..models import Anomaly
+from ..utils.cursor import decode_change_cursor, encode_change_cursor
+from ..utils.time import parse_iso8601
 
 router = APIRouter(prefix="/api/anomalies", tags=["anomalies"])
 
@@ -16,37 +18,61 @@ router = APIRouter(prefix="/api/anomalies", tags=["anomalies"])
 @router.get("", response_model=AnomalyListResponse)
 async def get_anomalies(
     topic: Optional[Topic] = Query(None),
+    source: Optional[str] = Query(None, description="Source name; empty string for aggregate series"),
     since: Optional[str] = Query(None, description="ISO8601 timestamp (UTC)"),
     bucket_size: Optional[str] = Query(None, regex="^(1m|5m|60m)$"),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    changes_since: Optional[str] = Query(None, description="change_cursor from a previous response"),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get detected anomalies."""
-    query = db.query(Anomaly)
+    """Get detected anomalies.
+    
+    With changes_since, only anomalies recorded after that change cursor are
+    returned (oldest first, up to limit) and total is the number returned.
+    """
+    stmt = select(Anomaly)
     
     if topic:
-        query = query.filter(Anomaly.topic == topic)
+        stmt = stmt.where(Anomaly.topic == topic)
+    
+    if source is not None:
+        stmt = stmt.where(Anomaly.source == source)
     
     if bucket_size:
-        query = query.filter(Anomaly.bucket_size == bucket_size)
+        stmt = stmt.where(Anomaly.bucket_size == bucket_size)
     
     if since:
         try:
             since_dt = parse_iso8601(since)
-            query = query.filter(Anomaly.created_at_utc >= since_dt)
+            stmt = stmt.where(Anomaly.created_at_utc >= since_dt)
         except Exception:
             pass
     else:
         # Default to last 7 days
         since_dt = datetime.utcnow() - timedelta(days=7)
-        query = query.filter(Anomaly.created_at_utc >= since_dt)
+        stmt = stmt.where(Anomaly.created_at_utc >= since_dt)
+    
+    if changes_since:
+        try:
+            last_id = decode_change_cursor(changes_since, int)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        anomalies = (await db.scalars(stmt.where(Anomaly.id > last_id).order_by(Anomaly.id).limit(limit))).all()
+        return AnomalyListResponse(
+            items=[AnomalyResponse.model_validate(a) for a in anomalies],
+            total=len(anomalies),
+            change_cursor=encode_change_cursor(anomalies[-1].id if anomalies else last_id)
+        )
     
-    total = query.count()
+    # Taken before the list is read so nothing inserted meanwhile is missed
+    head_id = await db.scalar(select(func.max(Anomaly.id))) or 0
+    total = await db.scalar(select(func.count()).select_from(stmt.subquery()))
     
-    anomalies = query.order_by(desc(Anomaly.created_at_utc)).limit(limit).all()
+    anomalies = (await db.scalars(stmt.order_by(desc(Anomaly.created_at_utc)).limit(limit))).all()
     
     return AnomalyListResponse(
-        items=[AnomalyResponse.from_orm(a) for a in anomalies],
-        total=total
+        items=[AnomalyResponse.model_validate(a) for a in anomalies],
+        total=total,
+        change_cursor=encode_change_cursor(head_id)
     )
 
@@ -1,18 +1,67 @@
 """News API routes."""
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, desc, func, or_, select
 
-from ..core.db import get_db
+from ..core.db import get_async_db
+from ..core.responses import FastJSONResponse
 from ..core.schemas import ArticleResponse, ArticleListResponse, Topic
-from ..models import Article
-from ..utils.time import parse_iso8601, UTC
+from ..models import Article, Count, RollupWatermark
+from ..utils.cursor import decode_change_cursor, decode_cursor, encode_change_cursor, encode_cursor
+from ..utils.time import bucket_start, parse_iso8601, UTC
 
 router = APIRouter(prefix="/api/news", tags=["news"])
 
+# Selected as plain columns so pages skip ORM hydration and per-item validation
+ARTICLE_COLUMNS = [getattr(Article, name) for name in ArticleResponse.model_fields]
+
+
+async def _sum_counts(db: AsyncSession, bucket_size: str, topic: Optional[str], source: Optional[str], start, end) -> int:
+    """Sum count buckets in [start, end) (either bound may be None)."""
+    stmt = select(func.coalesce(func.sum(Count.count), 0)).where(
+        Count.bucket_size == bucket_size,
+        Count.source == (source or ""),
+    )
+    if topic:
+        stmt = stmt.where(Count.topic == topic)
+    if start is not None:
+        stmt = stmt.where(Count.bucket_start_utc >= start)
+    if end is not None:
+        stmt = stmt.where(Count.bucket_start_utc < end)
+    return int(await db.scalar(stmt))
+
+
+async def _estimate_total(db: AsyncSession, topic: Optional[str], source: Optional[str], since: Optional[datetime]) -> int:
+    """Estimate matching articles from the counts table instead of COUNT(*).
+    
+    Hours behind the 60m rollup watermark are summed from hourly buckets and
+    the rest from 1m buckets, so the cost tracks hours of history rather
+    than articles. Minute-level bucketing of `since` makes this an estimate.
+    """
+    watermark = await db.get(RollupWatermark, "60m")
+    hourly_end = watermark.watermark_utc if watermark else None
+    if hourly_end is not None and hourly_end.tzinfo is None:
+        hourly_end = UTC.localize(hourly_end)
+    
+    minute_start = bucket_start(since, 1) if since else None
+    hourly_start = None
+    if since:
+        hourly_start = bucket_start(since, 60)
+        if hourly_start < since:
+            hourly_start += timedelta(hours=1)
+    
+    if hourly_end is None or (hourly_start is not None and hourly_start >= hourly_end):
+        return await _sum_counts(db, "1m", topic, source, minute_start, None)
+    
+    total = await _sum_counts(db, "60m", topic, source, hourly_start, hourly_end)
+    total += await _sum_counts(db, "1m", topic, source, hourly_end, None)
+    if hourly_start is not None:
+        total += await _sum_counts(db, "1m", topic, source, minute_start, hourly_start)
+    return total
+
 
 @router.get("", response_model=ArticleListResponse)
 async def get_news(
@@ -20,35 +69,89 @@ async def get_news(
     source: Optional[str] = Query(None, description="Filter by source name"),
     since: Optional[str] = Query(None, description="ISO8601 timestamp (UTC)"),
     limit: int = Query(50, ge=1, le=500),
-    offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    offset: int = Query(0, ge=0, description="Deprecated, use cursor"),
+    include_total: bool = Query(False, description="Include a total estimated from the counts table"),
+    changes_since: Optional[str] = Query(None, description="change_cursor from a previous response"),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get latest news articles."""
-    query = db.query(Article)
+    """Get latest news articles, newest first.
+    
+    Pages are keyed on (published_at_utc, id), so following next_cursor
+    costs the same at any depth and doesn't skip or repeat articles when new
+    ones arrive between polls.
+    
+    With changes_since, only articles inserted after that change cursor are
+    returned (oldest first, up to limit) along with the next change cursor,
+    so pollers don't re-download the page they already have.
+    
+    Rows are read as tuples and encoded with orjson rather than built into
+    ArticleResponse models.
+    """
+    stmt = select(*ARTICLE_COLUMNS)
     
     if topic:
-        query = query.filter(Article.topic == topic)
+        stmt = stmt.where(Article.topic == topic)
     
     if source:
-        query = query.filter(Article.source == source)
+        stmt = stmt.where(Article.source == source)
     
+    since_dt = None
     if since:
         try:
             since_dt = parse_iso8601(since)
-            query = query.filter(Article.published_at_utc >= since_dt)
+            stmt = stmt.where(Article.published_at_utc >= since_dt)
         except Exception:
             pass
     
-    # Get total count
-    total = query.count()
+    if changes_since:
+        try:
+            last_id = decode_change_cursor(changes_since, int)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        result = await db.execute(stmt.where(Article.id > last_id).order_by(Article.id).limit(limit))
+        items = [row._asdict() for row in result]
+        return FastJSONResponse({
+            "items": items,
+            "total": None,
+            "limit": limit,
+            "offset": 0,
+            "next_cursor": None,
+            "change_cursor": encode_change_cursor(items[-1]["id"] if items else last_id),
+        })
     
-    # Get paginated results
-    articles = query.order_by(desc(Article.published_at_utc)).offset(offset).limit(limit).all()
+    # Taken before the page is read so nothing inserted meanwhile is missed
+    head_id = await db.scalar(select(func.max(Article.id))) or 0
     
-    return ArticleListResponse(
-        items=[ArticleResponse.from_orm(a) for a in articles],
-        total=total,
-        limit=limit,
-        offset=offset
-    )
-
+    if cursor:
+        try:
+            published_at, last_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        # The plain range bound keeps the (topic|source, published_at_utc) indexes usable
+        stmt = stmt.where(
+            and_(
+                Article.published_at_utc <= published_at,
+                or_(Article.published_at_utc < published_at, Article.id < last_id)
+            )
+        )
+    
+    stmt = stmt.order_by(desc(Article.published_at_utc), desc(Article.id))
+    if offset and not cursor:
+        stmt = stmt.offset(offset)
+    
+    # Fetch one extra row to know whether there is a next page
+    items = [row._asdict() for row in await db.execute(stmt.limit(limit + 1))]
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1]["published_at_utc"], items[-1]["id"])
+    
+    return FastJSONResponse({
+        "items": items,
+        "total": await _estimate_total(db, topic, source, since_dt) if include_total else None,
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": next_cursor,
+        "change_cursor": encode_change_cursor(head_id),
+    })
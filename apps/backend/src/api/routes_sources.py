@@ -1,9 +1,10 @@
 """Sources API routes."""
 
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..core.db import get_db
+from ..core.db import get_async_db
 from ..core.schemas import SourceResponse, SourceListResponse
 from ..models import Source
 
@@ -12,10 +13,10 @@ router = APIRouter(prefix="/api/sources", tags=["sources"])
 
 @router.get("", response_model=SourceListResponse)
 async def get_sources(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get list of configured sources."""
-    sources = db.query(Source).order_by(Source.name).all()
+    sources = (await db.scalars(select(Source).order_by(Source.name))).all()
     
     return SourceListResponse(
         items=[SourceResponse.from_orm(s) for s in sources]
@@ -1,12 +1,13 @@
 """Core package."""
 
 from .config import get_settings, Settings
-from .db import get_db, init_db, Base, SessionLocal
+from .db import get_db, get_async_db, init_db, Base, SessionLocal
 from .schemas import (
     ArticleResponse,
     ArticleListResponse,
     CountResponse,
     AggregateResponse,
+    AggregateColumnarResponse,
     AnomalyResponse,
     AnomalyListResponse,
     SourceResponse,
@@ -21,6 +22,7 @@ __all__ = [
     "get_settings",
     "Settings",
     "get_db",
+    "get_async_db",
     "init_db",
     "Base",
     "SessionLocal",
@@ -28,6 +30,7 @@ __all__ = [
     "ArticleListResponse",
     "CountResponse",
     "AggregateResponse",
+    "AggregateColumnarResponse",
     "AnomalyResponse",
     "AnomalyListResponse",
     "SourceResponse",
@@ -0,0 +1,194 @@
+"""Generation-invalidated response cache for read endpoints."""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Read endpoints whose data only changes when an ingestion cycle completes
+CACHED_PATHS = ("/api/aggregate", "/api/anomalies", "/api/sources")
+
+CacheKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class CachedResponse:
+    """A cached response body with its strong ETag."""
+    
+    __slots__ = ("generation", "created", "body", "media_type", "etag")
+    
+    def __init__(self, generation: int, body: bytes, media_type: Optional[str]):
+        self.generation = generation
+        self.created = time.monotonic()
+        self.body = body
+        self.media_type = media_type
+        # Strong validator: identical bytes get the same tag across generations
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+class ResponseCache:
+    """LRU cache of response bodies, invalidated by a generation counter.
+    
+    The ingestion pipeline calls bump() once a cycle has written its counts
+    and anomalies; entries from older generations are then recomputed on
+    their next request. Concurrent misses for the same key share a single
+    computation. Entries also expire after `ttl` seconds, since default
+    time windows move even when no cycle runs.
+    """
+    
+    def __init__(self, max_entries: int = 1024, ttl: float = 60.0):
+        """Initialize cache.
+        
+        Args:
+            max_entries: Maximum cached responses
+            ttl: Maximum entry age in seconds
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation = 0
+        self._entries: "OrderedDict[CacheKey, CachedResponse]" = OrderedDict()
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+    
+    def bump(self) -> int:
+        """Invalidate every cached response."""
+        self.generation += 1
+        return self.generation
+    
+    @staticmethod
+    def key(request: Request) -> CacheKey:
+        """Build a cache key from the path and all sorted query parameters.
+        
+        Empty values are kept: /api/anomalies?source= (aggregate series only)
+        is a different query from /api/anomalies.
+        """
+        params = tuple(sorted(request.query_params.multi_items()))
+        return request.url.path, params
+    
+    def get(self, key: CacheKey) -> Optional[CachedResponse]:
+        """Get a current entry."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.generation != self.generation or time.monotonic() - entry.created > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+    
+    def put(self, key: CacheKey, entry: CachedResponse) -> None:
+        """Store an entry, evicting the least recently used ones."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    async def get_or_compute(
+        self,
+        key: CacheKey,
+        compute: Callable[[], Awaitable[Optional[CachedResponse]]]
+    ) -> Optional[CachedResponse]:
+        """Get an entry, computing it once for all concurrent callers on a miss.
+        
+        Args:
+            key: Cache key
+            compute: Coroutine producing the entry, or None if uncacheable
+        
+        Returns:
+            The entry, or None if the computation produced nothing cacheable
+        """
+        entry = self.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.shared += 1
+            return await asyncio.shield(inflight)
+        
+        self.misses += 1
+        generation = self.generation
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            entry = await compute()
+            if entry is not None and generation == self.generation:
+                self.put(key, entry)
+            future.set_result(entry)
+            return entry
+        except BaseException:
+            future.set_result(None)  # Waiters compute for themselves
+            raise
+        finally:
+            del self._inflight[key]
+    
+    def stats(self) -> dict:
+        """Get cache statistics."""
+        return {
+            "generation": self.generation,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared": self.shared,
+        }
+
+
+@lru_cache()
+def get_response_cache() -> ResponseCache:
+    """Get the process-wide response cache."""
+    settings = get_settings()
+    return ResponseCache(
+        max_entries=settings.response_cache_max_entries,
+        ttl=settings.response_cache_ttl_seconds,
+    )
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """Serve GETs on CACHED_PATHS from the response cache, with ETag/304 support."""
+    
+    async def dispatch(self, request: Request, call_next):
+        if request.method != "GET" or request.url.path not in CACHED_PATHS:
+            return await call_next(request)
+        
+        cache = get_response_cache()
+        response: Optional[Response] = None
+        
+        async def compute() -> Optional[CachedResponse]:
+            nonlocal response
+            response = await call_next(request)
+            if response.status_code != 200:
+                return None
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            entry = CachedResponse(cache.generation, body, response.headers.get("content-type"))
+            response = None  # Body iterator consumed; respond from the entry
+            return entry
+        
+        entry = await cache.get_or_compute(cache.key(request), compute)
+        if entry is None:
+            # Uncacheable: pass our own response through, or compute it if we were a waiter
+            return response if response is not None else await call_next(request)
+        
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type=entry.media_type, headers=headers)
@@ -1,11 +1,16 @@
 """Database connection and session management."""
 
+from functools import lru_cache
 from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from .config import get_settings
+from .migrations import upgrade_schema
 
 settings = get_settings()
 
@@ -37,7 +42,56 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def async_database_url(url: str) -> str:
+    """Swap a database URL's driver for its asyncio counterpart (asyncpg, aiosqlite)."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    if parsed.get_backend_name() == "postgresql":
+        return parsed.set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+    return url
+
+
+@lru_cache()
+def get_async_engine() -> AsyncEngine:
+    """Get the asyncio engine used by read routes.
+    
+    It has its own connection pool, sized separately from the sync engine
+    used by ingestion and admin writes.
+    """
+    url = async_database_url(settings.database_url)
+    if url.startswith("sqlite"):
+        return create_async_engine(url)
+    return create_async_engine(
+        url,
+        pool_pre_ping=True,
+        pool_size=settings.async_db_pool_size,
+        max_overflow=settings.async_db_max_overflow,
+        pool_timeout=settings.async_db_pool_timeout_seconds,
+    )
+
+
+@lru_cache()
+def get_async_sessionmaker() -> async_sessionmaker:
+    """Get the AsyncSession factory bound to the asyncio engine."""
+    return async_sessionmaker(get_async_engine(), expire_on_commit=False)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting an asyncio database session."""
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+def dialect_insert(db: Session, table):
+    """Get a dialect-specific INSERT construct supporting ON CONFLICT."""
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(table)
+    return postgresql.insert(table)
+
+
 def init_db() -> None:
-    """Initialize database tables."""
+    """Initialize database tables and upgrade existing ones."""
     Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
 
@@ -0,0 +1,116 @@
+"""Idempotent schema upgrades for databases created by older releases.
+
+`Base.metadata.create_all` creates missing tables but never alters existing
+ones. Each step here inspects the live schema and only applies what is
+missing, so `upgrade_schema` is safe to run on every startup.
+"""
+
+import logging
+from typing import Callable, Dict, List, Set, Tuple
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+
+def _columns(conn: Connection, table: str) -> Set[str]:
+    return {column["name"] for column in inspect(conn).get_columns(table)}
+
+
+def _indexes(conn: Connection, table: str) -> Set[str]:
+    return {index["name"] for index in inspect(conn).get_indexes(table)}
+
+
+def _has_unique(conn: Connection, table: str, columns: List[str]) -> bool:
+    """Check for a unique constraint or unique index over exactly `columns`."""
+    inspector = inspect(conn)
+    candidates = inspector.get_unique_constraints(table) + [
+        index for index in inspector.get_indexes(table) if index["unique"]
+    ]
+    return any(set(candidate["column_names"]) == set(columns) for candidate in candidates)
+
+
+def _add_columns(conn: Connection, table: str, columns: Dict[str, str]) -> bool:
+    """Add columns (name -> DDL type clause) that the table lacks."""
+    existing = _columns(conn, table)
+    missing = {name: ddl for name, ddl in columns.items() if name not in existing}
+    for name, ddl in missing.items():
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+    return bool(missing)
+
+
+def _source_validators(conn: Connection) -> bool:
+    """Add the HTTP cache validator columns to sources."""
+    return _add_columns(conn, "sources", {
+        "etag": "VARCHAR(512)",
+        "last_modified": "VARCHAR(64)",
+        "content_hash": "VARCHAR(64)",
+    })
+
+
+def _anomaly_sources(conn: Connection) -> bool:
+    """Add anomalies.source and the one-anomaly-per-series-and-bucket constraint."""
+    changed = _add_columns(conn, "anomalies", {"source": "VARCHAR(255) NOT NULL DEFAULT ''"})
+    indexes = _indexes(conn, "anomalies")
+    if "ix_anomalies_source" not in indexes:
+        conn.execute(text("CREATE INDEX ix_anomalies_source ON anomalies (source)"))
+        changed = True
+    
+    columns = ["bucket_start_utc", "bucket_size", "topic", "source"]
+    if not _has_unique(conn, "anomalies", columns):
+        # Keep the first row of each duplicate group so the constraint can be built
+        deleted = conn.execute(text(
+            "DELETE FROM anomalies WHERE id NOT IN ("
+            "SELECT MIN(id) FROM anomalies GROUP BY bucket_start_utc, bucket_size, topic, source)"
+        )).rowcount
+        if deleted:
+            logger.warning(f"Removed {deleted} duplicate anomalies before adding uq_anomalies_bucket")
+        conn.execute(text(f"CREATE UNIQUE INDEX uq_anomalies_bucket ON anomalies ({', '.join(columns)})"))
+        changed = True
+    
+    # Superseded by the unique index, which leads with the same columns
+    if "idx_anomalies_bucket" in indexes:
+        conn.execute(text("DROP INDEX idx_anomalies_bucket"))
+        changed = True
+    return changed
+
+
+def _count_change_times(conn: Connection) -> bool:
+    """Add counts.updated_at_utc and its index for aggregate change cursors."""
+    from ..models import Count
+    
+    # Rows written before the upgrade keep NULL and never appear as changes
+    timestamp = Count.__table__.c.updated_at_utc.type.compile(dialect=conn.dialect)
+    changed = _add_columns(conn, "counts", {"updated_at_utc": timestamp})
+    if "idx_counts_size_updated" not in _indexes(conn, "counts"):
+        conn.execute(text("CREATE INDEX idx_counts_size_updated ON counts (bucket_size, updated_at_utc)"))
+        changed = True
+    return changed
+
+
+# Applied in order; each step returns whether it changed anything
+MIGRATIONS: List[Tuple[str, Callable[[Connection], bool]]] = [
+    ("source_validators", _source_validators),
+    ("anomaly_sources", _anomaly_sources),
+    ("count_change_times", _count_change_times),
+]
+
+
+def upgrade_schema(engine: Engine) -> List[str]:
+    """Bring existing tables up to date with the models.
+    
+    Run after `create_all`; tables it has just created already match.
+    
+    Args:
+        engine: Engine for the database to upgrade
+    
+    Returns:
+        Names of the steps that changed the schema
+    """
+    applied = []
+    with engine.begin() as conn:
+        for name, step in MIGRATIONS:
+            if step(conn):
+                applied.append(name)
+                logger.info(f"Applied schema migration {name}")
+    return applied
@@ -0,0 +1,28 @@
+"""Fast JSON encoding for large read responses."""
+
+from typing import Any
+
+import orjson
+from starlette.responses import Response
+
+# Naive datetimes (as read back from SQLite) are UTC; emit "Z" like Pydantic does
+JSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(content: Any) -> bytes:
+    """Encode plain dicts, lists, datetimes and numbers as JSON bytes."""
+    return orjson.dumps(content, option=JSON_OPTIONS)
+
+
+class FastJSONResponse(Response):
+    """JSON response encoded with orjson, skipping response-model validation.
+    
+    Routes that build plain dicts from row tuples return this directly, so
+    FastAPI neither hydrates a Pydantic model per row nor re-validates the
+    payload against the route's response_model (which still documents it).
+    """
+    
+    media_type = "application/json"
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,7 +1,7 @@
 """Pydantic schemas for API requests/responses."""
 
 from datetime import datetime
-from typing import Optional, List, Literal
+from typing import Dict, Optional, List, Literal
 from pydantic import BaseModel, HttpUrl, Field
 
 
@@ -35,9 +35,11 @@ class ArticleResponse(BaseModel):
 class ArticleListResponse(BaseModel):
     """Paginated article list response."""
     items: List[ArticleResponse]
-    total: int
+    total: Optional[int] = None  # Estimated, only with include_total
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
+    change_cursor: Optional[str] = None  # Pass as changes_since to get only newer rows
 
 
 class CountResponse(BaseModel):
@@ -55,6 +57,22 @@ class AggregateResponse(BaseModel):
     bucket_size: str
     topic: Optional[str] = None
     source: Optional[str] = None
+    change_cursor: Optional[str] = None  # Pass as changes_since to get only changed buckets
+
+
+class SeriesColumns(BaseModel):
+    """One topic's buckets as parallel arrays."""
+    t: List[int]  # Bucket start, epoch seconds (UTC)
+    count: List[int]
+
+
+class AggregateColumnarResponse(BaseModel):
+    """Aggregate time-series response in columnar form (format=columnar)."""
+    series: Dict[str, SeriesColumns]  # Keyed by topic
+    bucket_size: str
+    topic: Optional[str] = None
+    source: Optional[str] = None
+    change_cursor: Optional[str] = None
 
 
 class AnomalyResponse(BaseModel):
@@ -63,6 +81,7 @@ class AnomalyResponse(BaseModel):
     bucket_start_utc: datetime
     bucket_size: str
     topic: str
+    source: str = ""
     observed: int
     expected: float
     deviation: float
@@ -77,6 +96,7 @@ class AnomalyListResponse(BaseModel):
     """Anomaly list response."""
     items: List[AnomalyResponse]
     total: int
+    change_cursor: Optional[str] = None  # Pass as changes_since to get only newer anomalies
 
 
 class SourceResponse(BaseModel):
@@ -1,7 +1,7 @@
 """Ingestion package."""
 
-from .pipeline import IngestionPipeline
+from .pipeline import IngestionPipeline, get_pipeline
 from .classify import TopicClassifier
 
-__all__ = ["IngestionPipeline", "TopicClassifier"]
+__all__ = ["IngestionPipeline", "get_pipeline", "TopicClassifier"]
 
@@ -3,14 +3,28 @@
 import json
 import os
 from pathlib import Path
-from typing import Optional, Literal
+from typing import Dict, List, Optional, Literal, Sequence, Tuple
 import re
 
 Topic = Literal["environment", "politics", "humanity"]
 
+TOPICS: Tuple[str, ...] = ("environment", "politics", "humanity")
+
+# Word tokens; keywords and text are matched token by token
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
 
 class TopicClassifier:
-    """Classify articles into topics using keyword matching."""
+    """Classify articles into topics using keyword matching.
+    
+    All topics are scored in a single pass over the text's tokens. Keywords
+    and phrases are indexed by their first token, so each text token costs one
+    dict lookup, and matches respect word boundaries ("act" does not match
+    inside "impact"). At each position only the longest matching phrase
+    counts, and its tokens are consumed ("climate change" scores once, not
+    also as "climate" and "change"). A trailing plural "s"/"es" on a text token is ignored
+    when the singular is a keyword token ("protests" matches "protest").
+    """
     
     def __init__(self, rules_path: Optional[str] = None):
         """Initialize classifier with rules."""
@@ -21,16 +35,61 @@ class TopicClassifier:
         with open(rules_path, "r") as f:
             self.rules = json.load(f)
         
-        # Precompile regex patterns for performance
-        self.patterns = {}
-        for topic, config in self.rules.items():
-            keywords = config.get("keywords", [])
-            phrases = config.get("phrases", [])
-            
-            # Create case-insensitive patterns
-            all_patterns = keywords + phrases
-            pattern_str = "|".join([re.escape(p) for p in all_patterns])
-            self.patterns[topic] = re.compile(pattern_str, re.IGNORECASE)
+        # Map each keyword/phrase token sequence to the topics that list it
+        phrase_topics: Dict[Tuple[str, ...], set] = {}
+        for topic_index, topic in enumerate(TOPICS):
+            config = self.rules.get(topic, {})
+            for pattern in config.get("keywords", []) + config.get("phrases", []):
+                tokens = tuple(TOKEN_RE.findall(pattern.lower()))
+                if tokens:
+                    phrase_topics.setdefault(tokens, set()).add(topic_index)
+        
+        # Index by first token, longest phrases first
+        self._index: Dict[str, List[Tuple[Tuple[str, ...], Tuple[int, ...]]]] = {}
+        for tokens, topic_indexes in phrase_topics.items():
+            self._index.setdefault(tokens[0], []).append((tokens, tuple(sorted(topic_indexes))))
+        for candidates in self._index.values():
+            candidates.sort(key=lambda c: len(c[0]), reverse=True)
+        
+        self._vocab = {token for tokens in phrase_topics for token in tokens}
+    
+    def _canonical(self, token: str) -> str:
+        """Strip a plural suffix when the singular is a keyword token."""
+        if token in self._vocab or not token.endswith("s"):
+            return token
+        if token[:-1] in self._vocab:
+            return token[:-1]
+        if token.endswith("es") and token[:-2] in self._vocab:
+            return token[:-2]
+        return token
+    
+    def score(self, text: str) -> List[int]:
+        """Count keyword/phrase matches per topic in one pass.
+        
+        Matching is leftmost-longest: the longest phrase starting at a token
+        wins and scanning resumes after it.
+        
+        Returns:
+            Match counts in TOPICS order
+        """
+        tokens = [self._canonical(t) for t in TOKEN_RE.findall(text.lower())]
+        scores = [0] * len(TOPICS)
+        index = self._index
+        
+        i = 0
+        while i < len(tokens):
+            step = 1
+            # Candidates are sorted longest first
+            for phrase, topic_indexes in index.get(tokens[i], ()):
+                n = len(phrase)
+                if n == 1 or tuple(tokens[i:i + n]) == phrase:
+                    for topic_index in topic_indexes:
+                        scores[topic_index] += 1
+                    step = n
+                    break
+            i += step
+        
+        return scores
     
     def classify(
         self,
@@ -44,31 +103,47 @@ class TopicClassifier:
             title: Article title
             summary: Optional article summary
             source_topic: Optional topic hint from source configuration
-            
+        
         Returns:
             Topic or None if no match
         """
         # If source has a topic hint, use it
-        if source_topic and source_topic in ["environment", "politics", "humanity"]:
-            return source_topic
+        if source_topic and source_topic in TOPICS:
+            return source_topic  # type: ignore
         
         # Combine title and summary for matching
         text = title
         if summary:
             text += " " + summary
         
-        text = text.lower()
+        scores = self.score(text)
+        best = max(scores)
+        if best == 0:
+            return None
         
-        # Score each topic
-        scores = {}
-        for topic in ["environment", "politics", "humanity"]:
-            matches = len(self.patterns[topic].findall(text))
-            if matches > 0:
-                scores[topic] = matches
+        # Highest score wins; ties go to the earlier topic
+        return TOPICS[scores.index(best)]  # type: ignore
+    
+    def classify_many(
+        self,
+        titles: Sequence[str],
+        summaries: Optional[Sequence[Optional[str]]] = None,
+        source_topics: Optional[Sequence[Optional[str]]] = None
+    ) -> List[Optional[Topic]]:
+        """Classify a batch of articles.
         
-        if not scores:
-            return None
+        Args:
+            titles: Article titles
+            summaries: Optional summaries, parallel to titles
+            source_topics: Optional source topic hints, parallel to titles
         
-        # Return topic with highest score
-        return max(scores.items(), key=lambda x: x[1])[0]  # type: ignore
-
+        Returns:
+            Topic or None per article
+        """
+        n = len(titles)
+        summaries = summaries if summaries is not None else [None] * n
+        source_topics = source_topics if source_topics is not None else [None] * n
+        return [
+            self.classify(title, summary, source_topic)
+            for title, summary, source_topic in zip(titles, summaries, source_topics)
+        ]
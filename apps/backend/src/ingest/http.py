@@ -0,0 +1,81 @@
+"""Long-lived HTTP client shared across ingestion cycles."""
+
+import asyncio
+import logging
+from typing import Optional
+import aiohttp
+
+from ..core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPClient:
+    """Pooled aiohttp session with global/per-host limits and reuse stats.
+    
+    Keeping one session alive across cycles preserves keep-alive
+    connections, the DNS cache and TLS sessions between polls.
+    """
+    
+    def __init__(self):
+        """Initialize client (session is created lazily on the running loop)."""
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+    
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Get the shared session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            settings = get_settings()
+            connector = aiohttp.TCPConnector(
+                limit=settings.http_max_connections,
+                limit_per_host=settings.http_max_connections_per_host,
+                ttl_dns_cache=settings.http_dns_cache_ttl_seconds,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=30, connect=10),
+                trace_configs=[self._trace_config()],
+            )
+            self._semaphore = asyncio.Semaphore(settings.http_fetch_concurrency)
+        return self._session
+    
+    @property
+    def semaphore(self) -> Optional[asyncio.Semaphore]:
+        """Semaphore bounding in-flight fetches."""
+        return self._semaphore
+    
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        """Trace hooks counting requests and connection reuse."""
+        async def on_request_start(session, ctx, params):
+            self.requests += 1
+        
+        async def on_connection_create_end(session, ctx, params):
+            self.connections_created += 1
+        
+        async def on_connection_reuseconn(session, ctx, params):
+            self.connections_reused += 1
+        
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+    
+    def stats(self) -> dict:
+        """Get connection reuse statistics."""
+        acquired = self.connections_created + self.connections_reused
+        return {
+            "requests": self.requests,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": self.connections_reused / acquired if acquired else 0.0,
+        }
+    
+    async def close(self) -> None:
+        """Close the session and its connection pool."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
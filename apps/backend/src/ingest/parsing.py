@@ -0,0 +1,110 @@
+"""Feed parsing off the event loop."""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional
+import feedparser
+
+from ..core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def entry_to_dict(entry: feedparser.FeedParserDict) -> dict:
+    """Reduce a feedparser entry to the plain fields used for ingestion."""
+    summary = None
+    if "summary" in entry:
+        summary = entry.get("summary", "")
+    elif "description" in entry:
+        summary = entry.get("description", "")
+    
+    # Published date as epoch seconds (feedparser gives struct_time)
+    published = None
+    for key in ("published_parsed", "updated_parsed"):
+        if entry.get(key):
+            try:
+                published = time.mktime(entry[key])
+            except Exception:
+                pass
+            break
+    
+    author = None
+    if "author" in entry:
+        author = entry.author
+    elif "author_detail" in entry:
+        author = entry.author_detail.get("name")
+    
+    return {
+        "title": entry.get("title", ""),
+        "link": entry.get("link", ""),
+        "summary": summary,
+        "published": published,
+        "author": author,
+        "tags": [tag.get("term") for tag in entry.get("tags", [])],
+    }
+
+
+def parse_feed_content(content: bytes) -> dict:
+    """Parse raw feed bytes into plain, picklable entry dicts.
+    
+    Runs inside the worker pool, so it must stay a module-level function.
+    
+    Returns:
+        Dict with entries list and bozo error message (or None)
+    """
+    feed = feedparser.parse(content)
+    bozo_error = str(feed.get("bozo_exception")) if feed.bozo else None
+    return {
+        "entries": [entry_to_dict(entry) for entry in feed.entries],
+        "bozo_error": bozo_error,
+    }
+
+
+@lru_cache()
+def get_parse_executor() -> Optional[Executor]:
+    """Get the shared feed-parsing pool (None when parsing inline)."""
+    settings = get_settings()
+    if settings.feed_parse_workers <= 0:
+        return None
+    
+    if settings.feed_parse_executor == "thread":
+        executor = ThreadPoolExecutor(
+            max_workers=settings.feed_parse_workers,
+            thread_name_prefix="feed-parse",
+        )
+    else:
+        # Forking a process that already runs threads (event loop, thread
+        # pools, DB connections) can copy held locks into the workers
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        executor = ProcessPoolExecutor(
+            max_workers=settings.feed_parse_workers,
+            mp_context=multiprocessing.get_context(method),
+        )
+    logger.info(
+        f"Started {settings.feed_parse_executor} pool with "
+        f"{settings.feed_parse_workers} feed parse workers"
+    )
+    return executor
+
+
+async def parse_feed(content: bytes) -> dict:
+    """Parse feed content in the worker pool without blocking the event loop."""
+    executor = get_parse_executor()
+    if executor is None:
+        return parse_feed_content(content)
+    
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, parse_feed_content, content)
+
+
+def shutdown_parse_executor() -> None:
+    """Shut down the feed-parsing pool (if one was started)."""
+    if get_parse_executor.cache_info().currsize:
+        executor = get_parse_executor()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        get_parse_executor.cache_clear()
@@ -3,39 +3,135 @@
 import logging
 import asyncio
 from datetime import datetime
-from typing import List, Optional
+from collections import Counter
+from functools import lru_cache
+from typing import Awaitable, Callable, List, Optional, Set
 from sqlalchemy.orm import Session
 
-from ..models import Source
+from ..models import Article, Source
 from ..core.db import SessionLocal
-from ..analytics.bucket import aggregate_counts
+from ..core.config import get_settings
+from ..core.cache import get_response_cache
+from ..analytics.bucket import aggregate_counts, aggregate_counts_sql
+from ..analytics.rollup import update_rollups
+from ..analytics.store import get_timeseries_store
 from ..analytics.anomaly import detect_anomalies
-from .rss import RSSIngester
-from .reddit import RedditIngester
+from ..analytics.detectors import validate_detector_settings
+from ..analytics.online import OnlineBaseline, detect_anomalies_online, load_snapshot, save_snapshot
+from ..analytics.seasonal import SeasonalProfiles
+from .rss import RSSIngester, NOT_MODIFIED
+from .reddit import RedditIngester, SUBREDDIT_LIMIT, USER_LIMIT
 from .classify import TopicClassifier
+from .writer import ArticleWriter
+from .seen import get_seen_index
+from .http import HTTPClient
+from .schedule import AdaptivePollScheduler
+from .stages import Stage
+from ..utils.time import bucket_start, now_utc
 
 logger = logging.getLogger(__name__)
 
+# Max article SSE events published per cycle
+ARTICLE_EVENTS_PER_CYCLE = 10
+
 
 class IngestionPipeline:
     """Main ingestion pipeline."""
     
     def __init__(self):
         """Initialize pipeline."""
+        settings = get_settings()
+        # Fail at startup rather than on every detection cycle
+        validate_detector_settings(settings.anomaly_detector, settings.anomaly_topic_detectors_map)
         self.classifier = TopicClassifier()
+        self.seen_index = get_seen_index()
+        self.timeseries_store = get_timeseries_store()
+        # Latest (bucket, count) per series when last scored, to skip unchanged series
+        self.last_scored: dict = {}
+        # Sliding-window state when ANOMALY_ENGINE=online (see load_online_baseline)
+        self.online_baseline: Optional[OnlineBaseline] = None
+        self.last_snapshot_utc: Optional[datetime] = None
+        # Hour-of-week baselines when SEASONAL_PROFILES is enabled
+        self.seasonal_profiles: Optional[SeasonalProfiles] = (
+            SeasonalProfiles(weeks=settings.seasonal_weeks) if settings.seasonal_profiles else None
+        )
+        self.http = HTTPClient()
+        self.reddit_ingester = RedditIngester(self.classifier, self.seen_index)
+        self.poll_scheduler: Optional[AdaptivePollScheduler] = None
+        if settings.ingest_adaptive_polling:
+            self.poll_scheduler = AdaptivePollScheduler(
+                min_interval=settings.ingest_min_interval_seconds,
+                max_interval=settings.ingest_max_interval_seconds,
+            )
+        self.stages: List[Stage] = []
         self.last_ingest_utc: Optional[datetime] = None
     
-    async def run_cycle(self) -> dict:
-        """Run one ingestion cycle.
+    async def close(self) -> None:
+        """Release long-lived resources."""
+        await self.http.close()
+        self.reddit_ingester.close()
+        if self.online_baseline is not None:
+            db = SessionLocal()
+            try:
+                save_snapshot(db, self.online_baseline)
+            except Exception as e:
+                logger.error(f"Error saving baseline snapshot: {e}", exc_info=True)
+            finally:
+                db.close()
+    
+    def load_seasonal_profiles(self, db: Session) -> int:
+        """Load persisted seasonal profiles (refreshed on the next cycle)."""
+        if self.seasonal_profiles is None:
+            return 0
+        loaded = self.seasonal_profiles.load(db)
+        logger.info(f"Loaded {loaded} seasonal profiles")
+        return loaded
+    
+    def load_online_baseline(self, db: Session) -> OnlineBaseline:
+        """Restore online baselines from the last snapshot, or seed them from the store."""
+        baseline = load_snapshot(db)
+        if baseline is None:
+            baseline = OnlineBaseline()
+            baseline.warm(self.timeseries_store, bucket_size="1m")
+        self.online_baseline = baseline
+        logger.info(f"Online baselines ready for {len(baseline)} series")
+        settings = get_settings()
+        if settings.anomaly_detector != "mad" or settings.anomaly_topic_detectors_map:
+            logger.warning("ANOMALY_DETECTOR/ANOMALY_TOPIC_DETECTORS apply to the batch engine only; online uses MAD")
+        return baseline
+    
+    def _record_poll(self, source_id: int, result) -> None:
+        """Feed a poll result to the adaptive scheduler (errors count as empty)."""
+        if self.poll_scheduler is not None:
+            self.poll_scheduler.record(source_id, 0 if isinstance(result, Exception) else result)
+    
+    async def run_cycle(self, force: bool = False) -> dict:
+        """Run one ingestion cycle as connected streaming stages.
+        
+        fetch -> parse -> classify -> write -> aggregate, linked by bounded
+        queues. Each source's articles reach the writer, SSE publishing and
+        aggregation as soon as that source returns, so one slow feed no longer
+        holds up the rest. Reddit sources feed the write stage directly.
+        Anomaly detection runs once the stream has drained.
+        
+        With adaptive polling enabled only sources that are due are polled.
+        
+        Args:
+            force: Poll every enabled source regardless of schedule
         
         Returns:
             Dict with stats about the cycle
         """
-        db = next(SessionLocal())
+        settings = get_settings()
+        # Sources are read across stages after commits; don't reload them each time
+        db = SessionLocal(expire_on_commit=False)
         stats = {
             "rss_count": 0,
             "reddit_count": 0,
             "total_new": 0,
+            "not_modified": 0,
+            "not_modified_sources": [],
+            "polled": 0,
             "errors": []
         }
         
@@ -45,54 +141,203 @@ class IngestionPipeline:
             
             if not sources:
                 logger.warning("No enabled sources found")
+                self.timeseries_store.mark_synced()
                 return stats
             
+            # Only poll sources whose adaptive interval has elapsed
+            if self.poll_scheduler is not None and not force:
+                sources = self.poll_scheduler.due(sources)
+                if not sources:
+                    # Nothing was written, so the store and cached responses are still current
+                    self.timeseries_store.mark_synced()
+                    return stats
+            stats["polled"] = len(sources)
+            
             # Separate RSS and Reddit sources
             rss_sources = [s for s in sources if s.type == "rss"]
             reddit_sources = [s for s in sources if s.type in ["reddit_sub", "reddit_user"]]
             
-            # Ingest RSS feeds (parallel)
-            async with RSSIngester(self.classifier) as rss_ingester:
-                rss_tasks = [
-                    rss_ingester.ingest_source(db, source)
-                    for source in rss_sources
-                ]
-                rss_results = await asyncio.gather(*rss_tasks, return_exceptions=True)
-                
-                for result in rss_results:
-                    if isinstance(result, Exception):
-                        logger.error(f"RSS ingestion error: {result}", exc_info=result)
-                        stats["errors"].append(str(result))
-                    else:
-                        stats["rss_count"] += result
-                        stats["total_new"] += result
-            
-            # Ingest Reddit (sequential to avoid rate limits)
-            reddit_ingester = RedditIngester(self.classifier)
-            for source in reddit_sources:
+            # Shared writer records exactly which rows are new this cycle
+            # In incremental mode count deltas commit in the same transaction as the articles
+            writer = ArticleWriter(
+                db,
+                seen_index=self.seen_index,
+                count_bucket_size="1m" if settings.aggregation_mode == "incremental" else None,
+            )
+            session = await self.http.get_session()
+            rss_ingester = RSSIngester(
+                self.classifier,
+                self.seen_index,
+                session=session,
+                semaphore=self.http.semaphore
+            )
+            published = 0
+            
+            async def fetch(items) -> None:
+                for source in items:
+                    fetched_at = now_utc()
+                    content = await rss_ingester.fetch_raw(source)
+                    if content is None:
+                        self._record_poll(source.id, 0)
+                        stats["errors"].append(f"{source.name}: fetch failed")
+                        continue
+                    if content is NOT_MODIFIED:
+                        # Feed unchanged since last fetch (304 or same content hash)
+                        if rss_ingester.apply_validators(source):
+                            db.commit()
+                        self._record_poll(source.id, None)
+                        stats["not_modified"] += 1
+                        stats["not_modified_sources"].append(source.name)
+                        continue
+                    await parse_stage.put((source, content, fetched_at))
+            
+            async def parse(items) -> None:
+                for source, content, fetched_at in items:
+                    feed = await rss_ingester.parse_content(source, content)
+                    if not feed:
+                        # Validators stay unapplied so the next poll refetches the feed
+                        self._record_poll(source.id, 0)
+                        continue
+                    await classify_stage.put((source, feed["entries"], fetched_at))
+            
+            async def classify(items) -> None:
+                for source, entries, fetched_at in items:
+                    articles = rss_ingester.build_articles(source, entries, fetched_at)
+                    await write_stage.put((source, articles, None))
+            
+            async def write(items) -> None:
+                nonlocal published
                 try:
-                    if source.type == "reddit_sub":
-                        count = reddit_ingester.ingest_subreddit(db, source)
-                    else:  # reddit_user
-                        count = reddit_ingester.ingest_user(db, source)
+                    for _, articles, _ in items:
+                        for article in articles:
+                            writer.add(article)
+                    before = len(writer.inserted_rows)
+                    counts_before = len(writer.updated_counts)
+                    writer.flush()
+                    rows = writer.inserted_rows[before:]
+                    counts = writer.updated_counts[counts_before:]
                     
-                    stats["reddit_count"] += count
-                    stats["total_new"] += count
+                    # Persist feed validators only now that their articles are stored
+                    if any([rss_ingester.apply_validators(source) for source, _, _ in items]):
+                        db.commit()
                 except Exception as e:
-                    logger.error(f"Reddit ingestion error for {source.name}: {e}", exc_info=True)
-                    stats["errors"].append(f"{source.name}: {str(e)}")
+                    for _, _, done in items:
+                        if done is not None and not done.done():
+                            done.set_exception(e)
+                    raise
+                
+                new_by_source = Counter(row["source"] for row in rows)
+                for source, _, done in items:
+                    new_count = new_by_source.get(source.name, 0)
+                    if done is not None:
+                        done.set_result(new_count)
+                    self._record_poll(source.id, new_count)
+                    key = "rss_count" if source.type == "rss" else "reddit_count"
+                    stats[key] += new_count
+                    stats["total_new"] += new_count
+                
+                if rows:
+                    published += self._publish_articles(rows, ARTICLE_EVENTS_PER_CYCLE - published)
+                    await aggregate_stage.put((rows, counts))
+            
+            async def aggregate(items) -> None:
+                # Coalesce everything queued into one aggregation pass
+                new_rows = [row for rows, _ in items for row in rows]
+                touched_buckets.update(bucket_start(row["published_at_utc"], 1) for row in new_rows)
+                if settings.aggregation_mode == "incremental":
+                    # Deltas were applied by the writer; pass on the rows it wrote
+                    updated = [count for _, counts in items for count in counts]
+                    self.timeseries_store.update(updated)
+                    updated_counts.extend(updated)
+                elif settings.aggregation_mode == "sql":
+                    # Recompute from the oldest new article so late arrivals are covered
+                    since = min(row["published_at_utc"] for row in new_rows)
+                    updated = aggregate_counts_sql(db, bucket_size="1m", since=since)
+                    self.timeseries_store.update(updated)
+                    updated_counts.extend(updated)
+                else:
+                    aggregate_counts(db, bucket_size="1m")
+                    self.timeseries_store.warm(db, bucket_sizes=("1m",))
+            
+            touched_buckets: Set[datetime] = set()
+            updated_counts: List[dict] = []
+            
+            async def sink(source: Source, articles: List[Article]) -> int:
+                # Resolved by the write stage with the rows actually inserted
+                done = asyncio.get_running_loop().create_future()
+                await write_stage.put((source, articles, done))
+                return await done
+            
+            queue_size = settings.pipeline_queue_size
+            fetch_stage = Stage("fetch", fetch, workers=settings.http_fetch_concurrency, maxsize=queue_size)
+            parse_stage = Stage("parse", parse, workers=max(1, settings.feed_parse_workers), maxsize=queue_size)
+            classify_stage = Stage("classify", classify, maxsize=queue_size)
+            write_stage = Stage("write", write, maxsize=queue_size, max_batch=queue_size)
+            aggregate_stage = Stage("aggregate", aggregate, maxsize=queue_size, max_batch=queue_size)
+            self.stages = [fetch_stage, parse_stage, classify_stage, write_stage, aggregate_stage]
+            for stage in self.stages:
+                stage.start()
+            
+            async def produce_rss() -> None:
+                for source in rss_sources:
+                    await fetch_stage.put(source)
+                # Close upstream first so each stage drains before the next stops
+                await fetch_stage.close()
+                await parse_stage.close()
+                await classify_stage.close()
             
-            # Aggregate counts
+            # Both producers run concurrently and feed the shared write stage
+            await asyncio.gather(
+                produce_rss(),
+                self._produce_reddit(db, reddit_sources, sink, stats),
+            )
+            await write_stage.close()
+            await aggregate_stage.close()
+            
+            for stage in self.stages:
+                stats["errors"].extend(stage.errors)
+            stats["stages"] = self.stage_stats()
+            
+            # Derive 5m/60m buckets from closed 1m buckets, patching late data
             try:
-                aggregate_counts(db, bucket_size="1m")
-                logger.info("Aggregated counts for 1m buckets")
+                stats["rollups"] = update_rollups(db, touched_buckets, store=self.timeseries_store)
+                if not aggregate_stage.errors:
+                    self.timeseries_store.mark_synced()
             except Exception as e:
-                logger.error(f"Error aggregating counts: {e}", exc_info=True)
-                stats["errors"].append(f"aggregation: {str(e)}")
+                stats["errors"].append(f"rollups: {str(e)}")
+            
+            # Fold newly closed hours into the seasonal profiles
+            if self.seasonal_profiles is not None:
+                try:
+                    if self.seasonal_profiles.refresh(db, "1m", scopes=settings.anomaly_scopes_list):
+                        self.seasonal_profiles.save(db, "1m")
+                except Exception as e:
+                    stats["errors"].append(f"seasonal_profiles: {str(e)}")
             
             # Detect anomalies
             try:
-                anomaly_count = detect_anomalies(db, bucket_size="1m")
+                if self.online_baseline is not None and settings.aggregation_mode != "rescan":
+                    anomaly_count = detect_anomalies_online(
+                        db,
+                        self.online_baseline,
+                        updated_counts,
+                        store=self.timeseries_store,
+                        bucket_size="1m",
+                        scopes=settings.anomaly_scopes_list,
+                        profiles=self.seasonal_profiles,
+                    )
+                    self._maybe_save_snapshot(db)
+                else:
+                    anomaly_count = detect_anomalies(
+                        db,
+                        bucket_size="1m",
+                        store=self.timeseries_store,
+                        scopes=settings.anomaly_scopes_list,
+                        last_scored=self.last_scored,
+                        profiles=self.seasonal_profiles,
+                        detector=settings.anomaly_detector,
+                        topic_detectors=settings.anomaly_topic_detectors_map,
+                    )
                 logger.info(f"Detected {anomaly_count} new anomalies")
                 stats["anomalies_detected"] = anomaly_count
                 
@@ -108,6 +353,7 @@ class IngestionPipeline:
                             publish_event("anomaly", {
                                 "id": anomaly.id,
                                 "topic": anomaly.topic,
+                                "source": anomaly.source,
                                 "bucket_start_utc": anomaly.bucket_start_utc.isoformat(),
                                 "observed": anomaly.observed,
                                 "expected": anomaly.expected,
@@ -119,29 +365,15 @@ class IngestionPipeline:
                 logger.error(f"Error detecting anomalies: {e}", exc_info=True)
                 stats["errors"].append(f"anomaly_detection: {str(e)}")
             
-            # Publish article events for new articles (avoid circular import)
-            if stats["total_new"] > 0:
-                try:
-                    from ..api.routes_stream import publish_event
-                    from ..models import Article
-                    recent_articles = db.query(Article).order_by(
-                        Article.fetched_at_utc.desc()
-                    ).limit(min(10, stats["total_new"])).all()
-                    for article in recent_articles:
-                        publish_event("article", {
-                            "id": article.id,
-                            "title": article.title,
-                            "source": article.source,
-                            "topic": article.topic,
-                            "url": article.url,
-                            "published_at_utc": article.published_at_utc.isoformat(),
-                        })
-                except ImportError:
-                    pass  # Skip if circular import
+            # Counts and anomalies are final for this cycle: drop cached API responses
+            get_response_cache().bump()
             
+            stats["seen_index"] = self.seen_index.stats()
+            stats["timeseries_store"] = self.timeseries_store.stats()
+            stats["http"] = self.http.stats()
             self.last_ingest_utc = datetime.utcnow()
             logger.info(f"Ingestion cycle complete: {stats}")
-            
+        
         except Exception as e:
             logger.error(f"Pipeline error: {e}", exc_info=True)
             stats["errors"].append(f"pipeline: {str(e)}")
@@ -149,4 +381,89 @@ class IngestionPipeline:
             db.close()
         
         return stats
+    
+    def _maybe_save_snapshot(self, db: Session) -> None:
+        """Persist online baselines at most once per snapshot interval."""
+        now = now_utc()
+        interval = get_settings().anomaly_snapshot_interval_seconds
+        if self.last_snapshot_utc and (now - self.last_snapshot_utc).total_seconds() < interval:
+            return
+        save_snapshot(db, self.online_baseline)
+        self.last_snapshot_utc = now
+    
+    async def _produce_reddit(
+        self,
+        db: Session,
+        reddit_sources: List[Source],
+        sink: Callable[[Source, List[Article]], Awaitable[int]],
+        stats: dict
+    ) -> None:
+        """Feed parsed Reddit articles to the write stage."""
+        reddit_ingester = self.reddit_ingester
+        if not reddit_ingester.reddit:
+            # No credentials: record empty polls so these sources back off
+            # instead of staying due every tick
+            for source in reddit_sources:
+                self._record_poll(source.id, 0)
+            return
+        
+        if get_settings().reddit_async:
+            # Concurrent, rate-limited fetches off the event loop
+            results = await reddit_ingester.ingest_sources_async(db, reddit_sources, sink=sink)
+            for source, result in zip(reddit_sources, results):
+                if isinstance(result, Exception):
+                    self._record_poll(source.id, result)
+                    logger.error(f"Reddit ingestion error for {source.name}: {result}", exc_info=result)
+                    stats["errors"].append(f"{source.name}: {str(result)}")
+            return
+        
+        # Sequential PRAW calls, one at a time off the event loop on the shared client
+        for source in reddit_sources:
+            try:
+                limit = SUBREDDIT_LIMIT if source.type == "reddit_sub" else USER_LIMIT
+                fetched_at = now_utc()
+                submissions = await asyncio.to_thread(
+                    reddit_ingester.fetch_submissions,
+                    source.type, source.url_or_id, limit, reddit_ingester.reddit
+                )
+                await sink(source, reddit_ingester.build_articles(source, submissions, fetched_at))
+            except Exception as e:
+                self._record_poll(source.id, e)
+                logger.error(f"Reddit ingestion error for {source.name}: {e}", exc_info=True)
+                stats["errors"].append(f"{source.name}: {str(e)}")
+    
+    def _publish_articles(self, rows: List[dict], limit: int) -> int:
+        """Publish SSE events for newly inserted articles (newest first).
+        
+        Returns:
+            Number of events published
+        """
+        if limit <= 0:
+            return 0
+        
+        try:
+            from ..api.routes_stream import publish_event  # Avoid circular import
+        except ImportError:
+            return 0
+        
+        recent_articles = sorted(rows, key=lambda row: row["published_at_utc"], reverse=True)[:limit]
+        for article in recent_articles:
+            publish_event("article", {
+                "id": article["id"],
+                "title": article["title"],
+                "source": article["source"],
+                "topic": article["topic"],
+                "url": article["url"],
+                "published_at_utc": article["published_at_utc"].isoformat(),
+            })
+        return len(recent_articles)
+    
+    def stage_stats(self) -> dict:
+        """Get per-stage queue depth and throughput for the latest cycle."""
+        return {stage.name: stage.stats() for stage in self.stages}
+
 
+@lru_cache()
+def get_pipeline() -> IngestionPipeline:
+    """Get the process-wide pipeline (shared by scheduler and admin routes)."""
+    return IngestionPipeline()
@@ -1,8 +1,12 @@
 """Reddit ingestion."""
 
+import asyncio
 import logging
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
 import praw
 from sqlalchemy.orm import Session
 
@@ -10,28 +14,74 @@ from ..models import Article, Source
 from ..core.config import get_settings
 from ..utils.time import now_utc, UTC
 from ..utils.dedupe import normalize_url
+from ..utils.ratelimit import AsyncTokenBucket
 from .classify import TopicClassifier
+from .writer import ArticleWriter
+from .seen import SeenURLIndex, get_seen_index
 
 logger = logging.getLogger(__name__)
 
+# Items fetched per source and per listing page
+SUBREDDIT_LIMIT = 25
+USER_LIMIT = 10
+LISTING_PAGE_SIZE = 100
+
 
 class RedditIngester:
     """Reddit ingester using PRAW."""
     
-    def __init__(self, classifier: TopicClassifier):
+    def __init__(
+        self,
+        classifier: TopicClassifier,
+        seen_index: Optional[SeenURLIndex] = None
+    ):
         """Initialize Reddit ingester."""
         self.classifier = classifier
+        self.seen_index = seen_index or get_seen_index()
         settings = get_settings()
         
+        # Async mode: blocking PRAW calls run in a small thread pool under a
+        # shared request budget (Reddit allows ~100 requests/minute per client)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._local = threading.local()
+        # Newest created_utc seen per subreddit (lowercased), to spot gaps in combined listings
+        self._subreddit_cursors: Dict[str, float] = {}
+        self.rate_limiter = AsyncTokenBucket(
+            rate=settings.reddit_requests_per_minute / 60.0,
+            capacity=settings.reddit_concurrency,
+        )
+        
         if not settings.reddit_client_id or not settings.reddit_client_secret:
             logger.warning("Reddit credentials not configured")
             self.reddit = None
         else:
-            self.reddit = praw.Reddit(
-                client_id=settings.reddit_client_id,
-                client_secret=settings.reddit_client_secret,
-                user_agent=settings.reddit_user_agent,
-            )
+            self.reddit = self._make_reddit()
+    
+    def _make_reddit(self) -> praw.Reddit:
+        """Create a PRAW client from settings."""
+        settings = get_settings()
+        return praw.Reddit(
+            client_id=settings.reddit_client_id,
+            client_secret=settings.reddit_client_secret,
+            user_agent=settings.reddit_user_agent,
+        )
+    
+    def _thread_reddit(self) -> praw.Reddit:
+        """Get this worker thread's PRAW client (PRAW is not thread-safe)."""
+        reddit = getattr(self._local, "reddit", None)
+        if reddit is None:
+            reddit = self._local.reddit = self._make_reddit()
+        return reddit
+    
+    def close(self) -> None:
+        """Shut down the async-mode thread pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    def is_seen(self, submission: praw.models.Submission) -> bool:
+        """Check whether a submission is already stored."""
+        return self.seen_index.contains(normalize_url(f"https://reddit.com{submission.permalink}"))
     
     def parse_submission(
         self,
@@ -86,11 +136,49 @@ class RedditIngester:
             logger.error(f"Error parsing submission: {e}", exc_info=True)
             return None
     
+    def build_articles(
+        self,
+        source: Source,
+        submissions: Iterable[praw.models.Submission],
+        fetched_at: datetime
+    ) -> List[Article]:
+        """Classify unseen submissions into Article models."""
+        articles = []
+        for submission in submissions:
+            if self.is_seen(submission):
+                continue
+            article = self.parse_submission(submission, source, fetched_at)
+            if article:
+                articles.append(article)
+        return articles
+    
+    def write_submissions(
+        self,
+        db: Session,
+        source: Source,
+        submissions: Iterable[praw.models.Submission],
+        fetched_at: datetime,
+        writer: Optional[ArticleWriter] = None
+    ) -> int:
+        """Parse unseen submissions and write them in one batch.
+        
+        Returns:
+            Number of new articles inserted
+        """
+        if writer is None:
+            writer = ArticleWriter(db, seen_index=self.seen_index)
+        
+        for article in self.build_articles(source, submissions, fetched_at):
+            writer.add(article)
+        
+        return len(writer.flush())
+    
     def ingest_subreddit(
         self,
         db: Session,
         source: Source,
-        limit: int = 25
+        limit: int = SUBREDDIT_LIMIT,
+        writer: Optional[ArticleWriter] = None
     ) -> int:
         """Ingest from a subreddit.
         
@@ -105,23 +193,11 @@ class RedditIngester:
             subreddit = self.reddit.subreddit(subreddit_name)
             
             fetched_at = now_utc()
-            new_count = 0
             
             # Fetch hot and new posts
-            for submission in subreddit.hot(limit=limit):
-                article = self.parse_submission(submission, source, fetched_at)
-                if not article:
-                    continue
-                
-                try:
-                    db.add(article)
-                    db.commit()
-                    new_count += 1
-                except Exception as e:
-                    db.rollback()
-                    if "unique" in str(e).lower() or "duplicate" in str(e).lower():
-                        continue
-                    logger.error(f"Error inserting article: {e}")
+            new_count = self.write_submissions(
+                db, source, subreddit.hot(limit=limit), fetched_at, writer
+            )
             
             logger.info(f"Ingested {new_count} new articles from r/{subreddit_name}")
             return new_count
@@ -133,7 +209,8 @@ class RedditIngester:
         self,
         db: Session,
         source: Source,
-        limit: int = 10
+        limit: int = USER_LIMIT,
+        writer: Optional[ArticleWriter] = None
     ) -> int:
         """Ingest from a Reddit user (recent posts/comments).
         
@@ -148,27 +225,162 @@ class RedditIngester:
             redditor = self.reddit.redditor(username)
             
             fetched_at = now_utc()
-            new_count = 0
             
             # Fetch recent submissions
-            for submission in redditor.submissions.new(limit=limit):
-                article = self.parse_submission(submission, source, fetched_at)
-                if not article:
-                    continue
-                
-                try:
-                    db.add(article)
-                    db.commit()
-                    new_count += 1
-                except Exception as e:
-                    db.rollback()
-                    if "unique" in str(e).lower() or "duplicate" in str(e).lower():
-                        continue
-                    logger.error(f"Error inserting article: {e}")
+            new_count = self.write_submissions(
+                db, source, redditor.submissions.new(limit=limit), fetched_at, writer
+            )
             
             logger.info(f"Ingested {new_count} new articles from u/{username}")
             return new_count
         except Exception as e:
             logger.error(f"Error ingesting user {source.name}: {e}", exc_info=True)
             return 0
-
+    
+    
+    def fetch_submissions(
+        self,
+        source_type: str,
+        name: str,
+        limit: int,
+        reddit: Optional[praw.Reddit] = None
+    ) -> List[praw.models.Submission]:
+        """Fetch a listing (blocking; runs in the worker pool).
+        
+        `name` may be a combined subreddit listing such as "a+b+c"; PRAW
+        paginates until `limit` items are returned. Subreddits use new(), so
+        a combined listing is ordered by time rather than by score and a busy
+        subreddit can only crowd out a quiet one's older posts.
+        
+        `reddit` defaults to the calling worker thread's own client; callers
+        that fetch one listing at a time can pass the shared `self.reddit`.
+        """
+        reddit = reddit or self._thread_reddit()
+        if source_type == "reddit_sub":
+            listing = reddit.subreddit(name).new(limit=limit)
+        else:
+            listing = reddit.redditor(name).submissions.new(limit=limit)
+        return list(listing)
+    
+    async def ingest_sources_async(
+        self,
+        db: Session,
+        sources: List[Source],
+        writer: Optional[ArticleWriter] = None,
+        sink: Optional[Callable[[Source, List[Article]], Awaitable[int]]] = None
+    ) -> List[Union[int, Exception]]:
+        """Ingest several Reddit sources concurrently without blocking the loop.
+        
+        Subreddit sources are grouped into combined listings (r/a+b+c) to save
+        API quota; each submission is routed back to its source by subreddit
+        name. When a full listing doesn't reach back to a quiet subreddit's
+        last seen post, that subreddit is topped up from its own listing.
+        Listing requests run in the thread pool under the shared
+        rate-limit budget, and parsing/writing happen back on the event loop as
+        each request returns, so the phase takes about as long as the slowest
+        request.
+        
+        Args:
+            db: Database session
+            sources: Reddit sources to poll
+            writer: Optional shared writer
+            sink: If given, parsed articles are passed to `await sink(source,
+                articles)` instead of being written here; it returns the
+                number of articles its writer inserted
+        
+        Returns:
+            New-article count or exception per source, in input order
+        """
+        if not self.reddit:
+            return [0 for _ in sources]
+        
+        settings = get_settings()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.reddit_concurrency,
+                thread_name_prefix="reddit",
+            )
+        loop = asyncio.get_running_loop()
+        results: List[Union[int, Exception]] = [0 for _ in sources]
+        
+        async def handle(source: Source, submissions: list, fetched_at: datetime) -> int:
+            if sink is None:
+                new_count = self.write_submissions(db, source, submissions, fetched_at, writer)
+                logger.info(f"Ingested {new_count} new articles from {source.name}")
+                return new_count
+            return await sink(source, self.build_articles(source, submissions, fetched_at))
+        
+        async def fetch(source_type: str, name: str, limit: int) -> list:
+            # Listings return at most 100 items per request
+            await self.rate_limiter.acquire(math.ceil(limit / LISTING_PAGE_SIZE))
+            return await loop.run_in_executor(
+                self._executor, self.fetch_submissions, source_type, name, limit
+            )
+        
+        async def ingest_group(group: List[Tuple[int, Source]]) -> None:
+            # Read ORM attributes on the loop thread; workers get plain values
+            by_name = {source.url_or_id.lower(): index for index, source in group}
+            names = "+".join(source.url_or_id for _, source in group)
+            
+            fetched_at = now_utc()
+            limit = SUBREDDIT_LIMIT * len(group)
+            submissions = await fetch("reddit_sub", names, limit)
+            
+            routed: Dict[int, list] = {index: [] for index, _ in group}
+            for submission in submissions:
+                index = by_name.get(submission.subreddit.display_name.lower())
+                if index is not None:
+                    routed[index].append(submission)
+            
+            # A full listing only reaches back to its oldest item; subreddits
+            # short of their own limit whose cursor is older may have posts in
+            # the gap (an unknown cursor counts as older)
+            if len(submissions) >= limit:
+                oldest = min(submission.created_utc for submission in submissions)
+                gaps = [
+                    (index, source) for index, source in group
+                    if len(routed[index]) < SUBREDDIT_LIMIT
+                    and self._subreddit_cursors.get(source.url_or_id.lower(), 0.0) < oldest
+                ]
+                extra = await asyncio.gather(
+                    *[fetch("reddit_sub", source.url_or_id, SUBREDDIT_LIMIT) for _, source in gaps]
+                )
+                for (index, _), more in zip(gaps, extra):
+                    known = {submission.permalink for submission in routed[index]}
+                    routed[index].extend(submission for submission in more if submission.permalink not in known)
+            
+            # Hand every source over before waiting, so the writer can batch them
+            handled = await asyncio.gather(
+                *[handle(source, routed[index], fetched_at) for index, source in group],
+                return_exceptions=True,
+            )
+            for (index, source), outcome in zip(group, handled):
+                results[index] = outcome
+                if isinstance(outcome, Exception):
+                    continue
+                if routed[index]:
+                    key = source.url_or_id.lower()
+                    newest = max(submission.created_utc for submission in routed[index])
+                    self._subreddit_cursors[key] = max(self._subreddit_cursors.get(key, 0.0), newest)
+        
+        async def ingest_user(index: int, source: Source) -> None:
+            fetched_at = now_utc()
+            submissions = await fetch("reddit_user", source.url_or_id, USER_LIMIT)
+            results[index] = await handle(source, submissions, fetched_at)
+        
+        subreddits = [(i, s) for i, s in enumerate(sources) if s.type == "reddit_sub"]
+        group_size = max(1, settings.reddit_multi_subreddit_size)
+        groups = [subreddits[i:i + group_size] for i in range(0, len(subreddits), group_size)]
+        users = [(i, s) for i, s in enumerate(sources) if s.type == "reddit_user"]
+        
+        jobs = [(ingest_group(group), [i for i, _ in group]) for group in groups]
+        jobs += [(ingest_user(i, source), [i]) for i, source in users]
+        outcomes = await asyncio.gather(*[job for job, _ in jobs], return_exceptions=True)
+        
+        # A failed request fails every source it covered
+        for (_, indexes), outcome in zip(jobs, outcomes):
+            if isinstance(outcome, Exception):
+                for index in indexes:
+                    results[index] = outcome
+        
+        return results
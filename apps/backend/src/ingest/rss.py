@@ -1,75 +1,179 @@
 """RSS feed ingestion."""
 
+import hashlib
 import logging
+from contextlib import nullcontext
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+import asyncio
 import aiohttp
-import feedparser
 from sqlalchemy.orm import Session
 
 from ..models import Article, Source
 from ..utils.time import now_utc, UTC
 from ..utils.dedupe import normalize_url
 from .classify import TopicClassifier
+from .writer import ArticleWriter
+from .seen import SeenURLIndex, get_seen_index
+from .parsing import parse_feed
 
 logger = logging.getLogger(__name__)
 
+# Sentinel returned by fetch_feed when the feed has not changed since the last fetch
+NOT_MODIFIED = object()
+
 
 class RSSIngester:
     """RSS feed ingester."""
     
-    def __init__(self, classifier: TopicClassifier):
-        """Initialize RSS ingester."""
+    def __init__(
+        self,
+        classifier: TopicClassifier,
+        seen_index: Optional[SeenURLIndex] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+        semaphore: Optional[asyncio.Semaphore] = None
+    ):
+        """Initialize RSS ingester.
+        
+        Args:
+            classifier: Topic classifier
+            seen_index: Seen-URL index (defaults to the process-wide one)
+            session: Shared session to reuse; one is created per context if omitted
+            semaphore: Optional limit on concurrent fetches
+        """
         self.classifier = classifier
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.seen_index = seen_index or get_seen_index()
+        self.session = session
+        self.semaphore = semaphore
+        self._owns_session = session is None
+        # Validators from fetches whose articles aren't stored yet (see apply_validators)
+        self._pending_validators: Dict[Source, Tuple[Optional[str], Optional[str], str]] = {}
     
     async def __aenter__(self):
         """Async context manager entry."""
-        timeout = aiohttp.ClientTimeout(total=30, connect=10)
-        self.session = aiohttp.ClientSession(timeout=timeout)
+        if self._owns_session:
+            timeout = aiohttp.ClientTimeout(total=30, connect=10)
+            self.session = aiohttp.ClientSession(timeout=timeout)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        if self.session:
+        if self._owns_session and self.session:
             await self.session.close()
     
-    async def fetch_feed(self, url: str) -> Optional[feedparser.FeedParserDict]:
-        """Fetch and parse RSS feed."""
+    async def fetch_raw(self, source: Source):
+        """Fetch raw feed bytes using conditional GET.
+        
+        Sends the stored ETag/Last-Modified validators and falls back to a
+        content hash for servers that ignore them. Updated validators are
+        only staged: the caller applies them with apply_validators() once the
+        feed's articles are written, so a failed parse or write is retried on
+        the next poll instead of being answered with 304.
+        
+        Returns:
+            Feed bytes, NOT_MODIFIED if unchanged, or None on error
+        """
         if not self.session:
             raise RuntimeError("Session not initialized")
         
+        url = source.url_or_id
+        headers = {}
+        if source.etag:
+            headers["If-None-Match"] = source.etag
+        if source.last_modified:
+            headers["If-Modified-Since"] = source.last_modified
+        
         try:
-            async with self.session.get(url) as response:
-                if response.status != 200:
-                    logger.warning(f"Failed to fetch {url}: status {response.status}")
-                    return None
-                
-                content = await response.text()
-                feed = feedparser.parse(content)
-                
-                if feed.bozo:
-                    logger.warning(f"Feed parse error for {url}: {feed.bozo_exception}")
-                
-                return feed
+            # Hold a fetch slot only while the socket is in use
+            async with self.semaphore or nullcontext():
+                async with self.session.get(url, headers=headers) as response:
+                    if response.status == 304:
+                        return NOT_MODIFIED
+                    
+                    if response.status != 200:
+                        logger.warning(f"Failed to fetch {url}: status {response.status}")
+                        return None
+                    
+                    content = await response.read()
+                    etag = response.headers.get("ETag")
+                    last_modified = response.headers.get("Last-Modified")
         except Exception as e:
             logger.error(f"Error fetching feed {url}: {e}", exc_info=True)
             return None
+        
+        content_hash = hashlib.sha256(content).hexdigest()
+        self._pending_validators[source] = (etag, last_modified, content_hash)
+        return NOT_MODIFIED if content_hash == source.content_hash else content
+    
+    def apply_validators(self, source: Source) -> bool:
+        """Write validators staged by fetch_raw() onto the source (caller commits).
+        
+        Returns:
+            True if the source was updated
+        """
+        validators = self._pending_validators.pop(source, None)
+        if validators is None:
+            return False
+        source.etag, source.last_modified, source.content_hash = validators
+        return True
+    
+    async def parse_content(self, source: Source, content: bytes) -> Optional[dict]:
+        """Parse feed bytes in the worker pool so large feeds don't stall the API."""
+        try:
+            feed = await parse_feed(content)
+        except Exception as e:
+            logger.error(f"Error parsing feed {source.url_or_id}: {e}", exc_info=True)
+            return None
+        
+        if feed["bozo_error"]:
+            logger.warning(f"Feed parse error for {source.url_or_id}: {feed['bozo_error']}")
+        
+        return feed
+    
+    async def fetch_feed(self, source: Source):
+        """Fetch and parse RSS feed using conditional GET.
+        
+        Returns:
+            Parsed feed dict (plain entries), NOT_MODIFIED if unchanged, or None on error
+        """
+        content = await self.fetch_raw(source)
+        if content is None or content is NOT_MODIFIED:
+            return content
+        return await self.parse_content(source, content)
+    
+    def build_articles(
+        self,
+        source: Source,
+        entries: List[dict],
+        fetched_at: datetime
+    ) -> List[Article]:
+        """Classify unseen feed entries into Article models."""
+        articles = []
+        for entry in entries:
+            # Drop entries already stored before classifying them
+            link = (entry.get("link") or "").strip()
+            if link and self.seen_index.contains(normalize_url(link)):
+                continue
+            
+            article = self.parse_entry(entry, source, fetched_at)
+            if article:
+                articles.append(article)
+        return articles
     
     def parse_entry(
         self,
-        entry: feedparser.FeedParserDict,
+        entry: dict,
         source: Source,
         fetched_at: datetime
     ) -> Optional[Article]:
-        """Parse feed entry into Article model."""
+        """Parse plain feed entry dict into Article model."""
         try:
             # Extract fields
-            title = entry.get("title", "").strip()
+            title = (entry.get("title") or "").strip()
             if not title:
                 return None
             
-            url = entry.get("link", "").strip()
+            url = (entry.get("link") or "").strip()
             if not url:
                 return None
             
@@ -77,32 +181,14 @@ class RSSIngester:
             url = normalize_url(url)
             
             # Get summary/description
-            summary = None
-            if "summary" in entry:
-                summary = entry.get("summary", "").strip()
-            elif "description" in entry:
-                summary = entry.get("description", "").strip()
+            summary = entry.get("summary")
+            if summary is not None:
+                summary = summary.strip()
             
             # Parse published date
             published_at = fetched_at  # Default to now
-            if "published_parsed" in entry and entry.published_parsed:
-                try:
-                    import time
-                    published_at = datetime.fromtimestamp(
-                        time.mktime(entry.published_parsed),
-                        tz=UTC
-                    )
-                except Exception:
-                    pass
-            elif "updated_parsed" in entry and entry.updated_parsed:
-                try:
-                    import time
-                    published_at = datetime.fromtimestamp(
-                        time.mktime(entry.updated_parsed),
-                        tz=UTC
-                    )
-                except Exception:
-                    pass
+            if entry.get("published") is not None:
+                published_at = datetime.fromtimestamp(entry["published"], tz=UTC)
             
             # Classify topic
             topic = self.classifier.classify(
@@ -111,13 +197,6 @@ class RSSIngester:
                 source_topic=source.topic
             ) or "politics"  # Default fallback
             
-            # Get author
-            author = None
-            if "author" in entry:
-                author = entry.author
-            elif "author_detail" in entry:
-                author = entry.author_detail.get("name")
-            
             # Create article
             article = Article(
                 source=source.name,
@@ -128,8 +207,8 @@ class RSSIngester:
                 topic=topic,
                 published_at_utc=published_at,
                 fetched_at_utc=fetched_at,
-                author=author,
-                raw={"feed_title": entry.get("title"), "feed_tags": [tag.get("term") for tag in entry.get("tags", [])]}
+                author=entry.get("author"),
+                raw={"feed_title": entry.get("title"), "feed_tags": entry.get("tags", [])}
             )
             
             return article
@@ -140,40 +219,49 @@ class RSSIngester:
     async def ingest_source(
         self,
         db: Session,
-        source: Source
-    ) -> int:
+        source: Source,
+        writer: Optional[ArticleWriter] = None
+    ) -> Optional[int]:
         """Ingest articles from a single RSS source.
         
+        Args:
+            db: Database session
+            source: RSS source to fetch
+            writer: Optional shared writer collecting inserted IDs for the cycle
+        
         Returns:
-            Number of new articles inserted
+            Number of new articles inserted, or None if the feed was not modified
         """
         if source.type != "rss":
             return 0
         
         fetched_at = now_utc()
-        feed = await self.fetch_feed(source.url_or_id)
+        feed = await self.fetch_feed(source)
         
-        if not feed or not feed.entries:
-            logger.warning(f"No entries found in feed: {source.name}")
+        if feed is NOT_MODIFIED:
+            if self.apply_validators(source):
+                db.commit()
+            logger.debug(f"Feed not modified: {source.name}")
+            return None
+        
+        if not feed:
             return 0
         
-        new_count = 0
-        for entry in feed.entries:
-            article = self.parse_entry(entry, source, fetched_at)
-            if not article:
-                continue
+        if not feed["entries"]:
+            logger.warning(f"No entries found in feed: {source.name}")
+            new_count = 0
+        else:
+            if writer is None:
+                writer = ArticleWriter(db, seen_index=self.seen_index)
             
-            # Try to insert (ignore duplicates)
-            try:
-                db.add(article)
-                db.commit()
-                new_count += 1
-            except Exception as e:
-                db.rollback()
-                # Check if it's a duplicate URL error
-                if "unique" in str(e).lower() or "duplicate" in str(e).lower():
-                    continue
-                logger.error(f"Error inserting article: {e}")
+            for article in self.build_articles(source, feed["entries"], fetched_at):
+                writer.add(article)
+            
+            new_count = len(writer.flush())
+        
+        # Persist validators only once this feed's articles are stored
+        self.apply_validators(source)
+        db.commit()
         
         logger.info(f"Ingested {new_count} new articles from {source.name}")
         return new_count
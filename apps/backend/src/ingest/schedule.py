@@ -0,0 +1,117 @@
+"""Adaptive per-source polling schedule."""
+
+import random
+import time
+from typing import Dict, List, Optional
+
+from ..models import Source
+
+# Smoothing factor for publish-rate and hit-ratio averages
+EWMA_ALPHA = 0.3
+
+# Interval multiplier after a poll with new articles
+SPEEDUP = 0.5
+
+# Interval multiplier range after an empty poll (scaled by miss ratio)
+MIN_BACKOFF = 1.25
+MAX_BACKOFF = 2.0
+
+# Random spread applied to each interval so sources don't re-synchronize
+JITTER = 0.1
+
+
+class SourcePollState:
+    """Polling statistics for one source."""
+    
+    __slots__ = ("interval", "next_poll", "last_poll", "rate", "hit_ratio", "polls")
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.next_poll = 0.0
+        self.last_poll: Optional[float] = None
+        self.rate = 0.0  # New articles per second (EWMA)
+        self.hit_ratio = 1.0  # Fraction of polls that found new articles (EWMA)
+        self.polls = 0
+
+
+class AdaptivePollScheduler:
+    """Decide when each source is next polled from its recent behaviour.
+    
+    Sources that keep returning new articles are polled more often (down to
+    `min_interval`); sources that return nothing or 304 back off towards
+    `max_interval`, faster when their hit ratio is low.
+    """
+    
+    def __init__(self, min_interval: float, max_interval: float):
+        """Initialize scheduler."""
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self._states: Dict[int, SourcePollState] = {}
+    
+    def _state(self, source_id: int) -> SourcePollState:
+        state = self._states.get(source_id)
+        if state is None:
+            state = self._states[source_id] = SourcePollState(self.min_interval)
+        return state
+    
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, interval))
+    
+    def due(self, sources: List[Source], now: Optional[float] = None) -> List[Source]:
+        """Get sources whose next poll time has passed (new sources are due)."""
+        now = time.monotonic() if now is None else now
+        return [s for s in sources if self._state(s.id).next_poll <= now]
+    
+    def record(
+        self,
+        source_id: int,
+        new_count: Optional[int],
+        now: Optional[float] = None
+    ) -> float:
+        """Record a poll result and schedule the source's next poll.
+        
+        Args:
+            source_id: Polled source
+            new_count: New articles inserted (None when not modified)
+            now: Poll completion time (monotonic seconds)
+        
+        Returns:
+            Seconds until the next poll
+        """
+        now = time.monotonic() if now is None else now
+        state = self._state(source_id)
+        new_count = new_count or 0
+        
+        elapsed = now - state.last_poll if state.last_poll is not None else state.interval
+        rate = new_count / max(elapsed, 1.0)
+        hit = 1.0 if new_count > 0 else 0.0
+        state.rate = EWMA_ALPHA * rate + (1 - EWMA_ALPHA) * state.rate
+        state.hit_ratio = EWMA_ALPHA * hit + (1 - EWMA_ALPHA) * state.hit_ratio
+        
+        if new_count > 0:
+            # Burst: speed up, at least to the interval expected to yield one article
+            expected = 1.0 / state.rate if state.rate > 0 else self.max_interval
+            interval = min(state.interval * SPEEDUP, expected)
+        else:
+            backoff = MIN_BACKOFF + (MAX_BACKOFF - MIN_BACKOFF) * (1.0 - state.hit_ratio)
+            interval = state.interval * backoff
+        
+        state.interval = self._clamp(interval)
+        state.last_poll = now
+        state.polls += 1
+        
+        delay = state.interval * random.uniform(1 - JITTER, 1 + JITTER)
+        state.next_poll = now + delay
+        return delay
+    
+    def stats(self) -> dict:
+        """Get per-source polling state keyed by source id."""
+        return {
+            source_id: {
+                "interval_seconds": round(state.interval, 1),
+                "rate_per_hour": round(state.rate * 3600, 2),
+                "hit_ratio": round(state.hit_ratio, 3),
+                "polls": state.polls,
+            }
+            for source_id, state in self._states.items()
+        }
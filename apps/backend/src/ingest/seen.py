@@ -0,0 +1,86 @@
+"""Process-wide index of article URLs already stored."""
+
+import logging
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Iterable
+from sqlalchemy.orm import Session
+
+from ..models import Article
+from ..core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class SeenURLIndex:
+    """LRU-bounded set of normalized URLs known to exist in the articles table.
+    
+    A hit is exact (the URL is stored), so ingesters can drop the entry before
+    classification. A miss may still be a duplicate that was evicted; the
+    writer's ON CONFLICT clause covers that case.
+    """
+    
+    def __init__(self, capacity: int = 200_000):
+        """Initialize index."""
+        self.capacity = capacity
+        self._urls: "OrderedDict[str, None]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self._urls)
+    
+    def contains(self, url: str) -> bool:
+        """Check whether a normalized URL is known, updating counters."""
+        if url in self._urls:
+            self._urls.move_to_end(url)
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+    
+    def add(self, url: str) -> None:
+        """Mark a normalized URL as stored."""
+        if url in self._urls:
+            self._urls.move_to_end(url)
+            return
+        self._urls[url] = None
+        if len(self._urls) > self.capacity:
+            self._urls.popitem(last=False)
+            self.evictions += 1
+    
+    def add_many(self, urls: Iterable[str]) -> None:
+        """Mark several normalized URLs as stored."""
+        for url in urls:
+            self.add(url)
+    
+    def warm(self, db: Session) -> int:
+        """Load the most recently inserted URLs from the database.
+        
+        Returns:
+            Number of URLs loaded
+        """
+        rows = db.query(Article.url).order_by(Article.id.desc()).limit(self.capacity).all()
+        # Insert oldest first so the newest URLs are the last to be evicted
+        self.add_many(url for (url,) in reversed(rows))
+        logger.info(f"Warmed seen-URL index with {len(rows)} URLs")
+        return len(rows)
+    
+    def stats(self) -> dict:
+        """Get index size and hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._urls),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+@lru_cache()
+def get_seen_index() -> SeenURLIndex:
+    """Get the process-wide seen-URL index."""
+    return SeenURLIndex(capacity=get_settings().seen_url_index_size)
@@ -0,0 +1,100 @@
+"""Bounded-queue async stages for the streaming ingestion pipeline."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Queue marker telling one worker to exit
+_STOP = object()
+
+
+class Stage:
+    """A pool of workers consuming a bounded queue.
+    
+    Producers block in put() while the queue is full, which propagates
+    backpressure upstream. Handlers receive a list of up to `max_batch`
+    items so stages like the writer can coalesce whatever is already queued.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[List[Any]], Awaitable[None]],
+        workers: int = 1,
+        maxsize: int = 32,
+        max_batch: int = 1
+    ):
+        """Initialize stage (call start() inside the running loop)."""
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.max_batch = max(1, max_batch)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.errors: List[str] = []
+        self._tasks: List[asyncio.Task] = []
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+        self.items = 0
+        self.batches = 0
+        self.max_depth = 0
+        self.busy_seconds = 0.0
+    
+    def start(self) -> None:
+        """Spawn worker tasks."""
+        self._started = time.perf_counter()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+    
+    async def put(self, item: Any) -> None:
+        """Enqueue an item, waiting while the queue is full."""
+        await self.queue.put(item)
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+    
+    async def close(self) -> None:
+        """Let workers drain the queue, then wait for them to exit."""
+        for _ in self._tasks:
+            await self.queue.put(_STOP)
+        await asyncio.gather(*self._tasks)
+        self._finished = time.perf_counter()
+    
+    async def _worker(self) -> None:
+        stopping = False
+        while not stopping:
+            item = await self.queue.get()
+            if item is _STOP:
+                break
+            
+            batch = [item]
+            while len(batch) < self.max_batch and not self.queue.empty():
+                extra = self.queue.get_nowait()
+                if extra is _STOP:
+                    stopping = True
+                    break
+                batch.append(extra)
+            
+            start = time.perf_counter()
+            try:
+                await self.handler(batch)
+            except Exception as e:
+                logger.error(f"Stage {self.name} error: {e}", exc_info=True)
+                self.errors.append(f"{self.name}: {str(e)}")
+            self.busy_seconds += time.perf_counter() - start
+            self.items += len(batch)
+            self.batches += 1
+    
+    def stats(self) -> dict:
+        """Get queue depth and throughput for this stage."""
+        end = self._finished or time.perf_counter()
+        elapsed = end - self._started if self._started else 0.0
+        return {
+            "workers": self.workers,
+            "queue_depth": self.queue.qsize(),
+            "max_queue_depth": self.max_depth,
+            "queue_capacity": self.queue.maxsize,
+            "items": self.items,
+            "batches": self.batches,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "items_per_second": round(self.items / elapsed, 2) if elapsed > 0 else 0.0,
+        }
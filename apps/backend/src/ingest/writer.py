@@ -0,0 +1,101 @@
+"""Batched article writer."""
+
+import logging
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+
+from ..models import Article
+from ..core.db import dialect_insert
+from ..analytics.bucket import aggregate_new_articles
+from .seen import SeenURLIndex
+
+logger = logging.getLogger(__name__)
+
+# Columns written on insert (id is assigned by the database)
+ARTICLE_COLUMNS = [c.key for c in Article.__table__.columns if c.key != "id"]
+
+# SQLite caps bound parameters per statement (999 on older builds)
+SQLITE_MAX_PARAMS = 999
+
+
+class ArticleWriter:
+    """Buffer parsed articles and insert them in multi-row batches.
+    
+    Duplicates are skipped with ON CONFLICT (url) DO NOTHING, so a flush is a
+    single round trip per batch regardless of how many entries already exist.
+    With `count_bucket_size` set, count deltas for the inserted rows are
+    applied in the same transaction, so articles and counts commit together.
+    """
+    
+    def __init__(
+        self,
+        db: Session,
+        batch_size: int = 500,
+        seen_index: Optional[SeenURLIndex] = None,
+        count_bucket_size: Optional[str] = None
+    ):
+        """Initialize writer."""
+        self.db = db
+        self.batch_size = batch_size
+        self.seen_index = seen_index
+        self.count_bucket_size = count_bucket_size
+        self._buffer: Dict[str, dict] = {}
+        self.inserted_ids: List[int] = []
+        self.inserted_rows: List[dict] = []
+        self.updated_counts: List[dict] = []  # Count rows written by flushes (with count_bucket_size)
+    
+    def __len__(self) -> int:
+        return len(self._buffer)
+    
+    def add(self, article: Article) -> None:
+        """Buffer an article for the next flush (first URL wins)."""
+        if article.url in self._buffer:
+            return
+        self._buffer[article.url] = {col: getattr(article, col) for col in ARTICLE_COLUMNS}
+    
+    def flush(self) -> List[int]:
+        """Insert buffered articles, skipping URLs that already exist.
+        
+        Returns:
+            IDs of the rows inserted by this flush
+        """
+        if not self._buffer:
+            return []
+        
+        rows = list(self._buffer.values())
+        self._buffer.clear()
+        
+        chunk_size = self.batch_size
+        if self.db.get_bind().dialect.name == "sqlite":
+            chunk_size = min(chunk_size, SQLITE_MAX_PARAMS // len(ARTICLE_COLUMNS))
+        
+        by_url = {row["url"]: row for row in rows}
+        inserted: List[dict] = []
+        try:
+            for i in range(0, len(rows), chunk_size):
+                stmt = (
+                    dialect_insert(self.db, Article.__table__)
+                    .values(rows[i:i + chunk_size])
+                    .on_conflict_do_nothing(index_elements=["url"])
+                    .returning(Article.__table__.c.id, Article.__table__.c.url)
+                )
+                for article_id, url in self.db.execute(stmt):
+                    inserted.append({**by_url[url], "id": article_id})
+            counts: List[dict] = []
+            if self.count_bucket_size and inserted:
+                counts = aggregate_new_articles(self.db, inserted, self.count_bucket_size, commit=False)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error writing {len(rows)} articles: {e}", exc_info=True)
+            raise
+        
+        # Inserted and conflicting URLs are both stored now
+        if self.seen_index is not None:
+            self.seen_index.add_many(by_url.keys())
+        
+        ids = [row["id"] for row in inserted]
+        self.inserted_ids.extend(ids)
+        self.inserted_rows.extend(inserted)
+        self.updated_counts.extend(counts)
+        return ids
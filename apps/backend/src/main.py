@@ -10,6 +10,7 @@ from apscheduler.triggers.interval import IntervalTrigger
 from .core.config import get_settings
 from .core.logging import setup_logging
 from .core.db import init_db
+from .core.cache import ResponseCacheMiddleware
 from .api import (
     news_router,
     aggregate_router,
@@ -18,7 +19,10 @@ from .api import (
     stream_router,
     admin_router,
 )
-from .ingest.pipeline import IngestionPipeline
+from .ingest.pipeline import get_pipeline
+from .ingest.seen import get_seen_index
+from .ingest.parsing import shutdown_parse_executor
+from .analytics.store import get_timeseries_store
 
 settings = get_settings()
 setup_logging(settings.log_level)
@@ -59,6 +63,14 @@ async def lifespan(app: FastAPI):
                         db.add(source)
                     db.commit()
                     logger.info(f"Loaded {len(sources_data)} sources from config")
+        
+        # Warm the dedupe index so the first cycle skips stored articles
+        get_seen_index().warm(db)
+        # Load the hot window of counts used by detection and /api/aggregate
+        get_timeseries_store().warm(db)
+        get_pipeline().load_seasonal_profiles(db)
+        if settings.anomaly_engine == "online":
+            get_pipeline().load_online_baseline(db)
     finally:
         db.close()
     
@@ -67,7 +79,7 @@ async def lifespan(app: FastAPI):
         logger.info("Starting scheduler...")
         scheduler = AsyncIOScheduler()
         
-        pipeline = IngestionPipeline()
+        pipeline = get_pipeline()
         
         async def run_ingest():
             try:
@@ -75,9 +87,14 @@ async def lifespan(app: FastAPI):
             except Exception as e:
                 logger.error(f"Scheduled ingestion error: {e}", exc_info=True)
         
+        # Adaptive polling ticks often and lets the pipeline pick due sources
+        tick_seconds = settings.ingest_min_interval_seconds
+        if settings.ingest_adaptive_polling:
+            tick_seconds = min(settings.ingest_tick_seconds, tick_seconds)
+        
         scheduler.add_job(
             run_ingest,
-            trigger=IntervalTrigger(seconds=settings.ingest_min_interval_seconds),
+            trigger=IntervalTrigger(seconds=tick_seconds),
             id="ingest_job",
             replace_existing=True,
         )
@@ -90,6 +107,8 @@ async def lifespan(app: FastAPI):
     if scheduler:
         scheduler.shutdown()
         logger.info("Scheduler stopped")
+    await get_pipeline().close()
+    shutdown_parse_executor()
 
 
 app = FastAPI(
@@ -99,6 +118,10 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Response cache (added before CORS so CORS headers also wrap cached and 304 responses)
+if settings.response_cache_enabled:
+    app.add_middleware(ResponseCacheMiddleware)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -121,20 +144,17 @@ app.include_router(admin_router)
 async def health():
     """Health check endpoint."""
     from .models import Article
-    from .core.db import SessionLocal
-    from sqlalchemy import func
+    from .core.db import get_async_sessionmaker
+    from sqlalchemy import func, select
     
-    db = SessionLocal()
-    try:
+    async with get_async_sessionmaker()() as db:
         # Get last article fetch time
-        last_article = db.query(func.max(Article.fetched_at_utc)).scalar()
+        last_article = await db.scalar(select(func.max(Article.fetched_at_utc)))
         return {
             "status": "healthy",
             "version": "1.0.0",
             "last_ingest_utc": last_article.isoformat() if last_article else None,
         }
-    finally:
-        db.close()
 
 
 if __name__ == "__main__":
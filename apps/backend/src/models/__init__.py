@@ -4,6 +4,9 @@ from .article import Article
 from .count import Count
 from .anomaly import Anomaly
 from .source import Source
+from .rollup import RollupWatermark
+from .detector import DetectorSnapshot
+from .seasonal import SeasonalProfile
 
-__all__ = ["Article", "Count", "Anomaly", "Source"]
+__all__ = ["Article", "Count", "Anomaly", "Source", "RollupWatermark", "DetectorSnapshot", "SeasonalProfile"]
 
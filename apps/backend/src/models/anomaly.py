@@ -1,7 +1,7 @@
 """Anomaly detection model."""
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Float, String, Index
+from sqlalchemy import Column, Integer, String, DateTime, Float, String, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import TIMESTAMP
 
 from ..core.db import Base
@@ -15,7 +15,8 @@ class Anomaly(Base):
     id = Column(Integer, primary_key=True, index=True)
     bucket_start_utc = Column(TIMESTAMP(timezone=True), nullable=False, index=True)
     bucket_size = Column(String(10), nullable=False)  # 1m, 5m, 60m
-    topic = Column(String(50), nullable=False, index=True)
+    topic = Column(String(50), nullable=False, index=True)  # "all" for per-source totals
+    source = Column(String(255), nullable=False, default="", index=True)  # Empty string for aggregate
     observed = Column(Integer, nullable=False)
     expected = Column(Float, nullable=False)
     deviation = Column(Float, nullable=False)  # Z-score or MAD score
@@ -24,6 +25,7 @@ class Anomaly(Base):
     
     __table_args__ = (
         Index("idx_anomalies_topic_created", "topic", "created_at_utc"),
-        Index("idx_anomalies_bucket", "bucket_start_utc", "bucket_size", "topic"),
+        # One anomaly per series and bucket; backfills rely on it for idempotent inserts
+        UniqueConstraint("bucket_start_utc", "bucket_size", "topic", "source", name="uq_anomalies_bucket"),
     )
 
@@ -16,9 +16,11 @@ class Count(Base):
     topic = Column(String(50), primary_key=True, nullable=False, index=True)
     source = Column(String(255), primary_key=True, nullable=True, default="")  # Empty string for aggregate
     count = Column(Integer, nullable=False, default=0)
+    updated_at_utc = Column(DateTime(timezone=True), nullable=True)  # Last time count changed, for change cursors
     
     __table_args__ = (
         Index("idx_counts_topic_bucket", "topic", "bucket_start_utc", "bucket_size"),
         Index("idx_counts_source_bucket", "source", "bucket_start_utc", "bucket_size"),
+        Index("idx_counts_size_updated", "bucket_size", "updated_at_utc"),
     )
 
@@ -0,0 +1,16 @@
+"""Detector state snapshot model."""
+
+from sqlalchemy import Column, String, LargeBinary
+from sqlalchemy.dialects.postgresql import TIMESTAMP
+
+from ..core.db import Base
+
+
+class DetectorSnapshot(Base):
+    """Serialized detector state, so online baselines survive restarts."""
+    
+    __tablename__ = "detector_snapshots"
+    
+    name = Column(String(64), primary_key=True, nullable=False)
+    payload = Column(LargeBinary, nullable=False)
+    updated_at_utc = Column(TIMESTAMP(timezone=True), nullable=False)
@@ -0,0 +1,15 @@
+"""Rollup watermark model."""
+
+from sqlalchemy import Column, String
+from sqlalchemy.dialects.postgresql import TIMESTAMP
+
+from ..core.db import Base
+
+
+class RollupWatermark(Base):
+    """Progress marker for a coarse bucket size derived from a finer one."""
+    
+    __tablename__ = "rollup_watermarks"
+    
+    bucket_size = Column(String(10), primary_key=True, nullable=False)  # Target size (5m, 60m)
+    watermark_utc = Column(TIMESTAMP(timezone=True), nullable=False)  # Buckets before this are finalized
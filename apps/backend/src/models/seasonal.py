@@ -0,0 +1,20 @@
+"""Seasonal baseline profile model."""
+
+from sqlalchemy import Column, String, LargeBinary
+from sqlalchemy.dialects.postgresql import TIMESTAMP
+
+from ..core.db import Base
+
+
+class SeasonalProfile(Base):
+    """Per-series hour-of-week baseline (168 slots packed as arrays)."""
+    
+    __tablename__ = "seasonal_profiles"
+    
+    bucket_size = Column(String(10), primary_key=True, nullable=False)
+    topic = Column(String(50), primary_key=True, nullable=False)
+    source = Column(String(255), primary_key=True, nullable=False, default="")  # Empty string for aggregate
+    expected = Column(LargeBinary, nullable=False)  # float32[168] median per slot
+    scale = Column(LargeBinary, nullable=False)  # float32[168] MAD (or stddev fallback) per slot
+    samples = Column(LargeBinary, nullable=False)  # uint16[168] buckets behind each slot
+    through_utc = Column(TIMESTAMP(timezone=True), nullable=False)  # Hours before this are folded in
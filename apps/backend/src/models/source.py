@@ -17,4 +17,8 @@ class Source(Base):
     url_or_id = Column(TEXT, nullable=False, unique=True)
     topic = Column(String(50), nullable=True)  # environment, politics, humanity, or NULL
     enabled = Column(Boolean, nullable=False, default=True, index=True)
-
+    
+    # HTTP cache validators from the last successful fetch (RSS only)
+    etag = Column(String(512), nullable=True)
+    last_modified = Column(String(64), nullable=True)
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of body, fallback when server sends no validators
@@ -2,6 +2,7 @@
 
 from .time import now_utc, parse_iso8601, to_ist, bucket_start, bucket_size_to_minutes
 from .dedupe import normalize_url, dedupe_urls
+from .ratelimit import AsyncTokenBucket
 
 __all__ = [
     "now_utc",
@@ -11,5 +12,6 @@ __all__ = [
     "bucket_size_to_minutes",
     "normalize_url",
     "dedupe_urls",
+    "AsyncTokenBucket",
 ]
 
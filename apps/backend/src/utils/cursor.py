@@ -0,0 +1,67 @@
+"""Opaque pagination and change cursors."""
+
+import base64
+from datetime import datetime
+from typing import Tuple, Union
+
+from .time import parse_iso8601, UTC
+
+
+def _encode(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode(token: str) -> str:
+    return base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+
+
+def _isoformat(dt: datetime) -> str:
+    if dt.tzinfo is None:
+        dt = UTC.localize(dt)
+    return dt.astimezone(UTC).isoformat()
+
+
+def encode_cursor(published_at: datetime, row_id: int) -> str:
+    """Encode a (timestamp, id) keyset position as a URL-safe token."""
+    return _encode(f"{_isoformat(published_at)}|{row_id}")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a token from encode_cursor().
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        timestamp, row_id = _decode(cursor).rsplit("|", 1)
+        return parse_iso8601(timestamp), int(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def encode_change_cursor(position: Union[int, datetime]) -> str:
+    """Encode a change-feed position: a row id or an updated_at timestamp."""
+    if isinstance(position, datetime):
+        return _encode(f"t:{_isoformat(position)}")
+    return _encode(f"i:{int(position)}")
+
+
+def decode_change_cursor(cursor: str, kind: type) -> Union[int, datetime]:
+    """Decode a token from encode_change_cursor().
+    
+    Args:
+        cursor: Change cursor
+        kind: Expected position type (int or datetime)
+    
+    Raises:
+        ValueError: If the cursor is malformed or of another kind
+    """
+    try:
+        prefix, value = _decode(cursor).split(":", 1)
+        if prefix == "i" and kind is int:
+            return int(value)
+        if prefix == "t" and kind is datetime:
+            return parse_iso8601(value)
+    except Exception:
+        pass
+    raise ValueError(f"Invalid change cursor: {cursor!r}")
@@ -0,0 +1,39 @@
+"""Async rate limiting utilities."""
+
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    """Token bucket shared by concurrent coroutines.
+    
+    Tokens refill continuously at `rate` per second up to `capacity`;
+    acquire() waits until enough tokens are available.
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        """Initialize bucket (starts full)."""
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until `tokens` are available and consume them.
+        
+        Requests larger than the capacity wait for a full bucket and leave it
+        in debt, so later callers pay for the overdraft.
+        """
+        needed = min(tokens, self.capacity)
+        async with self._lock:  # Serve waiters in arrival order
+            self._refill()
+            while self._tokens < needed:
+                await asyncio.sleep((needed - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
@@ -0,0 +1,43 @@
+"""Shared test fixtures."""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.core.db import Base
+import src.models  # noqa: F401  (register tables)
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    """SQLite file shared by the sync and asyncio fixtures."""
+    return f"sqlite:///{tmp_path / 'test.db'}"
+
+
+@pytest.fixture
+def db(db_url):
+    """SQLite session with all tables created."""
+    engine = create_engine(db_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def async_sessions(db, db_url):
+    """AsyncSession factory over the same database as `db`.
+    
+    Tests open one session per route call, as a request would, so the
+    sync session can keep writing between calls.
+    """
+    engine = create_async_engine(db_url.replace("sqlite://", "sqlite+aiosqlite://", 1))
+    try:
+        yield async_sessionmaker(engine, expire_on_commit=False)
+    finally:
+        await engine.dispose()
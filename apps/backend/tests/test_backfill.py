@@ -0,0 +1,70 @@
+"""Tests for historical anomaly backfill."""
+
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+
+from src.analytics.anomaly import compute_baseline, is_anomaly
+from src.analytics.backfill import backfill_anomalies, rolling_scores
+from src.models import Anomaly, Count
+from src.utils.time import UTC
+
+
+START = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def test_rolling_scores_match_scalar_baseline():
+    """Test that every rolling window scores like compute_baseline/is_anomaly."""
+    rng = np.random.default_rng(11)
+    values = rng.poisson(4, size=(3, 80)).astype(float)
+    values[rng.random(values.shape) < 0.3] = np.nan
+    values[1, 20:50] = 2.0  # Flat stretch takes the stddev/zscore path
+    window = 24
+    
+    scores = rolling_scores(values, window)
+    for row in range(values.shape[0]):
+        for col in range(scores["observed"].shape[1]):
+            series = [v for v in values[row, col:col + window] if not np.isnan(v)]
+            if len(series) < 2 or np.isnan(values[row, col + window - 1]):
+                continue
+            expected, mad = compute_baseline(series)
+            _, deviation = is_anomaly(series[-1], expected, mad)
+            assert scores["points"][row, col] == len(series)
+            assert scores["expected"][row, col] == pytest.approx(expected)
+            assert scores["deviation"][row, col] == pytest.approx(deviation)
+
+
+def test_backfill_is_idempotent(db):
+    """Test that historical spikes are recorded once across repeated runs."""
+    spikes = {100, 250}
+    for minute in range(400):
+        count = 40 if minute in spikes else 5 + minute % 3
+        for source in ("", "A"):
+            db.add(Count(
+                bucket_start_utc=START + timedelta(minutes=minute),
+                bucket_size="1m", topic="politics", source=source, count=count,
+            ))
+    db.commit()
+    
+    since, until = START + timedelta(minutes=50), START + timedelta(minutes=400)
+    stats = backfill_anomalies(db, since=since, until=until, window_buckets=60)
+    
+    assert stats["series"] == 3  # politics/"", politics/A, all/A
+    assert stats["anomalies"] == stats["inserted"] == 6
+    minutes = {int((a.bucket_start_utc.replace(tzinfo=UTC) - START).total_seconds() // 60) for a in db.query(Anomaly).all()}
+    assert minutes == spikes
+    
+    again = backfill_anomalies(db, since=since, until=until, window_buckets=60)
+    assert again["inserted"] == 0
+    
+    # Another detector's anomaly in the range survives a replace
+    db.add(Anomaly(
+        bucket_start_utc=START + timedelta(minutes=300), bucket_size="1m", topic="politics", source="",
+        observed=9, expected=5.0, deviation=5.0, method="ewma",
+    ))
+    db.commit()
+    
+    # Re-scoring with a stricter threshold replaces the range
+    rescored = backfill_anomalies(db, since=since, until=until, window_buckets=60, threshold=50, replace=True)
+    assert rescored["deleted"] == 6
+    assert [a.method for a in db.query(Anomaly).all()] == ["ewma"]
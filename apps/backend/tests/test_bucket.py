@@ -0,0 +1,84 @@
+"""Tests for count aggregation."""
+
+from datetime import datetime, timedelta
+
+from src.analytics.bucket import aggregate_new_articles
+from src.models import Count
+from src.utils.time import UTC
+
+
+def article(minute: int, source: str = "A", topic: str = "politics", hours_ago: int = 0) -> dict:
+    published = datetime(2024, 1, 1, 12, minute, 30, tzinfo=UTC) - timedelta(hours=hours_ago)
+    return {"published_at_utc": published, "topic": topic, "source": source}
+
+
+def count_for(db, source: str, minute: int, hours_ago: int = 0) -> int:
+    bucket = datetime(2024, 1, 1, 12, minute) - timedelta(hours=hours_ago)
+    row = db.query(Count).filter(
+        Count.bucket_size == "1m",
+        Count.source == source,
+        Count.bucket_start_utc == bucket,
+    ).one()
+    return row.count
+
+
+def test_aggregate_new_articles_applies_deltas(db):
+    """Test that repeated calls add to existing buckets."""
+    aggregate_new_articles(db, [article(0, "A"), article(0, "B")])
+    aggregate_new_articles(db, [article(0, "A"), article(1, "A")])
+    
+    assert count_for(db, "A", 0) == 2
+    assert count_for(db, "B", 0) == 1
+    assert count_for(db, "", 0) == 3  # Aggregate row
+    assert count_for(db, "", 1) == 1
+
+
+def test_aggregate_new_articles_late_arrivals(db):
+    """Test that articles older than the rescan window still update their bucket."""
+    aggregate_new_articles(db, [article(5, hours_ago=6)])
+    aggregate_new_articles(db, [article(5, hours_ago=6)])
+    
+    assert count_for(db, "", 5, hours_ago=6) == 2
+
+
+def test_aggregate_new_articles_returns_updated_rows(db):
+    """Test that final counts are returned for downstream consumers."""
+    aggregate_new_articles(db, [article(0)])
+    updated = aggregate_new_articles(db, [article(0)])
+    
+    assert sorted((row["source"], row["count"]) for row in updated) == [("", 2), ("A", 2)]
+
+
+def test_aggregate_counts_sql_matches_incremental(db):
+    """Test that the SQL engine produces the same buckets as the Python deltas."""
+    from src.analytics.bucket import aggregate_counts_sql
+    from src.models import Article
+    
+    articles = [article(0, "A"), article(0, "B"), article(1, "A", "environment"), article(7, "B")]
+    for n, row in enumerate(articles):
+        db.add(Article(
+            title=f"t{n}", url=f"https://example.com/{n}", source_type="rss",
+            fetched_at_utc=row["published_at_utc"], **row
+        ))
+    db.commit()
+    
+    expected = {
+        (r["bucket_start_utc"], r["topic"], r["source"]): r["count"]
+        for r in aggregate_new_articles(db, articles, bucket_size="5m")
+    }
+    db.query(Count).delete()
+    db.commit()
+    
+    rows = aggregate_counts_sql(
+        db, bucket_size="5m",
+        since=datetime(2024, 1, 1, 11, 0, tzinfo=UTC),
+        until=datetime(2024, 1, 1, 13, 0, tzinfo=UTC),
+    )
+    stored = {(c.bucket_start_utc, c.topic, c.source): c.count for c in db.query(Count).all()}
+    
+    assert len(rows) == len(expected)
+    assert stored == expected
+    
+    # Re-running is idempotent
+    aggregate_counts_sql(db, bucket_size="5m", since=datetime(2024, 1, 1, 11, 0, tzinfo=UTC))
+    assert {(c.bucket_start_utc, c.topic, c.source): c.count for c in db.query(Count).all()} == expected
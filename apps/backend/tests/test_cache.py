@@ -0,0 +1,81 @@
+"""Tests for the response cache middleware."""
+
+import asyncio
+import pytest
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from src.core.cache import ResponseCacheMiddleware, get_response_cache
+
+
+@pytest.fixture
+def cache_app():
+    """App with a slow cached endpoint that counts its executions."""
+    get_response_cache.cache_clear()
+    app = FastAPI()
+    app.add_middleware(ResponseCacheMiddleware)
+    calls = {"sources": 0, "anomalies": 0}
+    
+    @app.get("/api/sources")
+    async def sources(name: str = ""):
+        calls["sources"] += 1
+        await asyncio.sleep(0.05)
+        return {"items": [name], "version": calls["sources"] // 6}
+    
+    @app.get("/api/anomalies")
+    async def anomalies():
+        calls["anomalies"] += 1
+        raise HTTPException(status_code=503, detail="unavailable")
+    
+    yield app, calls
+    get_response_cache.cache_clear()
+
+
+def client(app) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_single_flight_and_etag(cache_app):
+    """Test that concurrent misses share one computation and revalidation returns 304."""
+    app, calls = cache_app
+    async with client(app) as http:
+        responses = await asyncio.gather(*[http.get("/api/sources?name=a") for _ in range(20)])
+        assert calls["sources"] == 1
+        assert {r.status_code for r in responses} == {200}
+        etag = responses[0].headers["etag"]
+        assert etag.startswith('"') and {r.headers["etag"] for r in responses} == {etag}
+        
+        # Parameter order doesn't split the cache; an empty value is its own query
+        await http.get("/api/sources?name=a&page=2")
+        assert (await http.get("/api/sources?page=2&name=a")).headers["etag"] == etag
+        assert calls["sources"] == 2
+        await http.get("/api/sources?name=")
+        await http.get("/api/sources")
+        assert calls["sources"] == 4
+        
+        not_modified = await http.get("/api/sources?name=a", headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304 and not_modified.content == b""
+        
+        # A new generation recomputes; an identical body keeps its ETag
+        get_response_cache().bump()
+        again = await http.get("/api/sources?name=a", headers={"If-None-Match": etag})
+        assert calls["sources"] == 5 and again.status_code == 304
+        
+        get_response_cache().bump()
+        await http.get("/api/sources?name=a")
+        changed = await http.get("/api/sources?name=a", headers={"If-None-Match": etag})
+        assert calls["sources"] == 6 and changed.status_code == 200
+        assert changed.json() == {"items": ["a"], "version": 1}
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached(cache_app):
+    """Test that error responses pass through and are recomputed."""
+    app, calls = cache_app
+    async with client(app) as http:
+        for _ in range(2):
+            response = await http.get("/api/anomalies")
+            assert response.status_code == 503
+            assert "etag" not in response.headers
+    assert calls["anomalies"] == 2
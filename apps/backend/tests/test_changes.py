@@ -0,0 +1,135 @@
+"""Tests for change cursors on the polling endpoints."""
+
+import orjson
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from starlette.responses import Response
+
+import src.analytics.bucket as bucket_module
+from src.analytics.bucket import aggregate_counts_sql, aggregate_new_articles
+from src.core.config import get_settings
+from src.api.routes_aggregate import get_aggregate
+from src.api.routes_anomalies import get_anomalies
+from src.api.routes_news import get_news
+from src.models import Anomaly, Article, Count
+from src.utils.cursor import decode_change_cursor, encode_change_cursor
+from src.utils.time import now_utc, parse_iso8601, UTC
+
+
+async def call(sessions, route, **params):
+    """Call a read route with a fresh AsyncSession, as a request would.
+    
+    Routes that encode their own response are decoded back to dicts.
+    """
+    async with sessions() as session:
+        result = await route(db=session, **params)
+    return orjson.loads(result.body) if isinstance(result, Response) else result
+
+
+def add_articles(db, n: int, start: int = 0) -> list:
+    published = now_utc() - timedelta(minutes=10)
+    articles = [
+        Article(
+            source="bbc", source_type="rss", title=f"Story {i}", url=f"https://example.com/{i}",
+            topic="politics", published_at_utc=published + timedelta(minutes=i % 3), fetched_at_utc=published,
+        )
+        for i in range(start, start + n)
+    ]
+    db.add_all(articles)
+    db.commit()
+    return articles
+
+
+def test_change_cursor_kinds():
+    """Test that id and timestamp cursors round-trip and aren't interchangeable."""
+    dt = datetime(2024, 3, 1, 9, 30, tzinfo=UTC)
+    assert decode_change_cursor(encode_change_cursor(42), int) == 42
+    assert decode_change_cursor(encode_change_cursor(dt), datetime) == dt
+    with pytest.raises(ValueError):
+        decode_change_cursor(encode_change_cursor(42), datetime)
+
+
+def test_count_updated_at_moves_only_on_change(db):
+    """Test that recomputing a bucket to the same count keeps its updated_at."""
+    add_articles(db, 6)
+    since = now_utc() - timedelta(hours=1)
+    aggregate_counts_sql(db, since=since)
+    first = {(c.bucket_start_utc, c.source): c.updated_at_utc for c in db.query(Count)}
+    assert all(first.values())
+    
+    aggregate_counts_sql(db, since=since)
+    db.expire_all()
+    assert {(c.bucket_start_utc, c.source): c.updated_at_utc for c in db.query(Count)} == first
+
+
+@pytest.mark.asyncio
+async def test_aggregate_changes_since(db, async_sessions, monkeypatch):
+    """Test that a delta poll returns only buckets whose count changed."""
+    monkeypatch.setattr(get_settings(), "change_cursor_lag_seconds", 0)
+    articles = add_articles(db, 6)
+    aggregate_new_articles(db, [
+        {"published_at_utc": a.published_at_utc, "topic": a.topic, "source": a.source} for a in articles
+    ])
+    params = dict(bucket_size="1m", topic=None, source=None, since=None, fmt="rows")
+    
+    full = await call(async_sessions, get_aggregate, changes_since=None, **params)
+    assert len(full["buckets"]) == 3
+    
+    unchanged = await call(async_sessions, get_aggregate, changes_since=full["change_cursor"], **params)
+    assert unchanged["buckets"] == []
+    
+    late = add_articles(db, 1, start=100)[0]
+    aggregate_new_articles(db, [{"published_at_utc": late.published_at_utc, "topic": "politics", "source": "bbc"}])
+    delta = await call(async_sessions, get_aggregate, changes_since=full["change_cursor"], **params)
+    assert [(parse_iso8601(b["bucket_start_utc"]), b["count"]) for b in delta["buckets"]] == [
+        (late.published_at_utc.replace(second=0, microsecond=0, tzinfo=UTC), 3)
+    ]
+    
+    again = await call(async_sessions, get_aggregate, changes_since=delta["change_cursor"], **params)
+    assert again["buckets"] == []
+    
+    with pytest.raises(HTTPException):
+        await call(async_sessions, get_aggregate, changes_since=encode_change_cursor(5), **params)
+
+
+@pytest.mark.asyncio
+async def test_aggregate_cursor_covers_late_commits(db, async_sessions, monkeypatch):
+    """Test that counts stamped before a cursor was handed out but committed after it are delivered."""
+    monkeypatch.setattr(get_settings(), "change_cursor_lag_seconds", 60)
+    params = dict(bucket_size="1m", topic=None, source=None, since=None, fmt="rows")
+    full = await call(async_sessions, get_aggregate, changes_since=None, **params)
+    
+    # A slower writer stamped its rows 30s ago and only commits now
+    stamped = now_utc() - timedelta(seconds=30)
+    monkeypatch.setattr(bucket_module, "now_utc", lambda: stamped)
+    article = add_articles(db, 1)[0]
+    aggregate_new_articles(db, [{"published_at_utc": article.published_at_utc, "topic": "politics", "source": "bbc"}])
+    
+    delta = await call(async_sessions, get_aggregate, changes_since=full["change_cursor"], **params)
+    assert [b["count"] for b in delta["buckets"]] == [1]
+
+
+@pytest.mark.asyncio
+async def test_news_and_anomalies_changes_since(db, async_sessions):
+    """Test that id-based delta polls return only newly inserted rows."""
+    add_articles(db, 5)
+    news_params = dict(topic=None, source=None, since=None, limit=3, cursor=None, offset=0, include_total=False)
+    page = await call(async_sessions, get_news, changes_since=None, **news_params)
+    
+    assert (await call(async_sessions, get_news, changes_since=page["change_cursor"], **news_params))["items"] == []
+    new = add_articles(db, 4, start=5)
+    delta = await call(async_sessions, get_news, changes_since=page["change_cursor"], **news_params)
+    assert [a["id"] for a in delta["items"]] == [a.id for a in new[:3]]
+    delta = await call(async_sessions, get_news, changes_since=delta["change_cursor"], **news_params)
+    assert [a["id"] for a in delta["items"]] == [new[3].id]
+    
+    anomaly_params = dict(topic=None, source=None, since=None, bucket_size=None, limit=10)
+    listing = await call(async_sessions, get_anomalies, changes_since=None, **anomaly_params)
+    db.add(Anomaly(
+        bucket_start_utc=now_utc(), bucket_size="1m", topic="politics", source="",
+        observed=40, expected=5.0, deviation=8.0, method="mad", created_at_utc=now_utc(),
+    ))
+    db.commit()
+    delta = await call(async_sessions, get_anomalies, changes_since=listing.change_cursor, **anomaly_params)
+    assert [(a.topic, a.observed) for a in delta.items] == [("politics", 40)] and delta.total == 1
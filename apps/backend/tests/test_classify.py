@@ -52,3 +52,35 @@ def test_classify_source_hint():
     
     assert topic == "environment"
 
+
+
+def test_classify_word_boundaries():
+    """Test that keywords don't match inside longer words."""
+    classifier = TopicClassifier()
+    
+    # "act" is a politics keyword; "impact" must not count
+    assert classifier.score("Storm impact assessment")[1] == 0
+    assert classifier.score("Senate passes new act")[1] == 2
+
+
+def test_classify_plurals_and_phrases():
+    """Test plural keywords and multi-word phrases."""
+    classifier = TopicClassifier()
+    
+    assert classifier.classify("Protests spread after elections") == "politics"
+    assert classifier.score("Climate change talks")[0] == 1  # "climate change" consumes both tokens
+    
+    # Politics "human rights violation" wins over the humanity "human rights" and "rights" inside it
+    assert classifier.classify("UN report on human rights violation in region") == "politics"
+
+
+def test_classify_many():
+    """Test batch classification."""
+    classifier = TopicClassifier()
+    
+    topics = classifier.classify_many(
+        ["Refugee camps overcrowded", "Wildfire spreads", "Generic news"],
+        source_topics=[None, None, "politics"],
+    )
+    
+    assert topics == ["humanity", "environment", "politics"]
@@ -0,0 +1,133 @@
+"""Tests for pluggable anomaly detectors."""
+
+import math
+import pytest
+import numpy as np
+from datetime import timedelta
+
+from src.analytics.anomaly import detect_anomalies, score_matrix
+from src.analytics.detectors import (
+    DETECTORS, assign_detectors, get_detector, poisson_log10_tail, score_series, validate_detector_settings,
+)
+from src.analytics.store import TimeSeriesStore
+from src.models import Anomaly, Count
+from src.utils.time import bucket_start, now_utc
+
+
+def poisson_tail(k: int, lam: float) -> float:
+    """Reference tail probability on k's side of the mean."""
+    pmf = lambda i: math.exp(i * math.log(lam) - lam - math.lgamma(i + 1))
+    if k >= lam:
+        return 1.0 - sum(pmf(i) for i in range(k))
+    return sum(pmf(i) for i in range(k + 1))
+
+
+def test_poisson_tail_matches_reference():
+    """Test the log-space tail against direct summation, including tiny probabilities."""
+    cases = [(0, 0.5), (1, 0.5), (3, 0.5), (2, 4.0), (9, 4.0), (30, 20.0), (120, 100.0)]
+    k = np.array([c[0] for c in cases], dtype=float)
+    lam = np.array([c[1] for c in cases])
+    expected = [math.log10(poisson_tail(*c)) for c in cases]
+    np.testing.assert_allclose(poisson_log10_tail(k, lam), expected, rtol=1e-6)
+    
+    # Far beyond 1 - cdf precision
+    assert poisson_log10_tail(np.array([40.0]), np.array([0.5]))[0] == pytest.approx(-60.16, abs=0.01)
+
+
+def test_detectors_share_interface():
+    """Test that every detector scores the latest present bucket of each row."""
+    rng = np.random.default_rng(0)
+    values = rng.poisson(5, size=(4, 60)).astype(float)
+    values[1, -3:] = np.nan  # Latest bucket is earlier for this row
+    values[2, -1] = 40  # Spike
+    
+    for name in DETECTORS:
+        scores = get_detector(name).score(values)
+        np.testing.assert_array_equal(scores["latest"], [59, 56, 59, 59])
+        assert scores["observed"][2] == 40
+        assert scores["deviation"][2] >= 4.0, name
+        assert np.all(scores["deviation"][[0, 1, 3]] < 4.0), name
+        assert set(scores["method"]) <= {name, "zscore"}
+    
+    np.testing.assert_allclose(get_detector("mad").score(values)["deviation"], score_matrix(values)["deviation"])
+    with pytest.raises(ValueError):
+        get_detector("prophet")
+
+
+def test_poisson_handles_low_volume_series():
+    """Test that Poisson flags a burst on a near-silent series without flagging single events."""
+    # Empty buckets have no counts row, so they arrive as NaN
+    quiet = np.full((3, 60), np.nan)
+    quiet[:, ::10] = 1
+    quiet[0, -1] = 2
+    quiet[1, -1] = 6
+    quiet[2, -1] = 4
+    
+    scores = get_detector("poisson").score(quiet)
+    assert scores["expected"][2] == pytest.approx(6 / 59)
+    assert scores["deviation"][0] < 4.0
+    assert scores["deviation"][1] >= 4.0
+    assert scores["deviation"][2] == pytest.approx(5.39, abs=0.05)
+    np.testing.assert_array_equal(scores["points"], [7, 7, 7])
+    
+    # Leading absent buckets are outside the series' span and stay unknown
+    late_start = quiet[2:].copy()
+    late_start[0, :30] = np.nan
+    assert get_detector("poisson").score(late_start)["expected"][0] == pytest.approx(3 / 29)
+    
+    # EWMA and CUSUM also see the empty buckets as zeros
+    for name in ("ewma", "cusum"):
+        assert get_detector(name).score(quiet)["expected"][2] < 0.5, name
+
+
+def test_cusum_flags_sustained_shift():
+    """Test that CUSUM accumulates a small shift that MAD misses, and alarms once."""
+    values = np.tile([10.0, 12.0, 11.0, 9.0], 15)[None, :]
+    values[0, -8:] += 2.5
+    assert get_detector("cusum").score(values[:, :-2])["deviation"][0] >= 4.0
+    assert score_matrix(values[:, :-2])["deviation"][0] < 4.0
+    
+    # Reset after crossing, so the following bucket doesn't re-alarm
+    assert get_detector("cusum").score(values[:, :-1])["deviation"][0] < 4.0
+
+
+def test_score_series_groups_by_topic():
+    """Test per-topic assignment and merged scores."""
+    keys = [("politics", ""), ("humanity", ""), ("humanity", "bbc")]
+    names = assign_detectors(keys, "mad", {"humanity": "poisson"})
+    assert names.tolist() == ["mad", "poisson", "poisson"]
+    
+    values = np.random.default_rng(1).poisson(3, size=(3, 30)).astype(float)
+    scores = score_series(values, names)
+    np.testing.assert_allclose(scores["deviation"][1:], get_detector("poisson").score(values[1:])["deviation"])
+    assert scores["method"].tolist()[1:] == ["poisson", "poisson"]
+
+
+def test_detect_anomalies_per_topic_detector(db):
+    """Test that topic overrides change which series are flagged and the recorded method."""
+    current = bucket_start(now_utc(), 1)
+    # Only non-empty buckets get rows, as in production
+    for minutes_ago, count in [(29, 1), (19, 1), (9, 1), (0, 6)]:
+        db.add(Count(
+            bucket_start_utc=current - timedelta(minutes=minutes_ago),
+            bucket_size="1m", topic="humanity", source="", count=count,
+        ))
+    db.commit()
+    
+    store = TimeSeriesStore(capacity=60)
+    assert detect_anomalies(db, window_buckets=60, store=store) == 0  # Too few rows for MAD
+    assert detect_anomalies(
+        db, window_buckets=60, store=store, topic_detectors={"humanity": "poisson"}
+    ) == 1
+    assert db.query(Anomaly).one().method == "poisson"
+
+
+def test_validate_detector_settings():
+    """Test that unknown detector or topic names are rejected up front."""
+    validate_detector_settings("mad", {"humanity": "poisson", "politics": "ewma"})
+    with pytest.raises(ValueError):
+        validate_detector_settings("prophet", {})
+    with pytest.raises(ValueError):
+        validate_detector_settings("mad", {"humanity": "prophet"})
+    with pytest.raises(ValueError):
+        validate_detector_settings("mad", {"science": "poisson"})
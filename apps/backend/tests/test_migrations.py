@@ -0,0 +1,52 @@
+"""Tests for startup schema upgrades."""
+
+import shutil
+from pathlib import Path
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from src.core.db import Base
+from src.core.migrations import upgrade_schema
+from src.models import Anomaly, Count, Source
+
+CHECKED_IN_DB = Path(__file__).resolve().parents[1] / "pulsewatch.db"
+
+
+def test_upgrade_checked_in_database(tmp_path):
+    """Test that the shipped database is upgraded in place and stays queryable."""
+    path = tmp_path / "pulsewatch.db"
+    shutil.copy(CHECKED_IN_DB, path)
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        with engine.begin() as conn:
+            # A duplicate that would block the unique constraint
+            conn.execute(text(
+                "INSERT INTO anomalies (bucket_start_utc, bucket_size, topic, observed, expected, "
+                "deviation, method, created_at_utc) SELECT bucket_start_utc, bucket_size, topic, "
+                "observed, expected, deviation, method, created_at_utc FROM anomalies WHERE id = 1"
+            ))
+        
+        Base.metadata.create_all(bind=engine)
+        assert upgrade_schema(engine) == ["source_validators", "anomaly_sources", "count_change_times"]
+        assert upgrade_schema(engine) == []
+        
+        indexes = {index["name"] for index in inspect(engine).get_indexes("anomalies")}
+        assert "idx_anomalies_bucket" not in indexes
+        assert {"uq_anomalies_bucket", "ix_anomalies_source"} <= indexes
+        assert "idx_counts_size_updated" in {index["name"] for index in inspect(engine).get_indexes("counts")}
+        
+        db = sessionmaker(bind=engine)()
+        try:
+            sources = db.query(Source).all()
+            assert len(sources) == 13 and all(source.etag is None for source in sources)
+            assert [(a.id, a.source) for a in db.query(Anomaly).order_by(Anomaly.id)] == [(1, ""), (2, "")]
+            assert db.query(Count).filter(Count.updated_at_utc.isnot(None)).count() == 0
+        finally:
+            db.close()
+    finally:
+        engine.dispose()
+
+
+def test_fresh_database_needs_no_upgrade(db):
+    """Test that tables created from the models are already current."""
+    assert upgrade_schema(db.get_bind()) == []
@@ -0,0 +1,80 @@
+"""Tests for online sliding-window baselines."""
+
+import pytest
+import numpy as np
+from datetime import timedelta
+
+from src.analytics.anomaly import compute_baseline
+from src.analytics.online import (
+    OnlineBaseline,
+    SeriesWindow,
+    detect_anomalies_online,
+    load_snapshot,
+    save_snapshot,
+)
+from src.analytics.store import TimeSeriesStore
+from src.models import Anomaly
+from src.utils.time import bucket_start, now_utc
+
+
+def test_series_window_matches_compute_baseline():
+    """Test sliding median/MAD against a full recompute, including revisions and gaps."""
+    rng = np.random.default_rng(3)
+    window = SeriesWindow(window=30)
+    reference = {}
+    index = 0
+    for _ in range(300):
+        index += int(rng.integers(1, 3))  # Occasional missing buckets
+        value = int(rng.poisson(rng.choice([0.3, 4, 25])))
+        window.update(index, value)
+        reference[index] = value
+        if rng.random() < 0.3:  # Open bucket revised by a later cycle
+            reference[index] = value + 2
+            window.update(index, value + 2)
+        
+        series = [reference[i] for i in sorted(reference) if i > index - 30]
+        expected, mad = compute_baseline(series)
+        online_expected, online_mad = window.baseline()
+        assert online_expected == pytest.approx(expected)
+        assert online_mad == pytest.approx(mad)
+
+
+def test_snapshot_round_trip(db):
+    """Test that baselines survive a save/load through the database."""
+    baseline = OnlineBaseline(window=20)
+    for index in range(50):
+        baseline.update(("1m", "politics", ""), index, index % 7)
+        baseline.update(("1m", "all", "A"), index, 3)
+    save_snapshot(db, baseline)
+    
+    restored = load_snapshot(db)
+    assert restored.window == 20
+    for key, series in baseline.series.items():
+        assert list(restored.series[key].indexes) == list(series.indexes)
+        assert restored.series[key].baseline() == series.baseline()
+
+
+def test_detect_anomalies_online_flags_spike(db):
+    """Test that a spike in upserted rows is flagged against the sliding baseline."""
+    current = bucket_start(now_utc(), 1)
+    store = TimeSeriesStore(capacity=60)
+    baseline = OnlineBaseline(window=60)
+    
+    def rows(minutes_ago: int, count: int) -> list:
+        start = current - timedelta(minutes=minutes_ago)
+        return [
+            {"bucket_start_utc": start, "bucket_size": "1m", "topic": "politics", "source": source, "count": count}
+            for source in ("", "A")
+        ]
+    
+    for minutes_ago in range(30, 0, -1):
+        batch = rows(minutes_ago, 5 + minutes_ago % 2)
+        store.update(batch)
+        assert detect_anomalies_online(db, baseline, batch, store=store) == 0
+    
+    spike = rows(0, 40)
+    store.update(spike)
+    assert detect_anomalies_online(db, baseline, spike, store=store) == 3
+    assert {(a.topic, a.source) for a in db.query(Anomaly).all()} == {
+        ("politics", ""), ("politics", "A"), ("all", "A")
+    }
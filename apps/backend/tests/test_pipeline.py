@@ -0,0 +1,224 @@
+"""Tests for the streaming ingestion pipeline."""
+
+import asyncio
+import threading
+import time
+import pytest
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from sqlalchemy.orm import sessionmaker
+
+import src.ingest.pipeline as pipeline_module
+from src.core.config import get_settings
+from src.ingest.pipeline import IngestionPipeline
+from src.analytics.store import TimeSeriesStore
+from src.ingest.schedule import AdaptivePollScheduler
+from src.ingest.seen import SeenURLIndex
+from src.models import Article, Count, Source
+from src.utils.dedupe import normalize_url
+
+
+def make_feed(prefix: str, n: int) -> bytes:
+    published = format_datetime(datetime.now(timezone.utc), usegmt=True)
+    items = "".join(
+        f"<item><title>Election update {prefix} {i}</title>"
+        f"<link>https://example.com/{prefix}/{i}</link>"
+        f"<pubDate>{published}</pubDate></item>"
+        for i in range(n)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel>{items}</channel></rss>'.encode()
+
+
+@pytest.mark.asyncio
+async def test_run_cycle_streams_sources(db, monkeypatch):
+    """Test that fast sources are written while a slow source is still in flight."""
+    fast_written = asyncio.Event()
+    
+    async def fast(request):
+        return web.Response(body=make_feed("fast", 3), content_type="application/rss+xml")
+    
+    async def slow(request):
+        # Only answer once the fast feed has reached the database
+        await asyncio.wait_for(fast_written.wait(), timeout=5)
+        return web.Response(body=make_feed("slow", 2), content_type="application/rss+xml")
+    
+    app = web.Application()
+    app.router.add_get("/fast", fast)
+    app.router.add_get("/slow", slow)
+    server = TestServer(app)
+    await server.start_server()
+    
+    db.add_all([
+        Source(name="Fast", type="rss", url_or_id=str(server.make_url("/fast"))),
+        Source(name="Slow", type="rss", url_or_id=str(server.make_url("/slow"))),
+    ])
+    db.commit()
+    monkeypatch.setattr(pipeline_module, "SessionLocal", sessionmaker(bind=db.get_bind()))
+    
+    pipeline = IngestionPipeline()
+    pipeline.seen_index = SeenURLIndex()
+    
+    original_publish = pipeline._publish_articles
+    
+    def publish(rows, limit):
+        if any(row["source"] == "Fast" for row in rows):
+            fast_written.set()
+        return original_publish(rows, limit)
+    
+    pipeline._publish_articles = publish
+    
+    try:
+        stats = await pipeline.run_cycle(force=True)
+    finally:
+        await pipeline.close()
+        await server.close()
+    
+    assert stats["errors"] == []
+    assert stats["total_new"] == 5
+    assert stats["rss_count"] == 5
+    assert db.query(Article).count() == 5
+    assert db.query(Count).filter(Count.source == "").count() > 0
+    assert set(stats["stages"]) == {"fetch", "parse", "classify", "write", "aggregate"}
+    assert stats["stages"]["write"]["items"] == 2
+    assert stats["stages"]["fetch"]["queue_depth"] == 0
+    db.expire_all()
+    assert all(source.content_hash for source in db.query(Source))
+
+
+@pytest.mark.asyncio
+async def test_failed_write_keeps_feed_refetchable(db, monkeypatch):
+    """Test that validators aren't persisted for a feed whose articles failed to write."""
+    async def feed(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(body=make_feed("a", 2), headers={"ETag": '"v1"'}, content_type="application/rss+xml")
+    
+    app = web.Application()
+    app.router.add_get("/feed", feed)
+    server = TestServer(app)
+    await server.start_server()
+    db.add(Source(name="Feed", type="rss", url_or_id=str(server.make_url("/feed"))))
+    db.commit()
+    monkeypatch.setattr(pipeline_module, "SessionLocal", sessionmaker(bind=db.get_bind()))
+    
+    def failing_flush(self):
+        raise RuntimeError("database unavailable")
+    
+    pipeline = IngestionPipeline()
+    pipeline.seen_index = SeenURLIndex()
+    try:
+        with monkeypatch.context() as patch:
+            patch.setattr(pipeline_module.ArticleWriter, "flush", failing_flush)
+            failed = await pipeline.run_cycle(force=True)
+        db.expire_all()
+        assert failed["errors"] and db.query(Source).one().etag is None
+        
+        retried = await pipeline.run_cycle(force=True)
+        assert retried["total_new"] == 2 and retried["not_modified"] == 0
+        db.expire_all()
+        assert db.query(Source).one().etag == '"v1"'
+        assert (await pipeline.run_cycle(force=True))["not_modified"] == 1
+    finally:
+        await pipeline.close()
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_reddit_without_credentials_backs_off(db, monkeypatch):
+    """Test that Reddit sources are recorded as polled when credentials are missing."""
+    db.add(Source(name="r/news", type="reddit_sub", url_or_id="news"))
+    db.commit()
+    monkeypatch.setattr(pipeline_module, "SessionLocal", sessionmaker(bind=db.get_bind()))
+    
+    pipeline = IngestionPipeline()
+    pipeline.seen_index = SeenURLIndex()
+    pipeline.reddit_ingester.reddit = None
+    pipeline.poll_scheduler = AdaptivePollScheduler(60, 3600)
+    try:
+        await pipeline.run_cycle()
+        source = db.query(Source).one()
+        assert pipeline.poll_scheduler.stats()[source.id]["polls"] == 1
+        assert pipeline.poll_scheduler.due([source]) == []
+    finally:
+        await pipeline.close()
+
+
+@pytest.mark.asyncio
+async def test_idle_tick_keeps_store_synced(db, monkeypatch):
+    """Test that a tick with no due sources still marks the time-series store synced."""
+    db.add(Source(name="Feed", type="rss", url_or_id="https://example.com/feed"))
+    db.commit()
+    monkeypatch.setattr(pipeline_module, "SessionLocal", sessionmaker(bind=db.get_bind()))
+    
+    pipeline = IngestionPipeline()
+    pipeline.seen_index = SeenURLIndex()
+    pipeline.timeseries_store = TimeSeriesStore(capacity=60, max_staleness=300)
+    pipeline.timeseries_store.warm(db, bucket_sizes=("1m",))
+    
+    # Five idle minutes later the source was just polled and isn't due yet
+    clock = [time.monotonic() + 301]
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+    pipeline.poll_scheduler = AdaptivePollScheduler(60, 3600)
+    pipeline.poll_scheduler.record(db.query(Source).one().id, 0)
+    assert pipeline.timeseries_store.is_stale("1m")
+    try:
+        stats = await pipeline.run_cycle()
+    finally:
+        await pipeline.close()
+    
+    assert stats["polled"] == 0
+    assert not pipeline.timeseries_store.is_stale("1m")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("reddit_async", [True, False])
+async def test_reddit_reports_inserted_rows(db, monkeypatch, reddit_async):
+    """Test that Reddit fetches run off the event loop and report rows the writer inserted."""
+    db.add(Source(name="r/news", type="reddit_sub", url_or_id="news"))
+    db.add(Article(
+        source="r/news", source_type="reddit_sub", title="Election news 0",
+        url=normalize_url("https://reddit.com/r/news/comments/0/post/"), topic="politics",
+        published_at_utc=datetime.now(timezone.utc), fetched_at_utc=datetime.now(timezone.utc),
+    ))
+    db.commit()
+    monkeypatch.setattr(pipeline_module, "SessionLocal", sessionmaker(bind=db.get_bind()))
+    monkeypatch.setattr(get_settings(), "reddit_async", reddit_async)
+    
+    pipeline = IngestionPipeline()
+    pipeline.seen_index = SeenURLIndex()
+    ingester = pipeline.reddit_ingester
+    ingester.reddit = client = object()
+    loop_thread = threading.current_thread()
+    fetches = []
+    
+    def fetch(source_type, name, limit, reddit=None):
+        fetches.append((threading.current_thread() is loop_thread, reddit))
+        return [
+            SimpleNamespace(
+                title=f"Election news {n}", permalink=f"/r/news/comments/{n}/post/", selftext="",
+                created_utc=1704110400 + n, author=None, score=1,
+                subreddit=SimpleNamespace(display_name="news"), num_comments=0, upvote_ratio=1.0,
+            )
+            for n in range(3)
+        ]
+    
+    ingester.fetch_submissions = fetch
+    results = []
+    ingest_sources_async = ingester.ingest_sources_async
+    
+    async def spy(*args, **kwargs):
+        results.extend(await ingest_sources_async(*args, **kwargs))
+        return results
+    
+    ingester.ingest_sources_async = spy
+    try:
+        stats = await pipeline.run_cycle(force=True)
+    finally:
+        await pipeline.close()
+    
+    assert stats["errors"] == [] and stats["reddit_count"] == 2
+    assert results == ([2] if reddit_async else [])
+    assert fetches == [(False, None if reddit_async else client)]
@@ -0,0 +1,126 @@
+"""Tests for async Reddit ingestion."""
+
+import asyncio
+import time
+import pytest
+from types import SimpleNamespace
+
+from src.ingest.reddit import RedditIngester
+from src.ingest.classify import TopicClassifier
+from src.ingest.seen import SeenURLIndex
+from src.models import Article, Source
+from src.utils.ratelimit import AsyncTokenBucket
+
+
+def make_submission(subreddit: str, n: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        title=f"Election news {n}",
+        permalink=f"/r/{subreddit}/comments/{n}/post/",
+        selftext="",
+        created_utc=1704110400 + n,
+        author=None,
+        score=10,
+        subreddit=SimpleNamespace(display_name=subreddit),
+        num_comments=1,
+        upvote_ratio=0.9,
+    )
+
+
+@pytest.mark.asyncio
+async def test_ingest_sources_async_runs_concurrently(db):
+    """Test that the Reddit phase takes about as long as the slowest fetch."""
+    ingester = RedditIngester(TopicClassifier(), SeenURLIndex())
+    ingester.reddit = object()  # Pretend credentials are configured
+    
+    def slow_fetch(source_type, name, limit):
+        time.sleep(0.2)
+        return [make_submission(name, n) for n in range(3)]
+    
+    ingester.fetch_submissions = slow_fetch
+    sources = [
+        Source(name=f"u/{name}", type="reddit_user", url_or_id=name)
+        for name in ["alice", "bob", "carol"]
+    ]
+    
+    start = time.perf_counter()
+    results = await ingester.ingest_sources_async(db, sources)
+    elapsed = time.perf_counter() - start
+    ingester.close()
+    
+    assert results == [3, 3, 3]
+    assert db.query(Article).count() == 9
+    assert elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_subreddits_share_combined_listing(db):
+    """Test that subreddits are fetched together and routed back by name."""
+    ingester = RedditIngester(TopicClassifier(), SeenURLIndex())
+    ingester.reddit = object()
+    calls = []
+    
+    def combined_fetch(source_type, name, limit):
+        calls.append((name, limit))
+        return [
+            make_submission("WorldNews", 1),
+            make_submission("politics", 2),
+            make_submission("politics", 3),
+            make_submission("unrelated", 4),
+        ]
+    
+    ingester.fetch_submissions = combined_fetch
+    sources = [
+        Source(name="World", type="reddit_sub", url_or_id="worldnews"),
+        Source(name="Politics", type="reddit_sub", url_or_id="politics"),
+    ]
+    
+    results = await ingester.ingest_sources_async(db, sources)
+    ingester.close()
+    
+    assert calls == [("worldnews+politics", 50)]
+    assert results == [1, 2]
+    assert {a.source for a in db.query(Article).all()} == {"World", "Politics"}
+
+
+@pytest.mark.asyncio
+async def test_busy_subreddit_does_not_starve_quiet_one(db):
+    """Test that a quiet subreddit crowded out of a full listing is topped up once."""
+    ingester = RedditIngester(TopicClassifier(), SeenURLIndex())
+    ingester.reddit = object()
+    calls = []
+    
+    def fetch(source_type, name, limit):
+        calls.append(name)
+        if name == "quiet":
+            return [make_submission("quiet", 1)]
+        # The busy subreddit fills the combined listing with newer posts
+        return [make_submission("busy", 1000 + len(calls) * 100 + n) for n in range(limit)]
+    
+    ingester.fetch_submissions = fetch
+    sources = [
+        Source(name="Busy", type="reddit_sub", url_or_id="busy"),
+        Source(name="Quiet", type="reddit_sub", url_or_id="quiet"),
+    ]
+    
+    assert await ingester.ingest_sources_async(db, sources) == [50, 1]
+    assert calls == ["busy+quiet", "quiet"]
+    
+    # The quiet subreddit's cursor is still older than the next full listing
+    calls.clear()
+    await ingester.ingest_sources_async(db, sources)
+    assert calls == ["busy+quiet", "quiet"]
+    ingester.close()
+    assert db.query(Article).filter(Article.source == "Quiet").count() == 1
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate():
+    """Test that requests beyond the burst wait for refill."""
+    bucket = AsyncTokenBucket(rate=20.0, capacity=2)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*[bucket.acquire() for _ in range(4)])
+    elapsed = time.perf_counter() - start
+    
+    # Two immediate, two more at 20/s
+    assert 0.08 <= elapsed < 0.5
@@ -0,0 +1,68 @@
+"""Tests for the orjson response path of the read routes."""
+
+import orjson
+import pytest
+from datetime import timedelta
+
+from src.analytics.bucket import aggregate_new_articles
+from src.api.routes_aggregate import get_aggregate
+from src.api.routes_news import get_news
+from src.core.schemas import AggregateColumnarResponse, AggregateResponse, ArticleListResponse, ArticleResponse
+from src.models import Article
+from src.utils.time import now_utc, parse_iso8601
+
+
+def seed(db) -> None:
+    published = now_utc().replace(second=0, microsecond=0) - timedelta(minutes=30)
+    articles = [
+        Article(
+            source="bbc" if i % 2 else "npr", source_type="rss", title=f"Story {i}", url=f"https://example.com/{i}",
+            topic="politics" if i % 3 else "environment", published_at_utc=published + timedelta(minutes=i % 7),
+            fetched_at_utc=published, raw={"guid": i, "tags": ["a", "b"]},
+        )
+        for i in range(40)
+    ]
+    db.add_all(articles)
+    db.commit()
+    aggregate_new_articles(db, [
+        {"published_at_utc": a.published_at_utc, "topic": a.topic, "source": a.source} for a in articles
+    ])
+
+
+@pytest.mark.asyncio
+async def test_aggregate_formats(db, async_sessions):
+    """Test that rows validate as AggregateResponse and columnar carries the same buckets."""
+    seed(db)
+    params = dict(bucket_size="1m", topic=None, source=None, since=None, changes_since=None)
+    bodies = {}
+    for fmt in ("rows", "columnar"):
+        async with async_sessions() as session:
+            bodies[fmt] = (await get_aggregate(db=session, fmt=fmt, **params)).body
+    
+    rows = AggregateResponse.model_validate_json(bodies["rows"])
+    columnar = AggregateColumnarResponse.model_validate_json(bodies["columnar"])
+    assert rows.change_cursor and columnar.change_cursor
+    assert all(b.bucket_start_utc.tzinfo is not None and b.source == "" for b in rows.buckets)
+    assert sorted((int(b.bucket_start_utc.timestamp()), b.topic, b.count) for b in rows.buckets) == sorted(
+        (t, topic, count) for topic, columns in columnar.series.items() for t, count in zip(columns.t, columns.count)
+    )
+    assert sum(b.count for b in rows.buckets) == 40
+    assert len(bodies["columnar"]) * 3 < len(bodies["rows"])
+
+
+@pytest.mark.asyncio
+async def test_news_matches_model_output(db, async_sessions):
+    """Test that the encoded page decodes to what ArticleResponse models would produce."""
+    seed(db)
+    params = dict(topic=None, source=None, since=None, cursor=None, offset=0, include_total=False, changes_since=None)
+    async with async_sessions() as session:
+        page = orjson.loads((await get_news(db=session, limit=10, **params)).body)
+    
+    assert ArticleListResponse.model_validate(page).next_cursor == page["next_cursor"]
+    expected = db.query(Article).order_by(Article.published_at_utc.desc(), Article.id.desc()).limit(10)
+    for item, article in zip(page["items"], expected):
+        model = ArticleResponse.model_validate(article).model_dump(mode="json")
+        assert item["raw"] == {"guid": article.id - 1, "tags": ["a", "b"]}
+        assert parse_iso8601(item.pop("published_at_utc")) == parse_iso8601(model.pop("published_at_utc") + "Z")
+        assert parse_iso8601(item.pop("fetched_at_utc")) == parse_iso8601(model.pop("fetched_at_utc") + "Z")
+        assert item == model
@@ -0,0 +1,72 @@
+"""Tests for multi-resolution rollups."""
+
+from datetime import datetime
+
+from src.analytics.bucket import aggregate_counts_sql, aggregate_new_articles
+from src.analytics.rollup import recompute_rollups, update_rollups
+from src.models import Article, Count, RollupWatermark
+from src.utils.time import UTC
+
+
+def at(hour: int, minute: int) -> datetime:
+    return datetime(2024, 1, 1, hour, minute, 30, tzinfo=UTC)
+
+
+def counts(db, bucket_size: str, source: str = "") -> dict:
+    rows = db.query(Count).filter(Count.bucket_size == bucket_size, Count.source == source).all()
+    return {(r.bucket_start_utc.hour, r.bucket_start_utc.minute): r.count for r in rows}
+
+
+def test_rollups_finalize_closed_buckets(db):
+    """Test that only closed coarse buckets are computed."""
+    rows = [
+        {"published_at_utc": at(12, m), "topic": "politics", "source": "A"}
+        for m in (0, 1, 4, 6, 59)
+    ] + [{"published_at_utc": at(13, 2), "topic": "politics", "source": "A"}]
+    aggregate_new_articles(db, rows)
+    
+    written = update_rollups(db, now=at(13, 7))
+    
+    assert counts(db, "5m") == {(12, 0): 3, (12, 5): 1, (12, 55): 1, (13, 0): 1}
+    assert counts(db, "5m", "A") == counts(db, "5m")
+    assert counts(db, "60m") == {(12, 0): 5}  # 13:00 hour still open
+    assert written == {"5m": 8, "60m": 2}
+    assert db.get(RollupWatermark, "60m").watermark_utc.hour == 13
+
+
+def test_rollups_patch_late_data(db):
+    """Test that late 1m data patches finalized buckets and cascades."""
+    aggregate_new_articles(db, [{"published_at_utc": at(12, 0), "topic": "politics", "source": "A"}])
+    update_rollups(db, now=at(14, 0))
+    assert update_rollups(db, now=at(14, 1)) == {"5m": 0, "60m": 0}
+    
+    late = [{"published_at_utc": at(12, 3), "topic": "politics", "source": "B"}]
+    updated = aggregate_new_articles(db, late)
+    update_rollups(db, [row["bucket_start_utc"] for row in updated], now=at(14, 2))
+    
+    assert counts(db, "5m")[(12, 0)] == 2
+    assert counts(db, "5m", "B") == {(12, 0): 1}
+    assert counts(db, "60m")[(12, 0)] == 2
+
+
+def test_recompute_rollups_cascades_reaggregated_range(db):
+    """Test that a recomputed 1m range refreshes finalized 5m/60m buckets only."""
+    aggregate_new_articles(db, [{"published_at_utc": at(12, 1), "topic": "politics", "source": "A"}])
+    update_rollups(db, now=at(13, 7))
+    
+    # Articles stored without their counts, as if aggregation had failed
+    for n, (hour, minute) in enumerate([(12, 1), (12, 2), (12, 40), (13, 8)]):
+        db.add(Article(
+            source="A", source_type="rss", title=f"Story {n}", url=f"https://example.com/{n}",
+            topic="politics", published_at_utc=at(hour, minute), fetched_at_utc=at(hour, minute),
+        ))
+    db.commit()
+    
+    aggregate_counts_sql(db, bucket_size="1m", since=at(12, 0), until=at(13, 10))
+    written = recompute_rollups(db, at(12, 0), at(13, 10))
+    
+    assert counts(db, "5m") == {(12, 0): 2, (12, 40): 1}
+    assert counts(db, "60m") == {(12, 0): 3}
+    assert written == {"5m": 4, "60m": 2}
+    # 13:05 and the 13:00 hour are past the watermarks; update_rollups finalizes them later
+    assert db.get(RollupWatermark, "5m").watermark_utc.minute == 5
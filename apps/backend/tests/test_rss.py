@@ -0,0 +1,143 @@
+"""Tests for RSS conditional fetching."""
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.ingest.rss import RSSIngester, NOT_MODIFIED
+from src.ingest.parsing import parse_feed_content
+from src.ingest.classify import TopicClassifier
+from src.models import Source
+
+FEED = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Test</title>
+<item><title>Election results announced</title><link>https://example.com/a</link></item>
+</channel></rss>"""
+
+
+def make_app(send_validators: bool) -> web.Application:
+    """Feed server honouring If-None-Match when validators are enabled."""
+    async def handler(request):
+        if send_validators and request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        headers = {"ETag": '"v1"'} if send_validators else {}
+        return web.Response(body=FEED, headers=headers, content_type="application/rss+xml")
+    
+    app = web.Application()
+    app.router.add_get("/feed", handler)
+    return app
+
+
+async def fetch_twice(send_validators: bool, stored: bool = True):
+    server = TestServer(make_app(send_validators))
+    await server.start_server()
+    try:
+        source = Source(name="Test", type="rss", url_or_id=str(server.make_url("/feed")))
+        async with RSSIngester(TopicClassifier()) as ingester:
+            first = await ingester.fetch_feed(source)
+            if stored:
+                ingester.apply_validators(source)  # As callers do once articles are written
+            second = await ingester.fetch_feed(source)
+        return source, first, second
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_fetch_feed_etag_not_modified():
+    """Test 304 response on second fetch with stored ETag."""
+    source, first, second = await fetch_twice(send_validators=True)
+    
+    assert first is not NOT_MODIFIED
+    assert len(first["entries"]) == 1
+    assert source.etag == '"v1"'
+    assert second is NOT_MODIFIED
+
+
+@pytest.mark.asyncio
+async def test_fetch_feed_content_hash_fallback():
+    """Test unchanged body is detected without server validators."""
+    source, first, second = await fetch_twice(send_validators=False)
+    
+    assert first is not NOT_MODIFIED
+    assert source.etag is None
+    assert source.content_hash
+    assert second is NOT_MODIFIED
+
+
+@pytest.mark.asyncio
+async def test_validators_wait_for_stored_articles():
+    """Test that a feed whose articles weren't written is fetched in full again."""
+    source, first, second = await fetch_twice(send_validators=True, stored=False)
+    
+    assert source.etag is None and source.content_hash is None
+    assert second is not NOT_MODIFIED
+    assert second["entries"] == first["entries"]
+
+
+@pytest.mark.asyncio
+async def test_ingest_source_keeps_validators_when_write_fails(db):
+    """Test that validators aren't committed when the articles fail to flush."""
+    class FailingWriter:
+        def add(self, article):
+            pass
+        
+        def flush(self):
+            raise RuntimeError("database unavailable")
+    
+    server = TestServer(make_app(send_validators=True))
+    await server.start_server()
+    try:
+        source = Source(name="Test", type="rss", url_or_id=str(server.make_url("/feed")))
+        db.add(source)
+        db.commit()
+        async with RSSIngester(TopicClassifier()) as ingester:
+            with pytest.raises(RuntimeError):
+                await ingester.ingest_source(db, source, writer=FailingWriter())
+            db.refresh(source)
+            assert source.etag is None
+            
+            assert await ingester.ingest_source(db, source) == 1
+            db.refresh(source)
+            assert source.etag == '"v1"'
+            assert await ingester.ingest_source(db, source) is None
+    finally:
+        await server.close()
+
+
+def test_parse_feed_content_plain_entries():
+    """Test that parsed entries are plain, picklable dicts."""
+    import pickle
+    
+    result = parse_feed_content(FEED)
+    
+    assert result["bozo_error"] is None
+    assert result["entries"][0]["title"] == "Election results announced"
+    assert result["entries"][0]["link"] == "https://example.com/a"
+    assert pickle.loads(pickle.dumps(result)) == result
+
+
+@pytest.mark.asyncio
+async def test_shared_http_client_reuses_connections():
+    """Test that a long-lived session keeps connections alive between fetches."""
+    from src.ingest.http import HTTPClient
+    
+    server = TestServer(make_app(send_validators=False))
+    await server.start_server()
+    client = HTTPClient()
+    try:
+        session = await client.get_session()
+        source = Source(name="Test", type="rss", url_or_id=str(server.make_url("/feed")))
+        for _ in range(2):
+            ingester = RSSIngester(TopicClassifier(), session=session, semaphore=client.semaphore)
+            async with ingester:
+                await ingester.fetch_feed(source)
+        
+        assert not session.closed
+        stats = client.stats()
+        assert stats["requests"] == 2
+        assert stats["connections_created"] == 1
+        assert stats["connections_reused"] == 1
+    finally:
+        await client.close()
+        await server.close()
@@ -0,0 +1,45 @@
+"""Tests for adaptive polling schedule."""
+
+from src.ingest.schedule import AdaptivePollScheduler
+from src.models import Source
+
+
+def make_sources(n: int):
+    return [Source(id=i, name=f"S{i}", type="rss", url_or_id=f"u{i}") for i in range(n)]
+
+
+def test_new_sources_are_due():
+    """Test that sources without history are polled immediately."""
+    scheduler = AdaptivePollScheduler(min_interval=60, max_interval=1800)
+    sources = make_sources(3)
+    
+    assert scheduler.due(sources, now=0.0) == sources
+
+
+def test_quiet_source_backs_off_to_max():
+    """Test that empty or not-modified polls lengthen the interval."""
+    scheduler = AdaptivePollScheduler(min_interval=60, max_interval=600)
+    now = 0.0
+    intervals = []
+    for _ in range(20):
+        now += scheduler.record(0, None, now=now)
+        intervals.append(scheduler.stats()[0]["interval_seconds"])
+    
+    assert intervals == sorted(intervals)
+    assert intervals[-1] == 600
+    assert scheduler.due(make_sources(1), now=now - 1) == []
+
+
+def test_bursty_source_speeds_up():
+    """Test that new articles shorten a backed-off interval."""
+    scheduler = AdaptivePollScheduler(min_interval=60, max_interval=1800)
+    now = 0.0
+    for _ in range(10):
+        now += scheduler.record(0, 0, now=now)
+    backed_off = scheduler.stats()[0]["interval_seconds"]
+    
+    for _ in range(3):
+        now += scheduler.record(0, 20, now=now)
+    
+    assert scheduler.stats()[0]["interval_seconds"] < backed_off
+    assert scheduler.stats()[0]["interval_seconds"] == 60
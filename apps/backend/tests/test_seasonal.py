@@ -0,0 +1,68 @@
+"""Tests for seasonal baseline profiles."""
+
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+
+from src.analytics.anomaly import compute_baseline
+from src.analytics.seasonal import SeasonalProfiles, hour_of_week, index_slots
+from src.analytics.store import TimeSeriesStore
+from src.models import Count
+from src.utils.time import UTC
+
+
+# Monday 00:00 UTC
+NOW = datetime(2024, 1, 29, 0, 0, tzinfo=UTC)
+
+
+def seed_daily_cycle(db, hours: int) -> None:
+    """Quiet series with a morning ramp-up (20/min at 08:00, 2/min otherwise)."""
+    start = NOW - timedelta(hours=hours)
+    for minute in range(0, hours * 60, 5):
+        dt = start + timedelta(minutes=minute)
+        db.add(Count(
+            bucket_start_utc=dt, bucket_size="1m", topic="politics", source="",
+            count=(20 if dt.hour == 8 else 2) + minute % 2,
+        ))
+    db.commit()
+
+
+def test_index_slots_match_hour_of_week():
+    """Test vectorized slots against datetime arithmetic."""
+    dts = [NOW + timedelta(minutes=37 * i) for i in range(500)]
+    indexes = np.array([TimeSeriesStore.bucket_index(dt, "1m") for dt in dts])
+    assert index_slots(indexes, "1m").tolist() == [hour_of_week(dt) for dt in dts]
+    assert hour_of_week(NOW) == 0
+
+
+def test_profiles_build_and_refresh_incrementally(db):
+    """Test that slots capture the daily cycle and only closed hours are refolded."""
+    seed_daily_cycle(db, hours=14 * 24)
+    profiles = SeasonalProfiles(weeks=2)
+    
+    assert profiles.refresh(db, now=NOW) == 168
+    morning = profiles.expectation("1m", "politics", "", NOW + timedelta(days=2, hours=8))
+    night = profiles.expectation("1m", "politics", "", NOW + timedelta(days=2, hours=3))
+    
+    samples = [20 + m % 2 for m in range(0, 60, 5)] * 2
+    assert morning == pytest.approx(compute_baseline(samples))
+    assert night[0] == pytest.approx(2.0, abs=1)
+    
+    # Nothing closed yet, then exactly one hour's slot is recomputed
+    assert profiles.refresh(db, now=NOW + timedelta(minutes=30)) == 0
+    assert profiles.refresh(db, now=NOW + timedelta(hours=1, minutes=5)) == 1
+
+
+def test_profiles_round_trip(db):
+    """Test that profiles persist compactly and reload."""
+    seed_daily_cycle(db, hours=7 * 24)
+    profiles = SeasonalProfiles(weeks=1)
+    profiles.refresh(db, now=NOW)
+    assert profiles.save(db) == 1
+    
+    loaded = SeasonalProfiles(weeks=1)
+    assert loaded.load(db) == 1
+    assert loaded.through["1m"] == NOW
+    key = ("1m", "politics", "")
+    np.testing.assert_array_equal(loaded.profiles[key].expected, profiles.profiles[key].expected)
+    np.testing.assert_array_equal(loaded.profiles[key].samples, profiles.profiles[key].samples)
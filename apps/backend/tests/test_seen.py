@@ -0,0 +1,58 @@
+"""Tests for the seen-URL index."""
+
+from datetime import datetime
+
+from src.ingest.seen import SeenURLIndex
+from src.ingest.writer import ArticleWriter
+from src.models import Article
+from src.utils.time import UTC
+
+
+def test_contains_counts_hits_and_misses():
+    """Test hit/miss counters."""
+    index = SeenURLIndex(capacity=10)
+    index.add("https://example.com/a")
+    
+    assert index.contains("https://example.com/a")
+    assert not index.contains("https://example.com/b")
+    assert index.stats()["hits"] == 1
+    assert index.stats()["misses"] == 1
+
+
+def test_capacity_evicts_least_recently_used():
+    """Test that memory stays bounded."""
+    index = SeenURLIndex(capacity=2)
+    index.add("a")
+    index.add("b")
+    index.contains("a")  # Refresh a
+    index.add("c")
+    
+    assert len(index) == 2
+    assert index.evictions == 1
+    assert index.contains("a")
+    assert not index.contains("b")
+
+
+def test_warm_and_writer_update(db):
+    """Test warming from the database and marking flushed URLs."""
+    now = datetime(2024, 1, 1, tzinfo=UTC)
+    db.add(Article(
+        source="Test", source_type="rss", title="Stored",
+        url="https://example.com/stored", topic="politics",
+        published_at_utc=now, fetched_at_utc=now,
+    ))
+    db.commit()
+    
+    index = SeenURLIndex(capacity=10)
+    assert index.warm(db) == 1
+    assert index.contains("https://example.com/stored")
+    
+    writer = ArticleWriter(db, seen_index=index)
+    writer.add(Article(
+        source="Test", source_type="rss", title="New",
+        url="https://example.com/new", topic="politics",
+        published_at_utc=now, fetched_at_utc=now,
+    ))
+    writer.flush()
+    
+    assert index.contains("https://example.com/new")
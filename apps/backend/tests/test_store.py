@@ -0,0 +1,75 @@
+"""Tests for the in-memory time-series store."""
+
+import numpy as np
+from datetime import datetime, timedelta
+
+from src.analytics.anomaly import load_matrix
+from src.analytics.bucket import aggregate_new_articles
+from src.analytics.store import TimeSeriesStore
+from src.utils.time import UTC
+
+
+NOW = datetime(2024, 1, 1, 12, 30, 10, tzinfo=UTC)
+
+
+def row(minutes_ago: int, count: int, topic: str = "politics", source: str = "") -> dict:
+    start = NOW.replace(second=0) - timedelta(minutes=minutes_ago)
+    return {"bucket_start_utc": start, "bucket_size": "1m", "topic": topic, "source": source, "count": count}
+
+
+def test_ring_buffer_wraps_and_masks_stale_slots():
+    """Test that overwritten slots read as absent for their old bucket."""
+    store = TimeSeriesStore(capacity=4)
+    store.update([row(5, 1), row(1, 2), row(0, 3)])
+    
+    now_index = store.bucket_index(NOW, "1m")
+    values, present = store.window("1m", "politics", "", now_index - 5, now_index + 1)
+    
+    # 5 minutes ago shares a slot with 1 minute ago and was overwritten
+    assert present.tolist() == [False, False, False, False, True, True]
+    assert values.tolist() == [0, 0, 0, 0, 2, 3]
+    
+    # Older rows never replace newer ones in the same slot
+    store.update([row(5, 9)])
+    assert store.window("1m", "politics", "", now_index - 1, now_index)[0].tolist() == [2]
+
+
+def test_warm_and_read_path_match_database(db):
+    """Test that the store serves the same window as the counts table."""
+    articles = [
+        {"published_at_utc": NOW - timedelta(minutes=m), "topic": "politics", "source": "A"}
+        for m in (0, 0, 3, 20)
+    ]
+    aggregate_new_articles(db, articles)
+    
+    store = TimeSeriesStore(capacity=60)
+    assert not store.covers("1m", 0)
+    store.warm(db, bucket_sizes=("1m",), now=NOW)
+    
+    end = store.bucket_index(NOW, "1m") + 1
+    keys, from_db = load_matrix(db, "1m", end - 30, end, source=None)
+    store_keys, from_store = load_matrix(db, "1m", end - 30, end, source=None, store=store)
+    
+    assert keys == store_keys == [("politics", ""), ("politics", "A")]
+    assert np.nansum(from_store, axis=1).tolist() == [4, 4]
+    np.testing.assert_array_equal(from_db, from_store)
+    
+    # Windows older than the warm start fall back to the database
+    assert not store.covers("1m", store.bucket_index(NOW - timedelta(hours=2), "1m"))
+
+
+def test_stale_store_falls_back_to_database(db, monkeypatch):
+    """Test that a store no ingest cycle has synced stops covering reads."""
+    clock = [1000.0]
+    monkeypatch.setattr("src.analytics.store.time.monotonic", lambda: clock[0])
+    store = TimeSeriesStore(capacity=60, max_staleness=300)
+    store.warm(db, bucket_sizes=("1m",), now=NOW)
+    start = store.bucket_index(NOW, "1m")
+    assert store.covers("1m", start)
+    
+    clock[0] += 301
+    assert not store.covers("1m", start)
+    assert store.stats()["stale"] == ["1m"]
+    
+    store.mark_synced()
+    assert store.covers("1m", start)
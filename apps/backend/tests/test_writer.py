@@ -0,0 +1,85 @@
+"""Tests for the batched article writer."""
+
+import pytest
+from datetime import datetime
+
+import src.ingest.writer as writer_module
+from src.ingest.writer import ArticleWriter
+from src.models import Article, Count
+from src.utils.time import UTC
+
+
+def make_article(n: int) -> Article:
+    now = datetime(2024, 1, 1, 12, 0, tzinfo=UTC)
+    return Article(
+        source="Test",
+        source_type="rss",
+        title=f"Article {n}",
+        url=f"https://example.com/{n}",
+        topic="politics",
+        published_at_utc=now,
+        fetched_at_utc=now,
+        raw={"n": n},
+    )
+
+
+def test_flush_returns_inserted_ids(db):
+    """Test that flush inserts rows and returns their IDs."""
+    writer = ArticleWriter(db)
+    for n in range(3):
+        writer.add(make_article(n))
+    
+    ids = writer.flush()
+    
+    assert len(ids) == 3
+    assert db.query(Article).count() == 3
+    assert sorted(ids) == sorted(a.id for a in db.query(Article).all())
+
+
+def test_flush_skips_duplicates(db):
+    """Test that existing and repeated URLs are not inserted again."""
+    writer = ArticleWriter(db)
+    writer.add(make_article(0))
+    writer.flush()
+    
+    writer.add(make_article(0))
+    writer.add(make_article(1))
+    writer.add(make_article(1))
+    ids = writer.flush()
+    
+    assert len(ids) == 1
+    assert db.query(Article).count() == 2
+    assert len(writer.inserted_ids) == 2
+    assert writer.inserted_rows[-1]["url"] == "https://example.com/1"
+
+
+def test_flush_chunks_large_batches(db):
+    """Test batches larger than the SQLite parameter limit."""
+    writer = ArticleWriter(db)
+    for n in range(300):
+        writer.add(make_article(n))
+    
+    assert len(writer.flush()) == 300
+    assert writer.flush() == []
+
+
+def test_flush_applies_counts_in_same_transaction(db, monkeypatch):
+    """Test that count deltas commit with the articles, and neither does alone."""
+    writer = ArticleWriter(db, count_bucket_size="1m")
+    writer.add(make_article(0))
+    writer.add(make_article(1))
+    writer.flush()
+    
+    assert {(c.source, c.count) for c in db.query(Count)} == {("Test", 2), ("", 2)}
+    assert {(c["source"], c["count"]) for c in writer.updated_counts} == {("Test", 2), ("", 2)}
+    
+    def failing_deltas(*args, **kwargs):
+        raise RuntimeError("deadlock")
+    
+    monkeypatch.setattr(writer_module, "aggregate_new_articles", failing_deltas)
+    writer.add(make_article(2))
+    with pytest.raises(RuntimeError):
+        writer.flush()
+    
+    assert db.query(Article).count() == 2
+    assert {(c.source, c.count) for c in db.query(Count)} == {("Test", 2), ("", 2)}
@@ -1,7 +1,7 @@
 "use client";
 
-import { useEffect, useState } from "react";
-import { getAnomalies, type Anomaly } from "../lib/api";
+import { useEffect, useRef, useState } from "react";
+import { getAnomalies, mergeByKey, type Anomaly } from "../lib/api";
 import { Card, CardContent, CardHeader, CardTitle } from "../components/ui/card";
 import { Badge } from "../components/ui/badge";
 import { formatDate } from "../lib/utils";
@@ -10,18 +10,35 @@ export default function AnomaliesPage() {
   const [anomalies, setAnomalies] = useState<Anomaly[]>([]);
   const [loading, setLoading] = useState(true);
   const [topic, setTopic] = useState<"environment" | "politics" | "humanity" | null>(null);
+  // Change cursor of the last response; polls after the first fetch only new anomalies
+  const changeCursor = useRef<string | null>(null);
 
   useEffect(() => {
+    changeCursor.current = null;
     loadAnomalies();
     const interval = setInterval(loadAnomalies, 60000);
     return () => clearInterval(interval);
   }, [topic]);
 
   async function loadAnomalies() {
-    setLoading(true);
+    const changesSince = changeCursor.current;
+    if (!changesSince) setLoading(true);
     try {
-      const result = await getAnomalies({ topic: topic || undefined, limit: 100 });
-      setAnomalies(result.items);
+      const result = await getAnomalies({
+        topic: topic || undefined,
+        limit: 100,
+        changes_since: changesSince || undefined,
+      });
+      changeCursor.current = result.change_cursor;
+      if (changesSince) {
+        setAnomalies((current) =>
+          mergeByKey(current, result.items, (a) => a.id.toString())
+            .sort((a, b) => new Date(b.created_at_utc).getTime() - new Date(a.created_at_utc).getTime())
+            .slice(0, 100)
+        );
+      } else {
+        setAnomalies(result.items);
+      }
     } catch (error) {
       console.error("Error loading anomalies:", error);
     } finally {
@@ -75,6 +92,7 @@ export default function AnomaliesPage() {
                     <tr className="border-b">
                       <th className="text-left p-2">Time (IST)</th>
                       <th className="text-left p-2">Topic</th>
+                      <th className="text-left p-2">Source</th>
                       <th className="text-left p-2">Observed</th>
                       <th className="text-left p-2">Expected</th>
                       <th className="text-left p-2">Deviation</th>
@@ -90,6 +108,7 @@ export default function AnomaliesPage() {
                         <td className="p-2">
                           <Badge className="capitalize">{anomaly.topic}</Badge>
                         </td>
+                        <td className="p-2 text-sm">{anomaly.source || "All sources"}</td>
                         <td className="p-2">{anomaly.observed}</td>
                         <td className="p-2">{anomaly.expected.toFixed(1)}</td>
                         <td className="p-2 font-semibold text-destructive">
@@ -12,12 +12,14 @@ export default function FeedPage() {
   const [topic, setTopic] = useState<"environment" | "politics" | "humanity" | null>(null);
   const [source, setSource] = useState<string | null>(null);
   const [search, setSearch] = useState("");
-  const [offset, setOffset] = useState(0);
+  // Cursors of the pages visited so far; the last one is the current page
+  const [cursors, setCursors] = useState<(string | null)[]>([null]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const limit = 50;
 
   useEffect(() => {
     loadArticles();
-  }, [topic, source, offset]);
+  }, [topic, source, cursors]);
 
   async function loadArticles() {
     setLoading(true);
@@ -26,9 +28,10 @@ export default function FeedPage() {
         topic: topic || undefined,
         source: source || undefined,
         limit,
-        offset,
+        cursor: cursors[cursors.length - 1] || undefined,
       });
       setArticles(result.items);
+      setNextCursor(result.next_cursor);
     } catch (error) {
       console.error("Error loading articles:", error);
     } finally {
@@ -66,7 +69,7 @@ export default function FeedPage() {
                   key={t || "all"}
                   onClick={() => {
                     setTopic(t);
-                    setOffset(0);
+                    setCursors([null]);
                   }}
                   className={`px-3 py-1 rounded-full text-sm ${
                     topic === t
@@ -122,15 +125,15 @@ export default function FeedPage() {
         {/* Pagination */}
         <div className="flex justify-center gap-2">
           <button
-            onClick={() => setOffset(Math.max(0, offset - limit))}
-            disabled={offset === 0}
+            onClick={() => setCursors(cursors.slice(0, -1))}
+            disabled={cursors.length === 1}
             className="px-4 py-2 rounded border disabled:opacity-50"
           >
             Previous
           </button>
           <button
-            onClick={() => setOffset(offset + limit)}
-            disabled={articles.length < limit}
+            onClick={() => nextCursor && setCursors([...cursors, nextCursor])}
+            disabled={!nextCursor}
             className="px-4 py-2 rounded border disabled:opacity-50"
           >
             Next
@@ -19,9 +19,11 @@ export interface Article {
 
 export interface ArticleListResponse {
   items: Article[];
-  total: number;
+  total: number | null; // Estimated, only with include_total
   limit: number;
   offset: number;
+  next_cursor: string | null;
+  change_cursor: string | null; // Pass as changes_since to get only newer articles
 }
 
 export interface Count {
@@ -37,13 +39,15 @@ export interface AggregateResponse {
   bucket_size: "1m" | "5m" | "60m";
   topic: "environment" | "politics" | "humanity" | null;
   source: string | null;
+  change_cursor: string | null; // Pass as changes_since to get only changed buckets
 }
 
 export interface Anomaly {
   id: number;
   bucket_start_utc: string;
   bucket_size: "1m" | "5m" | "60m";
-  topic: "environment" | "politics" | "humanity";
+  topic: "environment" | "politics" | "humanity" | "all";
+  source: string; // "" for the aggregate series
   observed: number;
   expected: number;
   deviation: number;
@@ -54,6 +58,7 @@ export interface Anomaly {
 export interface AnomalyListResponse {
   items: Anomaly[];
   total: number;
+  change_cursor: string | null; // Pass as changes_since to get only newer anomalies
 }
 
 export interface Source {
@@ -90,14 +95,18 @@ export async function getNews(params?: {
   source?: string;
   since?: string;
   limit?: number;
-  offset?: number;
+  cursor?: string;
+  include_total?: boolean;
+  changes_since?: string;
 }): Promise<ArticleListResponse> {
   const searchParams = new URLSearchParams();
   if (params?.topic) searchParams.set("topic", params.topic);
   if (params?.source) searchParams.set("source", params.source);
   if (params?.since) searchParams.set("since", params.since);
   if (params?.limit) searchParams.set("limit", params.limit.toString());
-  if (params?.offset) searchParams.set("offset", params.offset.toString());
+  if (params?.cursor) searchParams.set("cursor", params.cursor);
+  if (params?.include_total) searchParams.set("include_total", "true");
+  if (params?.changes_since) searchParams.set("changes_since", params.changes_since);
 
   return fetchAPI<ArticleListResponse>(`/api/news?${searchParams.toString()}`);
 }
@@ -107,27 +116,33 @@ export async function getAggregate(params?: {
   topic?: "environment" | "politics" | "humanity";
   source?: string;
   since?: string;
+  changes_since?: string;
 }): Promise<AggregateResponse> {
   const searchParams = new URLSearchParams();
   if (params?.bucket_size) searchParams.set("bucket_size", params.bucket_size);
   if (params?.topic) searchParams.set("topic", params.topic);
   if (params?.source) searchParams.set("source", params.source);
   if (params?.since) searchParams.set("since", params.since);
+  if (params?.changes_since) searchParams.set("changes_since", params.changes_since);
 
   return fetchAPI<AggregateResponse>(`/api/aggregate?${searchParams.toString()}`);
 }
 
 export async function getAnomalies(params?: {
   topic?: "environment" | "politics" | "humanity";
+  source?: string;
   since?: string;
   bucket_size?: "1m" | "5m" | "60m";
   limit?: number;
+  changes_since?: string;
 }): Promise<AnomalyListResponse> {
   const searchParams = new URLSearchParams();
   if (params?.topic) searchParams.set("topic", params.topic);
+  if (params?.source !== undefined) searchParams.set("source", params.source);
   if (params?.since) searchParams.set("since", params.since);
   if (params?.bucket_size) searchParams.set("bucket_size", params.bucket_size);
   if (params?.limit) searchParams.set("limit", params.limit.toString());
+  if (params?.changes_since) searchParams.set("changes_since", params.changes_since);
 
   return fetchAPI<AnomalyListResponse>(`/api/anomalies?${searchParams.toString()}`);
 }
@@ -140,3 +155,9 @@ export function getStreamURL(): string {
   return `${API_BASE}/api/stream`;
 }
 
+/** Merge delta rows into a list, replacing rows with the same key. */
+export function mergeByKey<T>(rows: T[], changes: T[], key: (row: T) => string): T[] {
+  const merged = new Map(rows.map((row) => [key(row), row]));
+  changes.forEach((row) => merged.set(key(row), row));
+  return Array.from(merged.values());
+}
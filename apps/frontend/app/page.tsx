@@ -1,7 +1,7 @@
 "use client";
 
-import { useEffect, useState } from "react";
-import { getAggregate, getNews, getAnomalies, type Article, type Count, type Anomaly } from "./lib/api";
+import { useEffect, useRef, useState } from "react";
+import { getAggregate, getNews, getAnomalies, mergeByKey, type Article, type Count, type Anomaly } from "./lib/api";
 import { Card, CardContent, CardHeader, CardTitle, CardDescription } from "./components/ui/card";
 import { Badge } from "./components/ui/badge";
 import { formatDate, getTopicColor } from "./lib/utils";
@@ -18,36 +18,54 @@ export default function Dashboard() {
   const [latestNews, setLatestNews] = useState<Article[]>([]);
   const [anomalies, setAnomalies] = useState<Anomaly[]>([]);
   const [loading, setLoading] = useState(true);
+  // Change cursors from the last responses; after the first load, polls fetch only what changed
+  const cursors = useRef<{ aggregate?: string; news?: string; anomalies?: string }>({});
 
   useEffect(() => {
+    cursors.current = {};
     loadData();
     const interval = setInterval(loadData, 30000); // Refresh every 30 seconds
     return () => clearInterval(interval);
   }, [topic, bucketSize, timeframe]);
 
   async function loadData() {
-    setLoading(true);
+    const changes = cursors.current;
+    const isDelta = Boolean(changes.aggregate && changes.news && changes.anomalies);
+    if (!isDelta) setLoading(true);
     try {
       const since = getSinceTimestamp(timeframe);
       
       const [agg, news, anom] = await Promise.all([
-        getAggregate({ bucket_size: bucketSize, topic: topic || undefined, since }).catch(e => { console.error("Aggregate error:", e); return { buckets: [] }; }),
-        getNews({ topic: topic || undefined, limit: 20, since }).catch(e => { console.error("News error:", e); return { items: [] }; }), // Get more recent articles within timeframe
-        getAnomalies({ topic: topic || undefined, limit: 10, since }).catch(e => { console.error("Anomalies error:", e); return { items: [] }; }),
+        getAggregate({ bucket_size: bucketSize, topic: topic || undefined, since, changes_since: changes.aggregate }).catch(e => { console.error("Aggregate error:", e); return { buckets: [], change_cursor: null }; }),
+        getNews({ topic: topic || undefined, limit: 20, since, changes_since: changes.news }).catch(e => { console.error("News error:", e); return { items: [], change_cursor: null }; }), // Get more recent articles within timeframe
+        getAnomalies({ topic: topic || undefined, source: "", limit: 10, since, changes_since: changes.anomalies }).catch(e => { console.error("Anomalies error:", e); return { items: [], change_cursor: null }; }),
       ]);
+      // A failed request drops its cursor so the next poll reloads it in full
+      cursors.current = {
+        aggregate: agg.change_cursor || undefined,
+        news: news.change_cursor || undefined,
+        anomalies: anom.change_cursor || undefined,
+      };
 
-      setAggregateData(agg.buckets || []);
+      const sinceDate = new Date(since);
+      setAggregateData((current) =>
+        (changes.aggregate ? mergeByKey(current, agg.buckets || [], (b) => `${b.bucket_start_utc}|${b.topic}|${b.source}`) : agg.buckets || [])
+          .filter((b) => new Date(b.bucket_start_utc) >= sinceDate)
+      );
       // Filter news to show most recent first and only from selected timeframe
-      const filteredNews = (news.items || [])
-        .filter(item => {
-          const itemDate = new Date(item.published_at_utc);
-          const sinceDate = new Date(since);
-          return itemDate >= sinceDate;
-        })
-        .sort((a, b) => new Date(b.published_at_utc).getTime() - new Date(a.published_at_utc).getTime()) // Most recent first
-        .slice(0, 15); // Show latest 15
-      setLatestNews(filteredNews);
-      setAnomalies(anom.items || []);
+      setLatestNews((current) =>
+        (changes.news ? mergeByKey(current, news.items || [], (a) => a.id.toString()) : news.items || [])
+          .filter(item => new Date(item.published_at_utc) >= sinceDate)
+          .sort((a, b) => new Date(b.published_at_utc).getTime() - new Date(a.published_at_utc).getTime()) // Most recent first
+          .slice(0, 15) // Show latest 15
+      );
+      setAnomalies((current) =>
+        changes.anomalies
+          ? mergeByKey(current, anom.items || [], (a) => a.id.toString())
+              .sort((a, b) => new Date(b.created_at_utc).getTime() - new Date(a.created_at_utc).getTime())
+              .slice(0, 10)
+          : anom.items || []
+      );
     } catch (error) {
       console.error("Error loading data:", error);
       // Set empty data on error so UI doesn't break